@@ -0,0 +1,333 @@
+"""
+Patterna Shield Mini - Kabul Kontrolü (Admission Control)
+=========================================================
+
+Skorlayıcı doyduğunda istekler kuyrukta birikir ve herkes zaman aşımına
+uğrar. Kabul kontrolü `/analyze/*` isteklerini uygulamaya girmeden önce
+süzer: bazı istekler hızlıca reddedilir, kabul edilenlerin gecikmesi sınırlı
+kalır.
+
+Sırasıyla:
+1. İstemci başına token bucket (opsiyonel): istemci (bağlantının IP'si)
+   hızını aşarsa 429 + Retry-After (bir sonraki token'a kalan süre).
+   `X-Client-Id` başlığı sadece güvenilen bir proxy'den (`trusted_proxies`)
+   gelen isteklerde kullanılır; doğrudan bağlanan istemci başlığı her istekte
+   değiştirip her seferinde yeni bir bucket alamaz.
+2. Event loop gecikmesi: mesajların çoğu event loop'ta skorlandığından
+   doyma önce loop'ta görünür. Loop gecikmesi (10 ms'lik zamanlayıcının
+   gecikmesi) bekleme süresi sınırını (`max_wait`) aşıyorsa yeni istek
+   bekletilmeden 503 alır.
+3. Eşzamanlılık sınırı: en fazla `max_concurrent` istek işlenir; fazlası
+   sınırlı bir FIFO kuyrukta bekler. Kuyruk doluysa ya da tahmini bekleme
+   (sıradaki istek sayısı x ortalama servis süresi / slot) süre sınırını
+   aşıyorsa istek beklemeden 503 alır; bekleyen istek süre sınırında
+   hâlâ slot alamamışsa 503 alır. Beklerken iptal edilen (istemci koptu,
+   worker kapanıyor) istek kuyruktan çıkar; ona devredilmiş slot
+   sıradakine geçer.
+4. Akışlar (`/analyze/stream`) bağlantı boyunca açık kalır; skorlama
+   slotlarını tutsalar `max_concurrent` akış tüm mesaj isteklerini
+   durdururdu. Akışların ayrı, kuyruksuz bir sınırı vardır
+   (`max_streams`); dolunca yeni akış 503 alır.
+
+Baskı altında (loop gecikmesi `degrade_lag`'i aşınca veya kuyrukta bekleyen
+varken) kısıtlı mod açılır. Bu modda skorlama pahalı aşamaları (metin
+sınıflandırıcı, kampanya indeksi) atlar. Baskı `DEGRADE_HOLD` saniye boyunca
+kalkınca mod kapanır.
+
+Tüm durum süreç içidir (worker başına). Middleware saf ASGI'dir; FastAPI'ye
+bağlı değildir.
+"""
+
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import anyio
+
+LAG_INTERVAL = 0.01         # loop gecikmesi ölçüm aralığı (sn)
+DEGRADE_HOLD = 1.0          # kısıtlı moddan çıkmak için baskısız geçmesi gereken süre (sn)
+SERVICE_EWMA_ALPHA = 0.05   # ortalama servis süresi ağırlığı
+DEFAULT_CLIENT_BUCKETS = 10_000
+
+
+class TokenBuckets:
+    """İstemci başına token bucket (kapasitesi sınırlı LRU; en eski istemci düşer)"""
+
+    def __init__(self, rate: float, burst: float, capacity: int = DEFAULT_CLIENT_BUCKETS,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst < 1 or capacity < 1:
+            raise ValueError("rate pozitif, burst en az 1, capacity pozitif olmalı")
+        self.rate = rate
+        self.burst = burst
+        self.capacity = capacity
+        self._clock = clock
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()   # istemci -> [token, son güncelleme]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, client: Hashable) -> float:
+        """Bir token harca -> 0 (izin) veya bir sonraki token'a kalan süre (sn)"""
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                if len(self._buckets) >= self.capacity:
+                    self._buckets.popitem(last=False)
+                bucket = self._buckets[client] = [self.burst, now]
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate
+
+
+class AdmissionController:
+    """Eşzamanlılık sınırı + süre sınırlı bekleme kuyruğu + loop gecikmesi izleyicisi"""
+
+    def __init__(self, max_concurrent: int = 64, max_queue: int = 256, max_wait: float = 0.1,
+                 degrade_lag: Optional[float] = None, client_rate: float = 0.0, client_burst: float = 0.0,
+                 max_streams: int = 16, on_degraded: Optional[Callable[[bool], None]] = None):
+        if max_concurrent < 1 or max_queue < 0 or max_wait <= 0 or max_streams < 1:
+            raise ValueError("max_concurrent ve max_streams pozitif, max_queue negatif olmayan, "
+                             "max_wait pozitif olmalı")
+        self.max_concurrent = max_concurrent
+        self.max_streams = max_streams
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.degrade_lag = max_wait / 4 if degrade_lag is None else degrade_lag
+        self.clients = TokenBuckets(client_rate, client_burst or max(1.0, client_rate)) if client_rate > 0 else None
+        self._on_degraded = on_degraded
+        self.in_flight = 0
+        self.streams = 0            # açık akışlar (skorlama slotlarından ayrı)
+        self._waiters: "deque[anyio.Event]" = deque()
+        self.service_time = 0.0     # kabul edilen isteklerin ortalama süresi (sn)
+        self.loop_lag = 0.0         # son ölçülen event loop gecikmesi (sn)
+        self.degraded = False
+        self._calm_since = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.admitted = 0
+        self.rejected: Counter = Counter()
+        self.degraded_periods = 0
+
+    # Event loop gecikmesi
+
+    def start(self) -> None:
+        """Loop gecikmesi ölçümünü başlat (çalışan event loop içinde çağrılmalı)"""
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(LAG_INTERVAL, self._tick, loop, loop.time() + LAG_INTERVAL)
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _tick(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        now = loop.time()
+        self.loop_lag = max(0.0, now - expected)
+        self._update_pressure()
+        self._timer = loop.call_later(LAG_INTERVAL, self._tick, loop, now + LAG_INTERVAL)
+
+    def _update_pressure(self) -> None:
+        now = time.monotonic()
+        if self.loop_lag > self.degrade_lag or self._waiters:
+            self._calm_since = now
+            if not self.degraded:
+                self._set_degraded(True)
+        elif self.degraded and now - self._calm_since >= DEGRADE_HOLD:
+            self._set_degraded(False)
+
+    def _set_degraded(self, on: bool) -> None:
+        self.degraded = on
+        if on:
+            self.degraded_periods += 1
+        if self._on_degraded is not None:
+            self._on_degraded(on)
+
+    # Kabul
+
+    def _reject(self, reason: str, status: int, retry_after: float) -> Tuple[int, str, float]:
+        self.rejected[reason] += 1
+        return status, reason, retry_after
+
+    async def acquire(self, client: Optional[Hashable], stream: bool = False) -> Optional[Tuple[int, str, float]]:
+        """Slot al -> None (kabul) veya (HTTP durum kodu, neden, Retry-After sn)"""
+        if self.clients is not None and client is not None:
+            wait = self.clients.acquire(client)
+            if wait:
+                return self._reject("rate_limited", 429, wait)
+        if self.loop_lag > self.max_wait:
+            return self._reject("overloaded", 503, self.loop_lag)
+        if stream:
+            if self.streams >= self.max_streams:
+                return self._reject("streams_full", 503, 1.0)
+            self.streams += 1
+            self.admitted += 1
+            return None
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return None
+        if len(self._waiters) >= self.max_queue:
+            return self._reject("queue_full", 503, self.max_wait)
+        # Sıradakiler bitmeden slot boşalmaz: tahmini bekleme süre sınırını aşıyorsa bekletme
+        estimate = (len(self._waiters) + 1) * self.service_time / self.max_concurrent
+        if estimate > self.max_wait:
+            return self._reject("deadline", 503, estimate)
+
+        event = anyio.Event()
+        self._waiters.append(event)
+        self._update_pressure()
+        admitted = False
+        try:
+            with anyio.move_on_after(self.max_wait):
+                await event.wait()
+            admitted = event.is_set()
+        finally:
+            if not admitted:
+                if event.is_set():
+                    # Slot devredildikten hemen sonra iptal edildi: sıradakine geçir
+                    self.release()
+                else:
+                    # Süre doldu veya beklerken iptal edildi
+                    self._waiters.remove(event)
+        if not admitted:
+            return self._reject("deadline", 503, self.max_wait)
+        # Slot release() tarafından bu isteğe devredildi (in_flight değişmedi)
+        self.admitted += 1
+        return None
+
+    def release(self, duration: Optional[float] = None, stream: bool = False) -> None:
+        """Slotu bırak; bekleyen varsa slot doğrudan sıradakine geçer"""
+        if stream:
+            self.streams -= 1
+            return
+        if duration is not None:
+            self.service_time += SERVICE_EWMA_ALPHA * (duration - self.service_time)
+        if self._waiters:
+            self._waiters.popleft().set()
+        else:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_streams": self.max_streams,
+            "streams": self.streams,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "service_time_ms": round(self.service_time * 1000, 3),
+            "loop_lag_ms": round(self.loop_lag * 1000, 2),
+            "degraded": self.degraded,
+            "degraded_periods": self.degraded_periods,
+            "client_rate": self.clients.rate if self.clients else None,
+            "client_burst": self.clients.burst if self.clients else None,
+            "tracked_clients": len(self.clients) if self.clients else 0,
+        }
+
+
+def controller_from_env(on_degraded: Optional[Callable[[bool], None]] = None) -> Optional[AdmissionController]:
+    """PATTERNA_ADMISSION_* ortam değişkenlerinden denetleyici (kapalıysa None)"""
+    env = os.environ.get
+    if env("PATTERNA_ADMISSION", "1") == "0":
+        return None
+    return AdmissionController(
+        max_concurrent=int(env("PATTERNA_ADMISSION_CONCURRENCY", "64")),
+        max_queue=int(env("PATTERNA_ADMISSION_QUEUE", "256")),
+        max_wait=float(env("PATTERNA_ADMISSION_MAX_WAIT_MS", "100")) / 1000,
+        degrade_lag=float(env("PATTERNA_ADMISSION_DEGRADE_LAG_MS", "25")) / 1000,
+        client_rate=float(env("PATTERNA_CLIENT_RATE", "0")),
+        client_burst=float(env("PATTERNA_CLIENT_BURST", "0")),
+        max_streams=int(env("PATTERNA_ADMISSION_STREAMS", "16")),
+        on_degraded=on_degraded,
+    )
+
+
+_REJECT_DETAILS = {
+    "rate_limited": "İstemci istek hızı sınırı aşıldı",
+    "overloaded": "Sunucu aşırı yüklü, daha sonra tekrar deneyin",
+    "queue_full": "Sunucu aşırı yüklü (bekleme kuyruğu dolu)",
+    "deadline": "Sunucu aşırı yüklü (bekleme süresi sınırı aşıldı)",
+    "streams_full": "Sunucu aşırı yüklü (eşzamanlı akış sınırı aşıldı)",
+}
+_REJECT_BODIES = {reason: json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+                  for reason, detail in _REJECT_DETAILS.items()}
+
+
+class AdmissionMiddleware:
+    """Belirli önekli yollara kabul kontrolü uygulayan ASGI middleware.
+
+    Reddedilen istek gövdesi okunmadan yanıtlanır. Kısıtlı modda skorlanan
+    yanıtlara `X-Patterna-Degraded: 1` başlığı eklenir.
+    """
+
+    def __init__(self, app, controller: Callable[[], Optional[AdmissionController]],
+                 prefix: str = "/analyze/", streams: Tuple[str, ...] = (),
+                 trusted_proxies: Tuple[str, ...] = ()):
+        self.app = app
+        self._controller = controller
+        self.prefix = prefix
+        self.streams = frozenset(streams)   # uzun süren yollar (akış): ayrı sınır, servis süresine katılmaz
+        self.trusted_proxies = frozenset(trusted_proxies)   # X-Client-Id başlığına güvenilen IP'ler
+
+    async def __call__(self, scope, receive, send):
+        controller = self._controller() if scope["type"] == "http" else None
+        if controller is None or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        stream = scope["path"] in self.streams
+        rejection = await controller.acquire(self._client(scope), stream)
+        if rejection is not None:
+            await self._send_rejection(send, *rejection)
+            return
+
+        degraded = controller.degraded
+
+        async def send_wrapper(message):
+            if degraded and message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-patterna-degraded", b"1")]}
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            controller.release(None if stream else time.perf_counter() - start, stream)
+
+    def _client(self, scope) -> Optional[str]:
+        client = scope.get("client")
+        peer = client[0] if client else None
+        if peer is not None and peer in self.trusted_proxies:
+            for name, value in scope.get("headers", ()):
+                if name == b"x-client-id":
+                    return value.decode("latin-1")
+        return peer
+
+    @staticmethod
+    async def _send_rejection(send, status: int, reason: str, retry_after: float) -> None:
+        body = _REJECT_BODIES[reason]
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
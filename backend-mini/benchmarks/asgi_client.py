@@ -0,0 +1,127 @@
+"""
+Süreç İçi ASGI İstemcisi
+========================
+
+FastAPI uygulamasını ağ ve sunucu olmadan, doğrudan ASGI arayüzü üzerinden
+çağırır. Ek bağımlılık (httpx vb.) gerektirmez; ölçülen süre routing,
+Pydantic doğrulama, endpoint ve JSON serileştirmeyi kapsar.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ASGIResponse:
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status_code = status
+        self.headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in headers}
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class InProcessClient:
+    """ASGI uygulamasına süreç içinden HTTP istekleri gönderir"""
+
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+
+    async def request(self, method: str, path: str, json_body: Any = None,
+                      headers: Optional[Dict[str, str]] = None, body: bytes = b"") -> ASGIResponse:
+        if json_body is not None:
+            body = json.dumps(json_body, ensure_ascii=False).encode("utf-8")
+        raw_headers = [(b"host", b"testserver"), (b"content-length", str(len(body)).encode())]
+        if json_body is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+        for key, value in (headers or {}).items():
+            raw_headers.append((key.lower().encode("latin-1"), value.encode("latin-1")))
+
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        request_sent = False
+        response_done = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        response_done.set()
+        return ASGIResponse(status, response_headers, b"".join(chunks))
+
+    async def get(self, path: str, **kwargs) -> ASGIResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, json_body: Any = None, **kwargs) -> ASGIResponse:
+        return await self.request("POST", path, json_body=json_body, **kwargs)
+
+    # Lifespan (startup / shutdown olayları)
+
+    async def startup(self) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        started = asyncio.get_running_loop().create_future()
+        self._lifespan_queue = queue
+        await queue.put({"type": "lifespan.startup"})
+
+        async def receive():
+            return await queue.get()
+
+        async def send(message):
+            if message["type"].startswith("lifespan.startup") and not started.done():
+                started.set_result(message["type"])
+
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._lifespan_task = asyncio.create_task(self.app(scope, receive, send))
+        result = await started
+        if result != "lifespan.startup.complete":
+            raise RuntimeError(f"Uygulama başlatılamadı: {result}")
+
+    async def shutdown(self) -> None:
+        if self._lifespan_task is None:
+            return
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await self._lifespan_task
+        self._lifespan_task = None
+
+    async def __aenter__(self) -> "InProcessClient":
+        await self.startup()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.shutdown()
@@ -0,0 +1,77 @@
+"""
+Telefon Kara Listesi Benchmark'ı
+================================
+
+Geçici bir SQLite veritabanına N numara içe aktarır, ardından:
+- toplu içe aktarma hızını (satır/s),
+- veritabanından belleğe yükleme süresini,
+- üyelik kontrolünün (isabet / ıskalama) ns/sorgu maliyetini,
+- bellek içi tablonun boyutunu
+raporlar.
+
+Kullanım:
+    python benchmarks/bench_blacklist.py --count 1000000
+    python benchmarks/bench_blacklist.py --count 10000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from phone_blacklist import PhoneBlacklist  # noqa: E402
+from phone_numbers import e164_key  # noqa: E402
+
+
+def random_numbers(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [f"05{rng.randrange(10**9):09d}" for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telefon kara listesi benchmark'ı")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Kara listedeki numara sayısı")
+    parser.add_argument("--queries", type=int, default=200_000, help="Ölçülecek sorgu sayısı")
+    args = parser.parse_args()
+
+    numbers = random_numbers(args.count, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "blacklist.db")
+        blacklist = PhoneBlacklist(db_path)
+
+        start = time.perf_counter()
+        imported = blacklist.bulk_import((n, 80, "bench") for n in numbers)
+        import_s = time.perf_counter() - start
+        print(f"İçe aktarma : {imported:,} satır, {import_s:.1f}s ({imported / import_s:,.0f} satır/s)")
+
+        start = time.perf_counter()
+        blacklist = PhoneBlacklist(db_path)
+        print(f"Yükleme     : {time.perf_counter() - start:.1f}s, {len(blacklist):,} anahtar, "
+              f"{blacklist._keys.memory_bytes / 2**20:,.0f} MB")
+
+        keys = blacklist._keys
+        hits = [e164_key(n) for n in random.Random(2).sample(numbers, min(args.queries, len(numbers)))]
+        misses = [e164_key(n) for n in random_numbers(args.queries, seed=3)]
+
+        for label, queries in (("İsabet", hits), ("Iskalama", misses)):
+            start = time.perf_counter()
+            for key in queries:
+                key in keys
+            per_query = (time.perf_counter() - start) / len(queries) * 1e9
+            print(f"{label:<12}: {per_query:,.0f} ns/sorgu (anahtar üzerinde)")
+
+        start = time.perf_counter()
+        for number in numbers[:args.queries]:
+            number in blacklist
+        per_query = (time.perf_counter() - start) / min(args.queries, len(numbers)) * 1e9
+        print(f"Numara      : {per_query:,.0f} ns/sorgu (normalizasyon dahil)")
+
+
+if __name__ == "__main__":
+    main()
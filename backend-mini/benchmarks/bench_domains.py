@@ -0,0 +1,83 @@
+"""
+Domain İtibar Benchmark'ı
+=========================
+
+Eski `domain in url` taraması ile host tabanlı DomainIndex'in ve paylaşılan
+modda kullanılan HashedDomainIndex'in URL başına maliyetini domain listesi
+büyüdükçe karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_domains.py
+    python benchmarks/bench_domains.py --sizes 7 1000 1000000 5000000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rules import load_rules  # noqa: E402
+from url_reputation import DomainIndex, HashedDomainIndex  # noqa: E402
+
+TLDS = ["com", "net", "org", "com.tr", "xyz", "info"]
+
+SAMPLE_URLS = [
+    "https://www.google.com/search?q=kampanya",
+    "https://bit.ly/3xYz9Q",
+    "http://sahte-banka.com/login",
+    "https://login.microsoft.com/common/oauth2",
+    "https://www.garanti.com.tr/tr/bireysel.html",
+    "http://guvenli-odeme.xyz/odeme?id=123",
+]
+
+# Naive tarama bu boyuttan büyük listelerde atlanır (çok yavaş)
+NAIVE_MAX = 100_000
+
+
+def synthetic_domains(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    domains = list(load_rules().suspicious_domains)
+    while len(domains) < count:
+        name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz-") for _ in range(rng.randint(5, 14)))
+        domains.append(f"{name.strip('-') or 'x'}.{rng.choice(TLDS)}")
+    return domains[:count]
+
+
+def per_url_ns(fn, urls: list, min_time: float = 0.3) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for url in urls:
+            fn(url)
+        calls += len(urls)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Domain itibar benchmark'ı")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[7, 1000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'domain':>10} | {'domain in url':>14} | {'DomainIndex':>12} | {'Hashed':>10}")
+    print("-" * 57)
+    for size in args.sizes:
+        domains = synthetic_domains(size)
+        index = DomainIndex(domains)
+
+        if size <= NAIVE_MAX:
+            naive = per_url_ns(lambda u: [d for d in domains if d in u], SAMPLE_URLS)
+            naive_text = f"{naive / 1000:>11,.1f} µs"
+        else:
+            naive_text = f"{'-':>14}"
+        indexed = per_url_ns(index.match_url, SAMPLE_URLS)
+        hashed = per_url_ns(HashedDomainIndex.from_index(index).match_url, SAMPLE_URLS)
+        print(f"{size:>10,} | {naive_text} | {indexed / 1000:>9,.2f} µs | {hashed / 1000:>7,.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
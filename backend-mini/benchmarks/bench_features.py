@@ -0,0 +1,91 @@
+"""
+Mesaj Özellik Çıkarımı Benchmark'ı
+==================================
+
+Eski `calculate_risk_score` akışı (metin keyword listeleri, URL regex'i ve
+telefon regex'i için ayrı ayrı taranır) ile tek geçişli `extract_features`
++ `calculate_risk_score` akışının mesaj başına gecikmesini karşılaştırır.
+
+Not: Yeni akış mesajdaki linkleri ayrıca `check_url_safety`'den geçirir;
+yani eskisinden daha fazla iş yapar.
+
+Kullanım:
+    python benchmarks/bench_features.py
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scoring import calculate_risk_score  # noqa: E402
+from message_features import extract_features  # noqa: E402
+from rules import load_rules  # noqa: E402
+
+RULES = load_rules()
+FRAUD_KEYWORDS = list(RULES.fraud_keywords)
+URGENCY_WORDS = list(RULES.urgency_words)
+MONEY_WORDS = list(RULES.money_words)
+
+
+def legacy_calculate_risk_score(message: str):
+    """Özellik çıkarımı öncesindeki çok geçişli algoritma (referans)"""
+    score = 0
+    reasons = []
+    message_lower = message.lower()
+    found_keywords = [kw for kw in FRAUD_KEYWORDS if kw in message_lower]
+    if found_keywords:
+        score += len(found_keywords) * 15
+        reasons.append(f"Şüpheli kelimeler: {', '.join(found_keywords[:3])}")
+    if re.search(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', message):
+        score += 25
+        reasons.append("Mesajda link bulunuyor")
+    if re.search(r'(\+90|0)?[5][0-9]{9}', message):
+        score += 20
+        reasons.append("Mesajda telefon numarası var")
+    if any(word in message_lower for word in URGENCY_WORDS):
+        score += 30
+        reasons.append("Aciliyet ifadeleri kullanılmış")
+    if any(word in message_lower for word in MONEY_WORDS):
+        score += 25
+        reasons.append("Para/ödeme ile ilgili kelimeler")
+    return min(score, 100), reasons
+
+
+def load_messages() -> list:
+    with open(ROOT / "examples" / "sample_data.json", encoding="utf-8") as f:
+        data = json.load(f)
+    return [item["data"]["message"] for item in data["test_messages"]]
+
+
+def per_message_us(fn, messages: list, min_time: float = 1.0) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for message in messages:
+            fn(message)
+        calls += len(messages)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls * 1e6
+
+
+def main():
+    messages = load_messages()
+    rows = [
+        ("Eski calculate_risk_score", legacy_calculate_risk_score),
+        ("extract_features", lambda m: extract_features(m, RULES.matcher)),
+        ("calculate_risk_score (yeni)", calculate_risk_score),
+    ]
+    print(f"{'akış':<30} | {'µs/mesaj':>9}")
+    print("-" * 43)
+    for label, fn in rows:
+        print(f"{label:<30} | {per_message_us(fn, messages):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
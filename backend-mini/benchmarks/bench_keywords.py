@@ -0,0 +1,95 @@
+"""
+Keyword Eşleştirme Benchmark'ı
+==============================
+
+Eski yöntem (her keyword için ayrı `kw in text` taraması) ile Aho-Corasick
+otomatının (KeywordMatcher) throughput'unu keyword sayısı büyüdükçe
+karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_keywords.py
+    python benchmarks/bench_keywords.py --sizes 30 1000 10000 --messages 2000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from keyword_matcher import KeywordMatcher  # noqa: E402
+from rules import load_rules  # noqa: E402
+
+ALPHABET = "abcçdefgğhıijklmnoöprsştuüvyz"
+
+SAMPLE_MESSAGES = [
+    "Merhaba, bugün toplantımız var mı?",
+    "ACİL! Banka hesabınız bloke oldu. Şifrenizi doğrulamak için hemen bu linke tıklayın: http://sahte-banka.com/login",
+    "Tebrikler! 50.000 TL kazandınız. Bedava ödülünüzü almak için hemen bu linke tıklayın!",
+    "Kredi kartınızın güvenliği için CVV ve şifrenizi gönderiniz. Son şansınız!",
+    "Merhaba, online iş fırsatı için bilgi almak ister misiniz?",
+    "Akşam yemeğe geliyor musun? Annem de gelecek, haber ver lütfen.",
+]
+
+
+def synthetic_keywords(count: int, seed: int = 42) -> list:
+    """Gerçek keyword'lere ek olarak rastgele Türkçe benzeri terimler üret"""
+    rng = random.Random(seed)
+    rules = load_rules()
+    words = list(dict.fromkeys(rules.fraud_keywords + rules.urgency_words + rules.money_words))
+    seen = set(words)
+    while len(words) < count:
+        term = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 10)))
+        if term not in seen:
+            seen.add(term)
+            words.append(term)
+    return words[:count]
+
+
+def naive_match(keywords: list, text: str) -> list:
+    return [kw for kw in keywords if kw in text]
+
+
+def measure(fn, messages: list, min_time: float = 0.5) -> float:
+    """fn'i mesajlar üzerinde çalıştır, mesaj/saniye döndür"""
+    processed = 0
+    start = time.perf_counter()
+    while True:
+        for message in messages:
+            fn(message)
+        processed += len(messages)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return processed / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword eşleştirme benchmark'ı")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 100, 1000, 10000])
+    parser.add_argument("--messages", type=int, default=600, help="Mesaj sayısı")
+    args = parser.parse_args()
+
+    messages = [m.lower() for m in SAMPLE_MESSAGES] * (args.messages // len(SAMPLE_MESSAGES))
+
+    print(f"{'keyword':>8} | {'naive msg/s':>12} | {'automaton msg/s':>15} | {'hızlanma':>8} | {'derleme':>8}")
+    print("-" * 64)
+    for size in args.sizes:
+        keywords = synthetic_keywords(size)
+
+        build_start = time.perf_counter()
+        matcher = KeywordMatcher({"fraud": keywords})
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        # Sonuçların aynı olduğunu doğrula
+        for message in messages[:len(SAMPLE_MESSAGES)]:
+            assert matcher.match(message)["fraud"] == naive_match(keywords, message)
+
+        naive = measure(lambda m: naive_match(keywords, m), messages)
+        automaton = measure(matcher.scan, messages)
+        print(f"{size:>8} | {naive:>12,.0f} | {automaton:>15,.0f} | {automaton / naive:>7.1f}x | {build_ms:>6.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Toplu Telefon Skorlama Benchmark'ı
+==================================
+
+Karışık yazımlı N numara üretir ("0532 123 45 67", "+90 (532) ...",
+"0 850 ...", yurt dışı, sabit hat, geçersiz), bir kısmını geçici bir kara
+listeye ekler ve:
+- tekil yolu (`check_phone_risk`, numara başına),
+- toplu yolu (`check_phone_risk_batch`, NumPy) aşama aşama
+  (kanonikleştirme / sınıflandırma / kara liste / toplam)
+ölçer. Örneklem üzerinde iki yolun puanlarının aynı olduğu doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_phone_batch.py
+    python benchmarks/bench_phone_batch.py --count 1000000 --blacklist 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+# Kara liste geçici veritabanından yüklenir (scoring import edilmeden önce)
+TMP_DIR = tempfile.TemporaryDirectory()
+os.environ["PATTERNA_DB_PATH"] = os.path.join(TMP_DIR.name, "bench.db")
+os.environ.setdefault("PATTERNA_REPORTS", "0")
+
+import numpy as np  # noqa: E402
+
+import scoring  # noqa: E402
+from phone_blacklist import get_phone_blacklist  # noqa: E402
+from phone_numbers import KIND_NAMES, classify_keys, e164_keys  # noqa: E402
+
+
+def random_phones(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    phones = []
+    for _ in range(count):
+        mobile = f"5{rng.randrange(10**9):09d}"
+        r = rng.random()
+        if r < 0.35:
+            phones.append(f"0{mobile}")
+        elif r < 0.55:
+            phones.append(f"0{mobile[:3]} {mobile[3:6]} {mobile[6:8]} {mobile[8:]}")
+        elif r < 0.7:
+            phones.append(f"+90 ({mobile[:3]}) {mobile[3:6]}-{mobile[6:8]}-{mobile[8:]}")
+        elif r < 0.8:
+            phones.append(f"0 850 {rng.randrange(10**7):07d}")
+        elif r < 0.87:
+            phones.append(f"0{rng.choice(('212', '216', '312', '232'))}{rng.randrange(10**7):07d}")
+        elif r < 0.93:
+            phones.append(f"+{rng.choice(('44', '49', '1', '7'))} {rng.randrange(10**9, 10**10)}")
+        else:
+            phones.append(rng.choice(("bilinmiyor", "0532", "05321234567890", "+90 532 12")))
+    return phones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu telefon skorlama benchmark'ı")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Toplu skorlanacak numara sayısı")
+    parser.add_argument("--blacklist", type=int, default=100_000, help="Kara listeye eklenecek numara sayısı")
+    parser.add_argument("--scalar", type=int, default=100_000, help="Tekil yolla ölçülecek numara sayısı")
+    args = parser.parse_args()
+
+    phones = random_phones(args.count, seed=1)
+    blacklist = get_phone_blacklist()
+    blacklist.bulk_import((phone, 80, "bench") for phone in random.Random(2).sample(phones, args.blacklist))
+    print(f"Numara      : {len(phones):,} (kara listede {len(blacklist):,})")
+
+    sample = phones[:args.scalar]
+    start = time.perf_counter()
+    scalar_scores = [scoring.check_phone_risk(phone)[0] for phone in sample]
+    scalar_us = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"Tekil yol   : {scalar_us:.2f} µs/numara ({scalar_us * len(phones) / 1e6:.2f}s / {len(phones):,} tahmini)")
+
+    # Aşamalar ayrı ayrı (ilk çağrı NumPy import'unu ve tabloları ısıtır)
+    scoring.check_phone_risk_batch(phones[:1000])
+    start = time.perf_counter()
+    keys = e164_keys(phones)
+    canonical_s = time.perf_counter() - start
+    start = time.perf_counter()
+    kinds, _ = classify_keys(keys)
+    classify_s = time.perf_counter() - start
+    start = time.perf_counter()
+    blacklisted = blacklist.contains_keys(keys)
+    blacklist_s = time.perf_counter() - start
+    print(f"  kanonik   : {canonical_s * 1000:7.1f} ms")
+    print(f"  sınıf     : {classify_s * 1000:7.1f} ms")
+    print(f"  kara liste: {blacklist_s * 1000:7.1f} ms ({int(blacklisted.sum()):,} eşleşme)")
+
+    for label, data in (("liste", phones), ("NumPy dizi", np.asarray(phones))):
+        start = time.perf_counter()
+        result = scoring.check_phone_risk_batch(data)
+        batch_s = time.perf_counter() - start
+        print(f"Toplu yol   : {batch_s * 1000:7.1f} ms [{label}] ({batch_s / len(phones) * 1e9:.0f} ns/numara, "
+              f"tekil yola göre {scalar_us * len(phones) / 1e6 / batch_s:.0f}x)")
+
+    mismatches = int((np.asarray(scalar_scores) != result.risk_scores[:len(sample)]).sum())
+    counts = np.bincount(kinds, minlength=len(KIND_NAMES))
+    print("Sınıflar    : " + ", ".join(f"{name} {count:,}" for name, count in zip(KIND_NAMES, counts) if count))
+    print(f"Riskli      : {int(result.is_fraud.sum()):,} numara")
+    print(f"Doğrulama   : {len(sample):,} numarada tekil / toplu puan farkı: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Yanıt Serileştirme Benchmark'ı
+==============================
+
+Önce / sonra karşılaştırması:
+
+- önce : FastAPI'nin varsayılan yolu - endpoint sözlük / model döndürür,
+         FastAPI response_model doğrulaması + jsonable_encoder + json.dumps
+         ile her istekte yeniden serileştirir (aynı içerikle kurulan
+         karşılaştırma uygulaması)
+- sonra: main.app - sabit yanıtlar başlangıçta serileştirilmiş byte'lar
+         (+ ETag ile 304), /analyze/* modelleri doğrudan byte'a çevrilir
+
+Ayrıca serileştiricilerin kendisi (FastAPI / Pydantic / orjson) tek yanıt
+ve 100'lük batch yanıtı için ayrı ölçülür.
+
+Kullanım:
+    python benchmarks/bench_responses.py
+    python benchmarks/bench_responses.py --ops 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+os.environ.setdefault("PATTERNA_REPORTS", "0")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+import json_responses  # noqa: E402
+import main  # noqa: E402
+import scoring  # noqa: E402
+from asgi_client import InProcessClient  # noqa: E402
+from metrics import MetricsMiddleware  # noqa: E402
+from scoring import AnalysisResponse, MessageAnalysisRequest  # noqa: E402
+from traffic import generate_messages  # noqa: E402
+
+
+def legacy_app() -> FastAPI:
+    """Aynı içeriği FastAPI'nin varsayılan serileştirmesiyle döndüren uygulama"""
+    legacy = FastAPI()
+    legacy.add_middleware(MetricsMiddleware)
+    root_content = json.loads(main.ROOT_INFO.body)
+    system_content = json.loads(main.FULL_SYSTEM_INFO.body)
+
+    @legacy.get("/")
+    async def root():
+        return root_content
+
+    @legacy.get("/full-system-info")
+    async def full_system_info():
+        return system_content
+
+    @legacy.post("/analyze/message", response_model=AnalysisResponse)
+    async def analyze_message(request: MessageAnalysisRequest):
+        return scoring.score_message(request)
+
+    return legacy
+
+
+ROUNDS = 10
+
+
+async def measure(client: InProcessClient, method: str, path: str, bodies: List, ops: int,
+                  latencies: List[int], headers: Dict[str, str] = None) -> None:
+    call = client.get if method == "GET" else client.post
+    perf = time.perf_counter_ns
+    for i in range(ops):
+        kwargs = {"headers": headers} if method == "GET" else {"json_body": bodies[i % len(bodies)]}
+        t0 = perf()
+        response = await call(path, **kwargs)
+        latencies.append(perf() - t0)
+        assert response.status_code in (200, 304), (path, response.status_code)
+
+
+def median_us(latencies: List[int]) -> float:
+    latencies.sort()
+    return latencies[len(latencies) // 2] / 1000
+
+
+async def endpoint_results(ops: int, messages: List[Dict]) -> List[tuple]:
+    rows = []
+    async with InProcessClient(legacy_app()) as before, InProcessClient(main.app) as after:
+        etag = (await after.get("/full-system-info")).headers["etag"]
+        cases = [
+            ("GET /", "GET", "/", None, None),
+            ("GET /full-system-info", "GET", "/full-system-info", None, None),
+            ("GET /full-system-info (304)", "GET", "/full-system-info", None, {"If-None-Match": etag}),
+            ("POST /analyze/message", "POST", "/analyze/message", messages, None),
+        ]
+        for name, method, path, bodies, headers in cases:
+            # İki uygulama sırayla, turlar hâlinde ölçülür (ısınma / sistem gürültüsü ikisine eşit dağılır)
+            old: List[int] = []
+            new: List[int] = []
+            for _ in range(ROUNDS):
+                await measure(before, method, path, bodies, ops // ROUNDS, old)
+                await measure(after, method, path, bodies, ops // ROUNDS, new, headers)
+            rows.append((name, median_us(old), median_us(new)))
+    return rows
+
+
+def per_call_us(func: Callable, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - started) / number * 1e6
+
+
+def serializer_results(messages: List[Dict], number: int) -> List[tuple]:
+    scoring.VERDICT_CACHE = None
+    response = scoring.score_message(MessageAnalysisRequest(**messages[0]))
+    batch = scoring.build_batch_response(messages[:100])
+    field = create_response_field(name="response", type_=AnalysisResponse)
+    loop = asyncio.new_event_loop()
+
+    async def fastapi_path():
+        content = await serialize_response(field=field, response_content=response)
+        return JSONResponse(content).body
+
+    rows = [
+        ("AnalysisResponse: FastAPI", per_call_us(lambda: loop.run_until_complete(fastapi_path()), number)
+         - per_call_us(lambda: loop.run_until_complete(asyncio.sleep(0)), number)),
+        ("AnalysisResponse: model_dump_json", per_call_us(lambda: response.model_dump_json().encode(), number)),
+        ("batch[100]: model_dump_json", per_call_us(lambda: batch.model_dump_json().encode(), number // 50)),
+    ]
+    loop.close()
+    for backend in ("pydantic", "orjson"):
+        if backend == "orjson" and json_responses.orjson is None:
+            continue
+        json_responses.USE_ORJSON = backend == "orjson"
+        rows.append((f"AnalysisResponse: dumps_model[{backend}]",
+                     per_call_us(lambda: json_responses.dumps_model(response), number)))
+        rows.append((f"batch[100]: dumps_model[{backend}]",
+                     per_call_us(lambda: json_responses.dumps_model(batch), number // 50)))
+    return rows
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Yanıt serileştirme önce/sonra")
+    parser.add_argument("--ops", type=int, default=3000)
+    args = parser.parse_args()
+
+    messages = [{"message": m["message"], "sender_phone": m["sender_phone"]} for m in generate_messages(500, seed=0)]
+    scoring.VERDICT_CACHE = None
+
+    print(f"JSON: {'orjson' if json_responses.USE_ORJSON else 'pydantic'}")
+    print(f"{'endpoint (ASGI, p50)':<32} | {'önce µs':>9} | {'sonra µs':>9} | {'hızlanma':>8}")
+    print("-" * 68)
+    for name, old, new in asyncio.run(endpoint_results(args.ops, messages)):
+        print(f"{name:<32} | {old:>9.1f} | {new:>9.1f} | {old / new:>7.2f}x")
+
+    print()
+    print(f"{'serileştirici':<40} | {'µs/çağrı':>9}")
+    print("-" * 53)
+    for name, us in serializer_results(messages, args.ops * 5):
+        print(f"{name:<40} | {us:>9.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
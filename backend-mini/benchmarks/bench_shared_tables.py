@@ -0,0 +1,140 @@
+"""
+Paylaşılan Tablolar Benchmark'ı
+===============================
+
+Geçici bir dizinde büyük bir kural dosyası (gerçek kurallar + sentetik
+keyword ve domain'ler) ve telefon kara listesi kurar, W worker sürecini
+aynı anda başlatır ve her süreç kuralları + kara listeyi yükleyip tüm
+sayfalarına dokunduktan sonra raporlar:
+- yükleme süresi (paylaşılan modda ilk worker kurar, diğerleri eşler),
+- worker başına RSS ve toplam PSS (Linux /proc/<pid>/smaps_rollup),
+- tabloların PSS payı (tabloları yüklemeyen bir sürece göre).
+
+Özel modda (PATTERNA_SHARED_TABLES=0) her worker kendi kopyasını kurar;
+paylaşılan modda tablolar bir kez yayınlanıp eşlenir.
+
+Kullanım:
+    python benchmarks/bench_shared_tables.py
+    python benchmarks/bench_shared_tables.py --domains 1000000 --numbers 10000000 --workers 8
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_domains import synthetic_domains  # noqa: E402
+from bench_keywords import synthetic_keywords  # noqa: E402
+from phone_blacklist import PhoneBlacklist  # noqa: E402
+from shared_tables import memory_report  # noqa: E402
+
+WORKER_CODE = """
+import gc, hashlib, json, sys, time
+sys.path.insert(0, {app_dir!r})
+import phone_blacklist, rules
+if {load!r}:
+    started = time.perf_counter()
+    snapshot = rules.load_rules()
+    blacklist = phone_blacklist.get_phone_blacklist()
+    seconds = time.perf_counter() - started
+    gc.collect()
+    if snapshot.shared:
+        # Eşlenmiş tabloların tüm sayfalarına dokun (en kötü durum)
+        arrays = [*snapshot.domain_index.arrays(), snapshot.matcher._table,
+                  snapshot.suspicious_domains._offsets, snapshot.suspicious_domains._data]
+        for values in arrays:
+            if values is not None:
+                hashlib.md5(memoryview(values).cast("B")).digest()
+    hashlib.md5(memoryview(blacklist._keys.table).cast("B")).digest()
+    print(json.dumps({{"seconds": seconds, "shared": snapshot.shared,
+                      "blacklist_shared": blacklist.status()["shared"]}}), flush=True)
+else:
+    print("{{}}", flush=True)
+sys.stdin.readline()
+"""
+
+
+def build_inputs(directory: str, args) -> dict:
+    with open(APP_DIR / "rules.json", encoding="utf-8") as f:
+        data = json.load(f)
+    keywords = synthetic_keywords(args.keywords)
+    third = len(keywords) // 3
+    data["keywords"] = {"fraud": keywords[:third], "urgency": keywords[third:2 * third],
+                        "money": keywords[2 * third:]}
+    data["suspicious_domains"] = synthetic_domains(args.domains)
+    rules_path = os.path.join(directory, "rules.json")
+    with open(rules_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+    db_path = os.path.join(directory, "blacklist.db")
+    rng = random.Random(5)
+    PhoneBlacklist(db_path).bulk_import(
+        (f"+905{rng.randrange(10**9):09d}", 80, "bench") for _ in range(args.numbers))
+    return {
+        "PATTERNA_RULES_PATH": rules_path,
+        "PATTERNA_DB_PATH": db_path,
+        "PATTERNA_RULES_CACHE_DIR": os.path.join(directory, "cache"),
+        "PATTERNA_SHARED_DIR": os.path.join(directory, "shared"),
+    }
+
+
+def run_workers(env: dict, workers: int):
+    """W yükleyen süreç + 1 referans süreç -> (sonuçlar, bellek raporu, referans PSS MB)"""
+    procs = [subprocess.Popen([sys.executable, "-c", WORKER_CODE.format(app_dir=str(APP_DIR), load=load)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+                              env={**os.environ, **env})
+             for load in [True] * workers + [False]]
+    try:
+        results = [json.loads(proc.stdout.readline()) for proc in procs]
+        report = memory_report([proc.pid for proc in procs[:-1]])
+        baseline = memory_report([procs[-1].pid])
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    return results[:-1], report, baseline["total"]["pss_mb"] if baseline["available"] else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paylaşılan tablolar benchmark'ı")
+    parser.add_argument("--domains", type=int, default=1_000_000, help="Şüpheli domain sayısı")
+    parser.add_argument("--keywords", type=int, default=10_000, help="Keyword sayısı")
+    parser.add_argument("--numbers", type=int, default=1_000_000, help="Kara listedeki numara sayısı")
+    parser.add_argument("--workers", type=int, default=4, help="Worker süreci sayısı")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("Bu benchmark /proc/<pid>/smaps_rollup gerektirir (Linux)")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        env = build_inputs(tmp, args)
+        print(f"Girdi       : {args.domains:,} domain, {args.keywords:,} keyword, {args.numbers:,} numara "
+              f"({time.perf_counter() - started:.1f}s)")
+        print(f"{'mod':<11} | {'yükleme s':>9} | {'RSS/worker':>10} | {'PSS toplam':>10} | {'tablo payı':>10}")
+        print("-" * 63)
+        for label, shared in (("özel", "0"), ("paylaşılan", "1")):
+            results, report, baseline = run_workers({**env, "PATTERNA_SHARED_TABLES": shared}, args.workers)
+            if any(r["shared"] != (shared == "1") or r["blacklist_shared"] != (shared == "1") for r in results):
+                print(f"UYARI: {label} modunda tablolar beklenen şekilde yüklenmedi: {results}")
+            total = report["total"]
+            rss = total["rss_mb"] / args.workers
+            tables = total["pss_mb"] - args.workers * baseline
+            seconds = max(r["seconds"] for r in results)
+            print(f"{label:<11} | {seconds:>9.2f} | {rss:>7,.0f} MB | {total['pss_mb']:>7,.0f} MB | {tables:>7,.0f} MB")
+        print(f"({args.workers} worker; PSS paylaşılan sayfayı süreçler arasında böler, "
+              f"toplam PSS gerçek bellek kullanımıdır)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Soğuk Başlangıç Benchmark'ı
+===========================
+
+Sıfırdan ölçeklenen pod'larda başlangıç süresi doğrudan kuyruk gecikmesine
+yansır. Her ölçüm yeni bir Python sürecinde yapılır (ısınmış modül yok):
+
+- import_scoring : `import scoring` (toplu skorlama CLI'ı, benchmark'lar)
+- import_main    : `import main` (FastAPI uygulaması dahil)
+- first_response : `python server.py` başlatılmasından ilk başarılı
+                   /analyze/message yanıtına kadar (kural + kara liste
+                   yükleme, uvicorn başlangıcı dahil)
+
+Her ölçüm --repeat kez tekrarlanır ve medyan raporlanır. Bütçeyi aşan
+ölçüm varsa çıkış kodu 1'dir (CI'da başlangıç süresi regresyon kapısı).
+
+Kullanım:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 7 --json
+    python benchmarks/bench_startup.py --budget-first-response-ms 800
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SERVER_PATH = APP_DIR / "server.py"
+
+# Varsayılan bütçeler (ms); 1 çekirdekli CI makinesinde ölçülenin ~2 katı
+DEFAULT_BUDGETS = {
+    "import_scoring": 150.0,
+    "import_main": 300.0,
+    "first_response": 500.0,
+}
+
+PROBE_BODY = json.dumps({"message": "Acil! Hesabınız bloke edildi, http://bit.ly/x tıklayın"}).encode()
+
+
+def import_ms(module: str) -> float:
+    """Yeni bir süreçte modül import süresi"""
+    code = ("import time; t = time.perf_counter_ns(); "
+            f"import {module}; print((time.perf_counter_ns() - t) / 1e6)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=str(APP_DIR), check=True,
+                         capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def probe(host: str, port: int) -> bool:
+    conn = http.client.HTTPConnection(host, port, timeout=2)
+    try:
+        conn.request("POST", "/analyze/message", PROBE_BODY, {"Content-Type": "application/json"})
+        return conn.getresponse().status == 200
+    except OSError:
+        return False
+    finally:
+        conn.close()
+
+
+def first_response_ms(host: str, port: int, timeout: float = 30.0) -> float:
+    """Sunucu sürecinin başlatılmasından ilk skorlanmış yanıta kadar geçen süre"""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER_PATH), "--host", host, "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=str(APP_DIR),
+    )
+    try:
+        while not probe(host, port):
+            if server.poll() is not None:
+                raise RuntimeError("Sunucu başlarken kapandı")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("Sunucu zamanında başlamadı")
+            time.sleep(0.005)
+        return (time.perf_counter() - started) * 1000
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def run(args) -> Dict[str, Dict[str, float]]:
+    measures = {
+        "import_scoring": lambda: import_ms("scoring"),
+        "import_main": lambda: import_ms("main"),
+        "first_response": lambda: first_response_ms(args.host, args.port),
+    }
+    budgets = {
+        "import_scoring": args.budget_import_scoring_ms,
+        "import_main": args.budget_import_main_ms,
+        "first_response": args.budget_first_response_ms,
+    }
+    results = {}
+    for name, measure in measures.items():
+        if args.only and name not in args.only:
+            continue
+        measure()  # ısınma: .pyc ve derlenmiş kural önbelleği oluşsun (pod imajında hazır olur)
+        samples: List[float] = [measure() for _ in range(args.repeat)]
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 1),
+            "min_ms": round(min(samples), 1),
+            "max_ms": round(max(samples), 1),
+            "budget_ms": budgets[name],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import ve ilk yanıt süresi (soğuk başlangıç)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=sorted(DEFAULT_BUDGETS), help="Sadece bu ölçümler")
+    parser.add_argument("--budget-import-scoring-ms", type=float, default=DEFAULT_BUDGETS["import_scoring"])
+    parser.add_argument("--budget-import-main-ms", type=float, default=DEFAULT_BUDGETS["import_main"])
+    parser.add_argument("--budget-first-response-ms", type=float, default=DEFAULT_BUDGETS["first_response"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'ölçüm':<16} | {'medyan ms':>9} | {'min':>7} | {'max':>7} | {'bütçe':>7}")
+        print("-" * 60)
+        for name, r in results.items():
+            flag = "  AŞILDI" if r["median_ms"] > r["budget_ms"] else ""
+            print(f"{name:<16} | {r['median_ms']:>9.1f} | {r['min_ms']:>7.1f} | {r['max_ms']:>7.1f} | "
+                  f"{r['budget_ms']:>7.0f}{flag}")
+
+    over = [name for name, r in results.items() if r["median_ms"] > r["budget_ms"]]
+    if over:
+        print(f"\nBaşlangıç bütçesi aşıldı: {', '.join(over)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
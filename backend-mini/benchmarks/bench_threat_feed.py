@@ -0,0 +1,147 @@
+"""
+Tehdit Listesi İndeksi Benchmark'ı
+==================================
+
+Geçici bir dizinde N sentetik phishing URL'sinden (yarısı düz liste, yarısı
+URLhaus CSV biçiminde) indeks derler, ardından:
+- derleme hızını (URL/s) ve dosya boyutunu,
+- indeksin eşlenme (yükleme) süresini,
+- sorgu maliyetini (isabet / ıskalama, kanonikleştirme dahil),
+- W worker sürecinin indeksi eşleyip tüm sayfalarına dokunduktan sonraki
+  RSS / PSS değerlerini (Linux /proc/<pid>/smaps_rollup)
+raporlar. PSS toplamı, paylaşılan sayfaların süreçler arasında bir kez
+sayıldığı gerçek bellek kullanımıdır.
+
+Kullanım:
+    python benchmarks/bench_threat_feed.py --count 1000000
+    python benchmarks/bench_threat_feed.py --count 10000000 --workers 4
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from threat_feed import ThreatFeedIndex, build_index, read_feed_file  # noqa: E402
+
+TLDS = ("com", "net", "xyz", "top", "online", "info", "com.tr")
+PATHS = ("giris", "login", "hesap/dogrula", "odeme", "kargo/takip", "wp-admin/sec")
+
+
+def random_urls(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        f"http{'s' if rng.random() < 0.5 else ''}://{rng.choice(('', 'www.', 'secure.'))}"
+        f"x{rng.randrange(10**9):09d}.{rng.choice(TLDS)}/{rng.choice(PATHS)}?id={rng.randrange(10**6)}"
+        for _ in range(count)
+    ]
+
+
+def write_feeds(directory: str, urls: List[str]) -> List[str]:
+    half = len(urls) // 2
+    txt_path = os.path.join(directory, "openphish.txt")
+    with open(txt_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(urls[:half]) + "\n")
+    csv_path = os.path.join(directory, "urlhaus.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write('# id,dateadded,url,url_status,last_online,threat,tags,urlhaus_link,reporter\n')
+        for i, url in enumerate(urls[half:]):
+            f.write(f'"{i}","2025-01-01 00:00:00","{url}","online","","malware_download","","","bench"\n')
+    return [txt_path, csv_path]
+
+
+WORKER_CODE = """
+import hashlib, sys
+sys.path.insert(0, {app_dir!r})
+from threat_feed import ThreatFeedIndex
+if {path!r}:
+    index = ThreatFeedIndex({path!r})
+    hashlib.md5(index._mmap).digest()  # tüm sayfalara dokun (en kötü durum)
+print("ready", flush=True)
+sys.stdin.readline()
+"""
+
+
+def smaps_rollup(pid: int) -> Dict[str, int]:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return values
+
+
+def measure_workers(path: str, workers: int) -> None:
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("RSS ölçümü atlandı (/proc/<pid>/smaps_rollup yok)")
+        return
+    # Son süreç referanstır: aynı modülleri import eder ama indeksi eşlemez
+    procs = [subprocess.Popen([sys.executable, "-c", WORKER_CODE.format(app_dir=str(APP_DIR), path=p)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+             for p in [path] * workers + [""]]
+    try:
+        for proc in procs:
+            proc.stdout.readline()
+        *stats, baseline = [smaps_rollup(proc.pid) for proc in procs]
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    index_mb = os.path.getsize(path) / 2**20
+    rss = [s["Rss"] / 1024 for s in stats]
+    pss = [s["Pss"] / 1024 for s in stats]
+    shared = [(s.get("Shared_Clean", 0) + s.get("Shared_Dirty", 0)) / 1024 for s in stats]
+    print(f"Worker'lar  : {workers} süreç, indeks {index_mb:,.0f} MB (tüm sayfalar okundu)")
+    print(f"  RSS       : {sum(rss) / workers:,.0f} MB/worker (paylaşılan {sum(shared) / workers:,.0f} MB)")
+    extra = sum(pss) - workers * baseline["Pss"] / 1024
+    print(f"  PSS toplam: {sum(pss):,.0f} MB, indeksin payı {extra:,.0f} MB "
+          f"(indekssiz süreç {baseline['Pss'] / 1024:,.0f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tehdit listesi indeksi benchmark'ı")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Feed'deki URL sayısı")
+    parser.add_argument("--queries", type=int, default=200_000, help="Ölçülecek sorgu sayısı")
+    parser.add_argument("--workers", type=int, default=4, help="RSS ölçümü için worker süreci sayısı")
+    args = parser.parse_args()
+
+    urls = random_urls(args.count, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_feeds(tmp, urls)
+        index_path = os.path.join(tmp, "threat_feed.idx")
+
+        start = time.perf_counter()
+        result = build_index([(os.path.basename(p), read_feed_file(p)) for p in paths], index_path)
+        build_s = time.perf_counter() - start
+        print(f"Derleme     : {result['entries']:,} girdi, {build_s:.1f}s ({args.count / build_s:,.0f} URL/s), "
+              f"{os.path.getsize(index_path) / 2**20:,.0f} MB")
+
+        start = time.perf_counter()
+        index = ThreatFeedIndex(index_path)
+        print(f"Eşleme      : {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        sample = min(args.queries, len(urls))
+        hits = random.Random(2).sample(urls, sample)
+        misses = random_urls(sample, seed=3)
+        for label, queries in (("İsabet", hits), ("Iskalama", misses)):
+            start = time.perf_counter()
+            found = sum(1 for url in queries if index.match(url))
+            per_query = (time.perf_counter() - start) / len(queries) * 1e6
+            print(f"{label:<12}: {per_query:.2f} µs/sorgu ({found:,}/{len(queries):,} listede)")
+        del index
+
+        measure_workers(index_path, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Worker Ölçeklenme Yük Testi
+===========================
+
+Sunucuyu farklı worker sayılarıyla (`python server.py --workers N`) ayrı
+süreç olarak başlatır ve keep-alive bağlantılar üzerinden kapalı döngü
+(her bağlantı bir yanıt aldıktan sonra yenisini gönderir) yük uygular.
+Her worker sayısı için throughput ve p50/p99 gecikme raporlanır.
+
+Yük üreticisi de aynı makinede çalışır; anlamlı sonuç için yük üreticisine
+de çekirdek bırakın (örn. 32 çekirdekte --workers 1 2 4 8 16).
+
+Kullanım:
+    python benchmarks/load_test.py --workers 1 2 4 --connections 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from traffic import generate_messages  # noqa: E402
+
+SERVER_PATH = BENCH_DIR.parent / "server.py"
+
+
+def build_requests(path: str, count: int, seed: int) -> List[bytes]:
+    requests = []
+    for item in generate_messages(count, seed=seed):
+        body = json.dumps({"message": item["message"], "sender_phone": item["sender_phone"]},
+                          ensure_ascii=False).encode("utf-8")
+        head = (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode()
+        requests.append(head + body)
+    return requests
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """HTTP/1.1 yanıtını oku, durum kodunu döndür"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line[:15].lower() == b"content-length:":
+            length = int(line[15:])
+    if length:
+        await reader.readexactly(length)
+    return status
+
+
+async def connection_worker(host: str, port: int, requests: List[bytes], offset: int,
+                            deadline: float, latencies: List[int], errors: List[int]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    perf = time.perf_counter_ns
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            t0 = perf()
+            writer.write(requests[i % len(requests)])
+            status = await read_response(reader)
+            latencies.append(perf() - t0)
+            if status != 200:
+                errors.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, requests: List[bytes], connections: int, duration: float) -> Dict:
+    latencies: List[int] = []
+    errors: List[int] = []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        connection_worker(host, port, requests, c * 97, deadline, latencies, errors)
+        for c in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] / 1e6, 2) if latencies else 0.0,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] / 1e6, 2) if latencies else 0.0,
+    }
+
+
+async def wait_ready(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            if await read_response(reader) == 200:
+                writer.close()
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Sunucu zamanında başlamadı")
+
+
+def run_for_workers(workers: int, args, requests: List[bytes]) -> Dict:
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER_PATH), "--host", args.host, "--port", str(args.port),
+         "--workers", str(workers), "--scoring-threads", str(args.scoring_threads), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=str(SERVER_PATH.parent),
+    )
+    try:
+        asyncio.run(wait_ready(args.host, args.port))
+        asyncio.run(run_load(args.host, args.port, requests, args.connections, min(args.duration, 2.0)))  # ısınma
+        return asyncio.run(run_load(args.host, args.port, requests, args.connections, args.duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker sayısına göre throughput ölçümü")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--path", default="/analyze/message")
+    parser.add_argument("--scoring-threads", type=int, default=4)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    requests = build_requests(args.path, 2000, seed=0)
+    results = {}
+    print(f"CPU: {os.cpu_count()} | bağlantı: {args.connections} | süre: {args.duration}s | {args.path}")
+    print(f"{'workers':>7} | {'istek/s':>9} | {'p50 ms':>7} | {'p99 ms':>7} | {'hata':>5} | {'ölçek':>6}")
+    print("-" * 58)
+    for workers in args.workers:
+        result = run_for_workers(workers, args, requests)
+        results[workers] = result
+        scale = result["rps"] / results[args.workers[0]]["rps"] if results[args.workers[0]]["rps"] else 0
+        print(f"{workers:>7} | {result['rps']:>9,.0f} | {result['p50_ms']:>7.2f} | "
+              f"{result['p99_ms']:>7.2f} | {result['errors']:>5} | {scale:>5.2f}x")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
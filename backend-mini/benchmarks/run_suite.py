@@ -0,0 +1,286 @@
+"""
+Patterna Shield Mini - Performans Benchmark Paketi
+==================================================
+
+Her skorlayıcı fonksiyonu süreç içinde, tüm FastAPI uygulamasını ise süreç
+içi ASGI istemcisiyle (ağ yok) ölçer. Veri: `examples/sample_data.json` +
+sentetik Türkçe SMS trafiği (benchmarks/traffic.py).
+
+Her benchmark için p50 / p95 / p99 gecikme, throughput (işlem/s) ve
+tracemalloc ile ölçülen tepe bellek raporlanır. Sonuçlar makinece okunabilir
+bir baseline dosyasına kaydedilip sonraki çalıştırmalarla karşılaştırılabilir.
+
+Kullanım:
+    python benchmarks/run_suite.py
+    python benchmarks/run_suite.py --save-baseline            # benchmarks/baseline.json
+    python benchmarks/run_suite.py --compare                  # regresyon varsa çıkış kodu 1
+    python benchmarks/run_suite.py --only calculate_risk_score app:/analyze/message
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+import main  # noqa: E402
+import scoring  # noqa: E402
+from asgi_client import InProcessClient  # noqa: E402
+from traffic import generate_messages, generate_phones, generate_urls, load_sample_data  # noqa: E402
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+# Baseline'a göre bu oranın üzerindeki yavaşlama regresyon sayılır
+DEFAULT_THRESHOLD = 0.25
+
+# Bellek ölçümü (tracemalloc yavaştır) için kullanılan işlem sayısı
+MEMORY_SAMPLE_OPS = 300
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies_ns: List[int], elapsed_s: float) -> Dict[str, float]:
+    values = sorted(latencies_ns)
+    return {
+        "ops": len(values),
+        "p50_us": round(percentile(values, 50) / 1000, 2),
+        "p95_us": round(percentile(values, 95) / 1000, 2),
+        "p99_us": round(percentile(values, 99) / 1000, 2),
+        "mean_us": round(sum(values) / len(values) / 1000, 2),
+        "throughput_ops": round(len(values) / elapsed_s, 1),
+    }
+
+
+def build_workload(count: int, seed: int) -> Dict[str, List]:
+    """sample_data.json + sentetik trafik"""
+    sample = load_sample_data()
+    messages = [{"message": m["message"], "sender_phone": m["sender_phone"]} for m in sample["messages"]]
+    messages += [
+        {"message": m["message"], "sender_phone": m["sender_phone"]}
+        for m in generate_messages(count, seed=seed)
+    ]
+    return {
+        "messages": messages,
+        "phones": sample["phones"] + generate_phones(count, seed=seed),
+        "urls": sample["urls"] + generate_urls(count, seed=seed),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Süreç içi skorlayıcılar
+# ---------------------------------------------------------------------------
+
+def run_function(fn: Callable, inputs: List, ops: int, warmup: int) -> Dict[str, float]:
+    for i in range(warmup):
+        fn(inputs[i % len(inputs)])
+
+    latencies = []
+    perf = time.perf_counter_ns
+    started = time.perf_counter()
+    for i in range(ops):
+        item = inputs[i % len(inputs)]
+        t0 = perf()
+        fn(item)
+        latencies.append(perf() - t0)
+    result = summarize(latencies, time.perf_counter() - started)
+
+    tracemalloc.start()
+    for i in range(min(ops, MEMORY_SAMPLE_OPS)):
+        fn(inputs[i % len(inputs)])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["peak_memory_kb"] = round(peak / 1024, 1)
+    return result
+
+
+def scorer_benchmarks(workload: Dict[str, List]) -> Dict[str, tuple]:
+    requests = [scoring.MessageAnalysisRequest(**m) for m in workload["messages"]]
+    return {
+        "calculate_risk_score": (lambda m: scoring.calculate_risk_score(m["message"]), workload["messages"]),
+        "check_phone_risk": (scoring.check_phone_risk, workload["phones"]),
+        "check_url_safety": (scoring.check_url_safety, workload["urls"]),
+        "score_message": (scoring.score_message, requests),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tüm uygulama (ASGI)
+# ---------------------------------------------------------------------------
+
+async def run_endpoint(client: InProcessClient, path: str, bodies: List, ops: int, warmup: int) -> Dict[str, float]:
+    for i in range(warmup):
+        await client.post(path, bodies[i % len(bodies)])
+
+    latencies = []
+    errors = 0
+    perf = time.perf_counter_ns
+    started = time.perf_counter()
+    for i in range(ops):
+        t0 = perf()
+        response = await client.post(path, bodies[i % len(bodies)])
+        latencies.append(perf() - t0)
+        if response.status_code != 200:
+            errors += 1
+    result = summarize(latencies, time.perf_counter() - started)
+    result["errors"] = errors
+
+    tracemalloc.start()
+    for i in range(min(ops, MEMORY_SAMPLE_OPS)):
+        await client.post(path, bodies[i % len(bodies)])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["peak_memory_kb"] = round(peak / 1024, 1)
+    return result
+
+
+def app_benchmarks(workload: Dict[str, List], batch_size: int) -> Dict[str, tuple]:
+    messages = workload["messages"]
+    batches = [
+        {"messages": messages[i:i + batch_size]}
+        for i in range(0, max(len(messages) - batch_size, 1), batch_size)
+    ]
+    return {
+        "app:/analyze/message": ("/analyze/message", messages, 1),
+        "app:/analyze/phone": ("/analyze/phone", [{"phone_number": p} for p in workload["phones"]], 1),
+        "app:/analyze/url": ("/analyze/url", [{"url": u} for u in workload["urls"]], 1),
+        f"app:/analyze/batch[{batch_size}]": ("/analyze/batch", batches, batch_size),
+    }
+
+
+async def run_app(selected: Dict[str, tuple], ops: int, warmup: int) -> Dict[str, Dict]:
+    results = {}
+    async with InProcessClient(main.app) as client:
+        for name, (path, bodies, items_per_op) in selected.items():
+            op_count = max(ops // items_per_op, 20)
+            result = await run_endpoint(client, path, bodies, op_count, min(warmup, op_count))
+            if items_per_op > 1:
+                result["items_per_op"] = items_per_op
+                result["throughput_items"] = round(result["throughput_ops"] * items_per_op, 1)
+            results[name] = result
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baseline
+# ---------------------------------------------------------------------------
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, threshold: float) -> List[str]:
+    """Baseline'a göre regresyonları listele.
+
+    p95/p99 gürültülü olduğundan sadece raporlanır; kapı p50 ve throughput'tur.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if base["p50_us"] and result["p50_us"] > base["p50_us"] * (1 + threshold):
+            regressions.append(f"{name}: p50_us {base['p50_us']} -> {result['p50_us']}")
+        if base["throughput_ops"] and result["throughput_ops"] < base["throughput_ops"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {base['throughput_ops']} -> {result['throughput_ops']}")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict], baseline: Dict) -> None:
+    print(f"{'benchmark':<28} | {'p50 µs':>9} | {'p95 µs':>9} | {'p99 µs':>9} | {'ops/s':>10} | {'tepe KB':>8} | {'Δp50':>6}")
+    print("-" * 98)
+    for name, r in results.items():
+        base = baseline.get("results", {}).get(name)
+        delta = f"{(r['p50_us'] / base['p50_us'] - 1) * 100:+.0f}%" if base and base["p50_us"] else "-"
+        print(f"{name:<28} | {r['p50_us']:>9.2f} | {r['p95_us']:>9.2f} | {r['p99_us']:>9.2f} | "
+              f"{r['throughput_ops']:>10,.0f} | {r['peak_memory_kb']:>8.1f} | {delta:>6}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Patterna Shield benchmark paketi")
+    parser.add_argument("--ops", type=int, default=5000, help="Benchmark başına işlem sayısı")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=2000, help="Sentetik mesaj sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--with-cache", action="store_true", help="Karar önbelleği açık ölç")
+    parser.add_argument("--only", nargs="+", help="Sadece bu benchmark'lar")
+    parser.add_argument("--save-baseline", nargs="?", const=str(DEFAULT_BASELINE), help="Sonuçları baseline olarak kaydet")
+    parser.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE), help="Baseline ile karşılaştır")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regresyon eşiği (0.25 = %%25)")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yazdır")
+    args = parser.parse_args()
+
+    if not args.with_cache:
+        scoring.VERDICT_CACHE = None
+
+    workload = build_workload(args.messages, args.seed)
+    scorers = scorer_benchmarks(workload)
+    endpoints = app_benchmarks(workload, args.batch_size)
+    if args.only:
+        scorers = {k: v for k, v in scorers.items() if k in args.only}
+        endpoints = {k: v for k, v in endpoints.items() if k in args.only}
+
+    results = {}
+    for name, (fn, inputs) in scorers.items():
+        results[name] = run_function(fn, inputs, args.ops, args.warmup)
+    if endpoints:
+        results.update(asyncio.run(run_app(endpoints, args.ops, args.warmup)))
+
+    baseline = {}
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "environment": environment(),
+                "config": {"ops": args.ops, "messages": args.messages, "seed": args.seed,
+                           "batch_size": args.batch_size, "with_cache": args.with_cache},
+                "results": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline kaydedildi: {args.save_baseline}")
+
+    if args.compare:
+        if not baseline:
+            print(f"\n⚠️ Baseline bulunamadı: {args.compare}")
+            return
+        if baseline.get("environment") != environment():
+            print("\n⚠️ Baseline farklı bir ortamda alınmış; karşılaştırma yanıltıcı olabilir.")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresyon (eşik %{args.threshold * 100:.0f}):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\n✅ Regresyon yok (eşik %{args.threshold * 100:.0f})")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,160 @@
+"""
+Sentetik Türkçe SMS Trafiği
+===========================
+
+Benchmark'lar için `examples/sample_data.json` verisini yükler ve gerçekçi
+Türkçe SMS trafiği üretir: banka / ödül / kargo / e-Devlet dolandırıcılık
+şablonları, normal mesajlar, kampanya tekrarları (aynı metnin birçok
+alıcıya gitmesi) ve karışık formatlı telefon numaraları.
+
+Üretilen mesajlar etiketlidir (`is_fraud`), bu yüzden eğitim verisi olarak
+da kullanılabilir:
+    python benchmarks/traffic.py --count 10000 > trafik.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+SAMPLE_DATA_PATH = Path(__file__).resolve().parent.parent / "examples" / "sample_data.json"
+
+NAMES = ["Ahmet", "Ayşe", "Mehmet", "Fatma", "Mustafa", "Zeynep", "Emre", "Elif", "Murat", "Şule", "İbrahim", "Gül"]
+BANKS = ["Ziraat", "Halkbank", "Vakıfbank", "Garanti BBVA", "İş Bankası", "Yapı Kredi", "Akbank"]
+FRAUD_LINKS = [
+    "http://bit.ly/{code}", "https://tinyurl.com/{code}", "http://garanti.net/giris",
+    "http://yapikredi.net/onay?id={code}", "http://185.{a}.{b}.12/odeme", "https://e-devlet-iade.com/{code}",
+    "http://kargo-takip-tr.xyz/{code}", "https://bankam.com/guvenlik",
+]
+
+FRAUD_TEMPLATES = [
+    "Sayın {name}, {bank} hesabınız güvenlik nedeniyle bloke edilmiştir. Doğrulamak için {link} adresine tıklayınız.",
+    "TEBRİKLER! {amount} TL değerinde hediye çeki kazandınız. Ödülünüzü almak için hemen {link}",
+    "Kargonuz teslim edilemedi. Adres güncellemesi için {link} (Ücret: {small} TL)",
+    "e-Devlet: {amount} TL vergi iadeniz hazır. Başvuru için son gün bugün: {link}",
+    "{bank} kredi kartı aidat iadesi için kart bilgilerinizi {link} üzerinden onaylayınız.",
+    "ACİL! {name} Bey/Hanım, borcunuz nedeniyle icra işlemi başlatılacaktır. Bilgi için {phone} numarasını arayınız.",
+    "Bonus kampanyası! {amount} TL bedava bonus, kaçırma: {link}",
+    "Şifreniz sıfırlandı. İşlemi siz yapmadıysanız hemen {link} adresinden CVV ve PIN bilgilerinizi doğrulayın.",
+    "Son şans! {name}, {amount} TL krediniz onaylandı, para transferi için {phone} numarasına ödeme yapın.",
+]
+
+BENIGN_TEMPLATES = [
+    "Merhaba {name}, akşam yemeğe geliyor musun?",
+    "Toplantı yarın saat {hour}:00'da, görüşmek üzere.",
+    "{bank}: {day}.{month} tarihli {small} TL tutarındaki harcamanız onaylanmıştır.",
+    "Doğrulama kodunuz: {code6}. Bu kodu kimseyle paylaşmayınız.",
+    "Siparişiniz kargoya verildi, takip no: {code6}",
+    "Anneciğim nasılsın, hafta sonu geliyoruz. {name} de selam söylüyor.",
+    "Randevunuz {day}.{month} saat {hour}:30 olarak oluşturulmuştur.",
+    "Faturanız {small} TL, son ödeme tarihi {day}.{month}. İyi günler dileriz.",
+    "{name}, maç kaçta başlıyor? Ben biraz geç kalabilirim.",
+]
+
+BENIGN_URLS = [
+    "https://www.google.com", "https://www.turkiye.gov.tr", "https://www.garantibbva.com.tr/kampanyalar",
+    "http://example.com", "https://github.com/zey1r", "https://www.trendyol.com/sepet",
+]
+
+
+def random_phone(rng: random.Random, suspicious: bool = False) -> str:
+    """Karışık formatlı telefon numarası (0555..., +90 555 ..., 0850 ...)"""
+    if suspicious and rng.random() < 0.5:
+        prefix = rng.choice(["0850", "0900", "+90850", "0 850 "])
+        return f"{prefix}{rng.randrange(10**7):07d}"
+    number = f"5{rng.randrange(30, 60)}{rng.randrange(10**7):07d}"
+    style = rng.random()
+    if style < 0.5:
+        return "0" + number
+    if style < 0.8:
+        return "+90" + number
+    return f"0{number[:3]} {number[3:6]} {number[6:8]} {number[8:]}"
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    code = "".join(rng.choice("abcdefghjkmnpqrstuvwxyz23456789") for _ in range(6))
+    link = rng.choice(FRAUD_LINKS).format(code=code, a=rng.randrange(256), b=rng.randrange(256))
+    return template.format(
+        name=rng.choice(NAMES), bank=rng.choice(BANKS), link=link,
+        amount=f"{rng.choice([1, 2, 5, 10, 25, 50])}.{rng.randrange(1000):03d}",
+        small=f"{rng.randrange(10, 500)},{rng.randrange(100):02d}",
+        phone=random_phone(rng, suspicious=True), hour=rng.randrange(8, 22),
+        day=rng.randrange(1, 29), month=rng.randrange(1, 13), code6=f"{rng.randrange(10**6):06d}",
+    )
+
+
+def generate_messages(count: int, seed: int = 0, fraud_ratio: float = 0.3,
+                      repeat_ratio: float = 0.4) -> List[Dict]:
+    """Etiketli sentetik mesaj trafiği.
+
+    repeat_ratio oranındaki mesajlar yakın zamanda gönderilmiş bir kampanya
+    mesajının birebir tekrarıdır (farklı alıcı, aynı metin ve gönderen).
+    """
+    rng = random.Random(seed)
+    recent: List[Dict] = []
+    messages = []
+    for _ in range(count):
+        if recent and rng.random() < repeat_ratio:
+            messages.append(dict(rng.choice(recent)))
+            continue
+        is_fraud = rng.random() < fraud_ratio
+        template = rng.choice(FRAUD_TEMPLATES if is_fraud else BENIGN_TEMPLATES)
+        item = {
+            "message": _fill(template, rng),
+            "sender_phone": random_phone(rng, suspicious=is_fraud),
+            "is_fraud": is_fraud,
+        }
+        messages.append(item)
+        recent.append(item)
+        if len(recent) > 200:
+            recent.pop(0)
+    return messages
+
+
+def generate_phones(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [random_phone(rng, suspicious=rng.random() < 0.2) for _ in range(count)]
+
+
+def generate_urls(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    urls = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            code = "".join(rng.choice("abcdefghjkmnpqrstuvwxyz23456789") for _ in range(6))
+            urls.append(rng.choice(FRAUD_LINKS).format(code=code, a=rng.randrange(256), b=rng.randrange(256)))
+        else:
+            urls.append(rng.choice(BENIGN_URLS))
+    return urls
+
+
+def load_sample_data() -> Dict[str, List]:
+    """examples/sample_data.json -> {"messages": [...], "phones": [...], "urls": [...]}"""
+    with open(SAMPLE_DATA_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        "messages": [
+            {**item["data"], "is_fraud": item["expected_result"]["is_fraud"]}
+            for item in data["test_messages"]
+        ],
+        "phones": [item["data"]["phone_number"] for item in data["test_phones"]],
+        "urls": [item["data"]["url"] for item in data["test_urls"]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik Türkçe SMS trafiği üret (JSONL)")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fraud-ratio", type=float, default=0.3)
+    parser.add_argument("--repeat-ratio", type=float, default=0.4)
+    args = parser.parse_args()
+
+    for item in generate_messages(args.count, args.seed, args.fraud_ratio, args.repeat_ratio):
+        sys.stdout.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Patterna Shield Mini - Toplu (Offline) Skorlama
+===============================================
+
+Arşivlenmiş trafiği HTTP API'ye uğramadan, çok çekirdekli olarak yeniden
+skorlar. Girdi JSONL veya CSV olabilir; her kayıtta şu alanlar aranır:
+
+- message (+ opsiyonel sender_phone) -> mesaj analizi
+- phone_number                       -> telefon analizi
+- url                                -> URL analizi
+- id                                 -> çıktıya aynen kopyalanır
+
+Çıktı JSONL'dir, her girdi satırı için bir satır yazılır:
+    {"offset": 0, "id": "...", "message": {...}, "phone": {...}, "url": {...}}
+
+Kullanım:
+    python bulk_score.py trafik.jsonl -o sonuclar.jsonl --workers 8
+    python bulk_score.py trafik.csv -o sonuclar.jsonl --resume
+
+Çökme sonrası devam:
+    Her chunk yazıldıktan sonra `<output>.checkpoint` dosyasına girdi ve çıktı
+    byte offset'leri kaydedilir. `--resume` ile çıktı son checkpoint'e kadar
+    kırpılır ve girdi aynı offset'ten okunmaya devam edilir. Belirli bir girdi
+    offset'inden başlamak için `--start-offset` kullanılabilir.
+
+Not: CSV'de her kayıt tek satırda olmalıdır (alan içinde newline desteklenmez).
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+# Arşivde gönderen hızı ölçülmez: mesajların gönderim zamanı değil işlenme hızı sayılırdı
+os.environ.setdefault("PATTERNA_VELOCITY", "0")
+# Kampanya indeksi worker süreçlerine bölünür ve sonuçlar satır sırasına bağlı kalırdı
+os.environ.setdefault("PATTERNA_CAMPAIGNS", "0")
+
+from scoring import (  # noqa: E402
+    AnalysisResponse, MessageAnalysisRequest, score_message, score_message_batch, score_phone, score_url,
+)
+
+# Bir chunk'ta okunacak satır sayısı
+DEFAULT_CHUNK_LINES = 2000
+
+# İlerleme raporu aralığı (saniye)
+PROGRESS_INTERVAL = 5.0
+
+
+def detect_format(path: str) -> str:
+    """Dosya uzantısından girdi formatını belirle"""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def parse_record(line: bytes, fmt: str, fieldnames: Optional[List[str]]) -> Optional[Dict]:
+    """Tek satırı kayıt sözlüğüne çevir (boş satır -> None)"""
+    text = line.decode("utf-8").strip()
+    if not text:
+        return None
+    if fmt == "csv":
+        values = next(csv.reader([text]))
+        return {k: v for k, v in zip(fieldnames, values) if v != ""}
+    record = json.loads(text)
+    if not isinstance(record, dict):
+        raise ValueError("Kayıt JSON nesnesi olmalı")
+    return record
+
+
+def message_request(record: Dict) -> Optional[MessageAnalysisRequest]:
+    """Kaydın mesaj isteği (mesaj alanı yoksa None)"""
+    if not record.get("message"):
+        return None
+    return MessageAnalysisRequest(message=record["message"], sender_phone=record.get("sender_phone"))
+
+
+def score_record(record: Dict, message_response: Optional[AnalysisResponse] = None) -> Dict:
+    """Kayıttaki mesaj, telefon ve URL alanlarını skorla
+
+    Mesaj kararı chunk'ın toplu hattından (score_message_batch) gelir;
+    verilmezse mesaj burada tek başına skorlanır.
+    """
+    result = {}
+    if "id" in record:
+        result["id"] = record["id"]
+    request = message_request(record)
+    if request is not None:
+        result["message"] = (message_response or score_message(request)).model_dump()
+    if record.get("phone_number"):
+        result["phone"] = score_phone(str(record["phone_number"])).model_dump()
+    if record.get("url"):
+        result["url"] = score_url(str(record["url"])).model_dump()
+    return result
+
+
+def process_chunk(job: Tuple[str, Optional[List[str]], int, List[bytes]]) -> Tuple[bytes, int, int]:
+    """Worker: bir chunk'ı skorla -> (çıktı byte'ları, kayıt sayısı, hata sayısı)"""
+    fmt, fieldnames, offset, lines = job
+    output = []
+    records = errors = 0
+
+    # Kayıtlar ayrıştırılır, mesajlar chunk başına bir kez toplu hattan geçer
+    parsed = []
+    requests = []
+    for line in lines:
+        try:
+            record = parse_record(line, fmt, fieldnames)
+            request = message_request(record) if record is not None else None
+            if request is not None:
+                requests.append(request)
+            parsed.append((offset, record, request))
+        except Exception as e:
+            parsed.append((offset, e, None))
+        offset += len(line)
+    responses = iter(score_message_batch(requests))
+
+    for line_offset, record, request in parsed:
+        if record is None:
+            continue
+        try:
+            if isinstance(record, Exception):
+                raise record
+            response = next(responses) if request is not None else None
+            if isinstance(response, Exception):
+                raise response
+            result = {"offset": line_offset, **score_record(record, response)}
+        except ValidationError as e:
+            result = {"offset": line_offset, "error": f"Geçersiz kayıt: {e.errors()[0]['msg']}"}
+            errors += 1
+        except Exception as e:
+            result = {"offset": line_offset, "error": str(e)}
+            errors += 1
+        records += 1
+        output.append(json.dumps(result, ensure_ascii=False))
+
+    data = ("\n".join(output) + "\n").encode("utf-8") if output else b""
+    return data, records, errors
+
+
+def read_chunks(handle, offset: int, chunk_lines: int):
+    """Girdiyi (başlangıç offset'i, satırlar) chunk'ları halinde oku"""
+    while True:
+        lines = []
+        for _ in range(chunk_lines):
+            line = handle.readline()
+            if not line:
+                break
+            lines.append(line)
+        if not lines:
+            return
+        yield offset, lines
+        offset += sum(len(line) for line in lines)
+
+
+def load_checkpoint(path: str) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, state: Dict) -> None:
+    """Checkpoint'i atomik olarak yaz (yarım dosya kalmaz)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def run(args) -> Dict:
+    fmt = args.format or detect_format(args.input)
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+
+    start_offset = args.start_offset
+    output_offset = None
+    if args.resume and os.path.exists(checkpoint_path):
+        state = load_checkpoint(checkpoint_path)
+        start_offset = state["input_offset"]
+        output_offset = state["output_offset"]
+    elif start_offset and os.path.exists(args.output):
+        # Elle verilen offset: mevcut çıktının sonuna ekle
+        output_offset = os.path.getsize(args.output)
+
+    with open(args.input, "rb") as infile:
+        fieldnames = None
+        if fmt == "csv":
+            header = infile.readline()
+            fieldnames = next(csv.reader([header.decode("utf-8-sig").strip()]))
+            start_offset = max(start_offset, len(header))
+
+        # Satır ortasındaki bir offset verildiyse bir sonraki satırdan başla
+        if start_offset > 0:
+            infile.seek(start_offset - 1)
+            if infile.read(1) != b"\n":
+                start_offset += len(infile.readline())
+        infile.seek(start_offset)
+
+        with open(args.output, "wb" if output_offset is None else "r+b") as outfile:
+            # Son checkpoint'ten sonra yazılmış yarım çıktıyı at
+            outfile.seek(output_offset or 0)
+            outfile.truncate()
+
+            stats = {"records": 0, "errors": 0}
+            started = last_report = time.perf_counter()
+
+            def write_result(chunk_end: int, result: Tuple[bytes, int, int]) -> None:
+                nonlocal last_report
+                data, records, errors = result
+                outfile.write(data)
+                outfile.flush()
+                stats["records"] += records
+                stats["errors"] += errors
+                save_checkpoint(checkpoint_path, {
+                    "input": args.input,
+                    "input_offset": chunk_end,
+                    "output_offset": outfile.tell(),
+                    "records": stats["records"],
+                })
+                now = time.perf_counter()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    rate = stats["records"] / (now - started)
+                    print(f"  {stats['records']:,} kayıt | {rate:,.0f} msg/s | offset {chunk_end:,}", file=sys.stderr)
+
+            chunks = read_chunks(infile, start_offset, args.chunk_lines)
+            if args.workers <= 1:
+                for offset, lines in chunks:
+                    result = process_chunk((fmt, fieldnames, offset, lines))
+                    write_result(offset + sum(len(line) for line in lines), result)
+            else:
+                # Sıralı çıktı + sınırlı sayıda bekleyen chunk (bellek sabit kalır)
+                with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                    pending = deque()
+                    for offset, lines in chunks:
+                        chunk_end = offset + sum(len(line) for line in lines)
+                        pending.append((chunk_end, pool.submit(process_chunk, (fmt, fieldnames, offset, lines))))
+                        if len(pending) >= args.workers * 2:
+                            chunk_end, future = pending.popleft()
+                            write_result(chunk_end, future.result())
+                    while pending:
+                        chunk_end, future = pending.popleft()
+                        write_result(chunk_end, future.result())
+
+            elapsed = time.perf_counter() - started
+            stats["elapsed"] = elapsed
+            stats["rate"] = stats["records"] / elapsed if elapsed > 0 else 0.0
+            return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Patterna Shield toplu skorlama")
+    parser.add_argument("input", help="Girdi dosyası (.jsonl veya .csv)")
+    parser.add_argument("-o", "--output", required=True, help="Çıktı JSONL dosyası")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Girdi formatı (varsayılan: uzantıdan)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker process sayısı")
+    parser.add_argument("--chunk-lines", type=int, default=DEFAULT_CHUNK_LINES, help="Chunk başına satır")
+    parser.add_argument("--start-offset", type=int, default=0, help="Girdide başlanacak byte offset'i")
+    parser.add_argument("--resume", action="store_true", help="Checkpoint'ten devam et")
+    parser.add_argument("--checkpoint", help="Checkpoint dosyası (varsayılan: <output>.checkpoint)")
+    args = parser.parse_args()
+
+    print(f"🛡️ Toplu skorlama: {args.input} -> {args.output} ({args.workers} worker)", file=sys.stderr)
+    stats = run(args)
+    print(
+        f"✅ {stats['records']:,} kayıt, {stats['errors']:,} hata, "
+        f"{stats['elapsed']:.1f}s, {stats['rate']:,.0f} msg/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Patterna Shield Mini - Kampanya (Yakın Kopya) İndeksi
+=====================================================
+
+Kampanya mesajları birbirinden biraz farklıdır: isim, tutar veya link
+değişir. Karar önbelleği birebir aynı metni yakalar; varyantlar ayrı ayrı
+skorlanır ve tek başına eşiğin altında kalabilir. Bu indeks yakın
+kopyaları aynı kampanyada toplar. Bilinen bir dolandırıcılık kampanyasının
+varyantı, kampanyanın kararını devralır.
+
+İmza (MinHash): Metin katlanmış biçimde (text_normalizer) işlenir. Linkler
+tek bir "url" kelimesine, rakam dizileri "0"a çevrilir. Kelimeler ve
+ardışık kelime çiftleri küme elemanıdır. İmza tek permütasyonlu MinHash'tir
+(one permutation hashing). Her eleman bir kez hash'lenir ve SIGNATURE_SIZE
+kutudan birine düşer; kutu o kutudaki en küçük değeri tutar. Boş kalan
+kutular sabit bir sırayla dolu bir kutudan doldurulur (densification).
+Maliyet eleman sayısıyla doğrusaldır, permütasyon sayısıyla çarpılmaz.
+
+LSH: İmza BANDS banda bölünür. Herhangi bir bandı aynı olan kampanyalar
+adaydır. Adaylar, eşit kutu oranıyla (Jaccard tahmini) karşılaştırılır.
+Eşik (varsayılan 0.6) geçilirse mesaj o kampanyaya eklenir, geçilmezse
+mesaj yeni bir kampanyanın tohumu olur. Karşılaştırma her zaman tohum
+imzasıyladır; kampanya varyantlar üzerinden zincirlenip kaymaz.
+
+Sınırlar: En fazla `capacity` kampanya tutulur ve son görülmeye göre LRU
+sırasıyla düşürülür. `ttl_seconds` boyunca yeni mesaj almayan kampanyalar
+silinir. Karar devralmaları kampanya istatistiklerine yazılmaz: kampanya
+sadece mesajların kendi kararlarıyla dolandırıcılık olarak işaretlenir.
+
+Son RECENT_SIGNATURES mesajın imzası, mesajın 16 baytlık özetiyle saklanır
+(bellek mesaj uzunluğundan bağımsızdır); birebir tekrarlar (karar
+önbelleğinden dönenler) yeniden imzalanmaz, sadece bantlarda aranır.
+
+Hash'ler Python'un süreç içi `hash()`'idir. İndeks worker başınadır.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from operator import eq
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from text_normalizer import normalize
+
+SIGNATURE_SIZE = 32
+BANDS = 8
+ROWS = SIGNATURE_SIZE // BANDS
+
+DEFAULT_CAPACITY = 20_000
+DEFAULT_TTL_SECONDS = 6 * 3600.0
+DEFAULT_SIMILARITY = 0.6
+# Daha az kelimeli mesajlar kampanya eşleştirmesine girmez (çok genel)
+MIN_WORDS = 4
+# Kampanya başına saklanan örnek mesaj sayısı / uzunluğu (analist incelemesi için)
+SAMPLES = 3
+SAMPLE_CHARS = 160
+# Aynı banda düşen en fazla kampanya (yaygın kalıplarda liste sınırsız büyümesin)
+BUCKET_LIMIT = 8
+# İmzası saklanan son mesaj sayısı (birebir tekrarlar yeniden hash'lenmez)
+RECENT_SIGNATURES = 4096
+EXPIRE_INTERVAL = 1.0
+
+# Tek geçişte link / sayı / kelime ayrımı (link ve sayılar aşağıda tek kelimeye indirgenir)
+_TOKEN_RE = re.compile(r"(?:https?://|www\.)\S+|\d+|\w+")
+
+_BIN_MASK = SIGNATURE_SIZE - 1
+_BIN_BITS = SIGNATURE_SIZE.bit_length() - 1
+_VALUE_MASK = (1 << 62) - 1
+_EMPTY = 1 << 62
+
+
+def _build_probes() -> Tuple[Tuple[int, ...], ...]:
+    # Boş kutu i, _PROBES[i] sırasındaki ilk dolu kutunun değerini alır. Sıra her
+    # kutu için farklı, tüm mesajlar (ve süreçler) için aynı sabit bir karıştırmadır
+    def mix(i: int, j: int) -> int:
+        return ((i * 0x9E3779B1 ^ j * 0x85EBCA77) * 0xC2B2AE3D) & 0xFFFFFFFF
+
+    return tuple(
+        tuple(sorted((j for j in range(SIGNATURE_SIZE) if j != i), key=lambda j: mix(i, j)))
+        for i in range(SIGNATURE_SIZE)
+    )
+
+
+_PROBES = _build_probes()
+
+
+def message_words(folded: str) -> List[str]:
+    """Katlanmış metnin kelimeleri; linkler "url", sayılar "0" olur"""
+    return [
+        "0" if token[0].isdigit() else "url" if "/" in token or "." in token else token
+        for token in _TOKEN_RE.findall(folded)
+    ]
+
+
+def signature(words: List[str]) -> List[int]:
+    """Kelimeler + ardışık kelime çiftleri kümesinin tek permütasyonlu MinHash imzası"""
+    bins = [_EMPTY] * SIGNATURE_SIZE
+    for h in [*map(hash, words), *map(hash, zip(words, words[1:]))]:
+        i = h & _BIN_MASK
+        value = (h >> _BIN_BITS) & _VALUE_MASK
+        if value < bins[i]:
+            bins[i] = value
+    if _EMPTY in bins:
+        filled = [value != _EMPTY for value in bins]
+        for i in range(SIGNATURE_SIZE):
+            if not filled[i]:
+                for j in _PROBES[i]:
+                    if filled[j]:
+                        bins[i] = bins[j]
+                        break
+    return bins
+
+
+def band_keys(sig: List[int]) -> Tuple[int, ...]:
+    """İmzanın LSH bant anahtarları (bant i'nin anahtarı bant i'nin sözlüğünde aranır)"""
+    return tuple(hash(tuple(sig[start:start + ROWS])) for start in range(0, SIGNATURE_SIZE, ROWS))
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """İki imzanın eşit kutu oranı (Jaccard benzerliği tahmini)"""
+    return sum(map(eq, a, b)) / SIGNATURE_SIZE
+
+
+class Campaign:
+    """Yakın kopya mesajlardan oluşan kampanya"""
+
+    __slots__ = ("id", "signature", "bands", "first_seen", "last_seen", "count",
+                 "fraud_count", "fraud_score", "max_score", "samples")
+
+    def __init__(self, campaign_id: int, sig: array, bands: Tuple[int, ...], now: float):
+        self.id = campaign_id
+        self.signature = sig          # tohum mesajın imzası
+        self.bands = bands
+        self.first_seen = now
+        self.last_seen = now
+        self.count = 0
+        self.fraud_count = 0
+        self.fraud_score = 0          # dolandırıcılık kararlarının en düşük puanı (devralınan puan)
+        self.max_score = 0
+        self.samples: List[str] = []
+
+    def add(self, message: str, score: int, is_fraud: bool, now: float) -> None:
+        self.count += 1
+        self.last_seen = now
+        if score > self.max_score:
+            self.max_score = score
+        if is_fraud:
+            self.fraud_count += 1
+            if not self.fraud_score or score < self.fraud_score:
+                self.fraud_score = score
+        if len(self.samples) < SAMPLES:
+            sample = message[:SAMPLE_CHARS]
+            if sample not in self.samples:
+                self.samples.append(sample)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "count": self.count,
+            "fraud_count": self.fraud_count,
+            "fraud_ratio": round(self.fraud_count / self.count, 3) if self.count else 0.0,
+            "fraud_score": self.fraud_score,
+            "max_score": self.max_score,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "samples": list(self.samples),
+        }
+
+
+class CampaignMatch(NamedTuple):
+    """Mesajın katıldığı mevcut kampanya (sayılar bu mesaj eklenmeden önceki haliyle)"""
+    id: int
+    similarity: float
+    count: int
+    fraud_count: int
+    fraud_score: int
+
+
+class CampaignIndex:
+    """Son skorlanan mesajlar üzerinde MinHash LSH kampanya indeksi (sınırlı boyut ve yaş)"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 threshold: float = DEFAULT_SIMILARITY, clock: Callable[[], float] = time.time):
+        if capacity < 1 or ttl_seconds <= 0 or not 0 < threshold <= 1:
+            raise ValueError("capacity pozitif, ttl_seconds sıfırdan büyük, threshold (0, 1] aralığında olmalı")
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._clock = clock
+        # kampanya id -> kampanya (en uzun süredir mesaj almayan başta)
+        self._campaigns: "OrderedDict[int, Campaign]" = OrderedDict()
+        # Bant başına: bant anahtarı -> o bandı paylaşan kampanya id'leri (en fazla BUCKET_LIMIT)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        # mesaj özeti -> (imza, bant anahtarları); kısa mesajlar için None
+        self._recent: Dict[bytes, Optional[Tuple[List[int], Tuple[int, ...]]]] = {}
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._expire_at = 0.0
+        self.observed = 0
+        self.matched = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._campaigns)
+
+    def observe(self, message: str, score: int, is_fraud: bool,
+                now: Optional[float] = None) -> Optional[CampaignMatch]:
+        """Mesajı kendi kararıyla indekse ekle -> katıldığı mevcut kampanya (yoksa None)
+
+        Benzer kampanya yoksa ve mesaj risk taşıyorsa (score > 0) yeni bir
+        kampanyanın tohumu olur. Çok kısa mesajlar indekse girmez.
+        """
+        digest = hashlib.blake2b(message.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        hashed = self._recent.get(digest, False)
+        if hashed is False:
+            hashed = self._hash(message)
+            with self._lock:
+                if len(self._recent) >= RECENT_SIGNATURES:
+                    del self._recent[next(iter(self._recent))]
+                self._recent[digest] = hashed
+        if hashed is None:
+            return None
+        sig, bands = hashed
+        now = self._clock() if now is None else now
+        with self._lock:
+            self.observed += 1
+            if now >= self._expire_at:
+                self._expire(now)
+            best, best_similarity = None, self.threshold
+            candidates = {
+                campaign_id
+                for buckets, key in zip(self._buckets, bands)
+                for campaign_id in buckets.get(key, ())
+            }
+            for campaign_id in candidates:
+                campaign = self._campaigns[campaign_id]
+                candidate_similarity = similarity(sig, campaign.signature)
+                if candidate_similarity >= best_similarity:
+                    best, best_similarity = campaign, candidate_similarity
+            if best is not None:
+                match = CampaignMatch(best.id, best_similarity, best.count, best.fraud_count, best.fraud_score)
+                best.add(message, score, is_fraud, now)
+                self._campaigns.move_to_end(best.id)
+                self.matched += 1
+                return match
+            if score > 0:
+                self._create(message, sig, bands, score, is_fraud, now)
+            return None
+
+    @staticmethod
+    def _hash(message: str) -> Optional[Tuple[List[int], Tuple[int, ...]]]:
+        words = message_words(normalize(message)[1])
+        if len(words) < MIN_WORDS:
+            return None
+        sig = signature(words)
+        return sig, band_keys(sig)
+
+    def _create(self, message: str, sig: List[int], bands: Tuple[int, ...], score: int,
+                is_fraud: bool, now: float) -> None:
+        if len(self._campaigns) >= self.capacity:
+            self._evict(next(iter(self._campaigns.values())))
+        campaign = Campaign(self._next_id, array("q", sig), bands, now)
+        self._next_id += 1
+        campaign.add(message, score, is_fraud, now)
+        self._campaigns[campaign.id] = campaign
+        for buckets, key in zip(self._buckets, bands):
+            bucket = buckets.setdefault(key, [])
+            if len(bucket) >= BUCKET_LIMIT:
+                bucket.pop(0)
+            bucket.append(campaign.id)
+
+    def _expire(self, now: float) -> None:
+        """Süresi dolan kampanyaları baştan düşür (sıra son görülmeye göre)"""
+        # Mesaj başına değil, en fazla EXPIRE_INTERVAL'da bir taranır
+        self._expire_at = now + EXPIRE_INTERVAL
+        deadline = now - self.ttl_seconds
+        campaigns = self._campaigns
+        while campaigns:
+            oldest = next(iter(campaigns.values()))
+            if oldest.last_seen > deadline:
+                break
+            self._evict(oldest)
+
+    def _evict(self, campaign: Campaign) -> None:
+        del self._campaigns[campaign.id]
+        for buckets, key in zip(self._buckets, campaign.bands):
+            bucket = buckets.get(key)
+            if bucket is not None and campaign.id in bucket:
+                bucket.remove(campaign.id)
+                if not bucket:
+                    del buckets[key]
+        self.evictions += 1
+
+    def campaigns(self, limit: int = 50, fraud_only: bool = False, min_count: int = 1,
+                  now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Analist incelemesi için kampanyalar, mesaj sayısına göre azalan"""
+        now = self._clock() if now is None else now
+        with self._lock:
+            self._expire(now)
+            selected = [
+                c for c in self._campaigns.values()
+                if c.count >= min_count and (c.fraud_count or not fraud_only)
+            ]
+            selected.sort(key=lambda c: (c.count, c.last_seen), reverse=True)
+            return [c.to_dict() for c in selected[:limit]]
+
+    def get(self, campaign_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            campaign = self._campaigns.get(campaign_id)
+            return campaign.to_dict() if campaign is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            fraud = sum(1 for c in self._campaigns.values() if c.fraud_count)
+            return {
+                "campaigns": len(self._campaigns),
+                "fraud_campaigns": fraud,
+                "capacity": self.capacity,
+                "ttl_seconds": self.ttl_seconds,
+                "threshold": self.threshold,
+                "observed": self.observed,
+                "matched": self.matched,
+                "evictions": self.evictions,
+            }
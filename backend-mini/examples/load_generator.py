@@ -0,0 +1,434 @@
+"""
+Patterna Shield Mini - Yük Üreticisi
+====================================
+
+`/analyze/message`, `/analyze/phone` ve `/analyze/url`'e eşzamanlı yük
+uygular ve kapasiteyi ölçer: throughput, gecikme yüzdelikleri, hata oranı ve
+gecikmenin keskin biçimde arttığı doyma noktası.
+
+- Hedef: çalışan bir sunucu (`--url`, keep-alive bağlantı havuzu) veya
+  süreç içindeki uygulama (`--in-process`, ağ ve sunucu olmadan ASGI).
+- İstek karışımı: `--mix message=0.8,phone=0.1,url=0.1`; içerik
+  `sample_data.json`'dan (`--corpus sample`) veya sentetik trafikten
+  (`--corpus synthetic`, benchmarks/traffic.py).
+- Açık döngü (`--rate`): istekler sunucunun hızından bağımsız, sabit
+  aralıklarla (veya `--poisson` ile rastgele) gönderilir. Gecikme isteğin
+  planlanan gönderim anından ölçülür; sunucu yavaşladığında bağlantı
+  beklemesi de gecikmeye dahildir (koordineli ihmal olmaz).
+- Kapalı döngü (`--rate` yok): `--concurrency` kadar istemci yanıt alır almaz
+  yeni istek gönderir; ulaşılabilen en yüksek throughput'u ölçer.
+- Tarama (`--rates 250 500 1000 ...`): her hızda ayrı ölçüm; p99 gecikmesi
+  ilk adımın `--saturation-factor` katını aştığında, gerçekleşen hız
+  istenenin %90'ının altına düştüğünde veya hata oranı %1'i geçtiğinde
+  doyma noktası raporlanır.
+
+Örnek mesajların beklenen kararları da kontrol edilir (etiketle uyuşmayan
+karar sayısı), bu yüzden `--corpus sample` hızlı bir duman testi olarak da
+kullanılabilir.
+
+Kullanım:
+    python main.py   # veya: python server.py --workers 4
+    python examples/load_generator.py --corpus sample --concurrency 4 --duration 2
+    python examples/load_generator.py --rate 500 --duration 10
+    python examples/load_generator.py --rates 250 500 1000 2000 4000 --duration 5
+    python examples/load_generator.py --in-process --concurrency 32 --duration 5 --json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR / "benchmarks"))
+
+from traffic import generate_messages, generate_phones, generate_urls, load_sample_data  # noqa: E402
+
+ENDPOINTS = {"message": "/analyze/message", "phone": "/analyze/phone", "url": "/analyze/url"}
+DEFAULT_MIX = "message=0.8,phone=0.1,url=0.1"
+PERCENTILES = (50, 90, 99, 99.9)
+
+# (tür, istek gövdesi, beklenen is_fraud veya None)
+Item = Tuple[str, bytes, Optional[bool]]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """"message=0.8,phone=0.2" -> normalize edilmiş oranlar"""
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in ENDPOINTS:
+            raise ValueError(f"Bilinmeyen istek türü: {kind} ({', '.join(ENDPOINTS)})")
+        mix[kind] = float(weight or 1)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Karışım oranlarının toplamı pozitif olmalı")
+    return {kind: weight / total for kind, weight in mix.items() if weight > 0}
+
+
+def _body(data: Dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def build_items(corpus: str, mix: Dict[str, float], count: int, seed: int) -> List[Item]:
+    """Karışıma göre karıştırılmış istek listesi (ölçüm boyunca döngüyle kullanılır)"""
+    if corpus == "sample":
+        sample = load_sample_data()
+        pools = {
+            "message": [(_body({"message": m["message"], "sender_phone": m.get("sender_phone")}), m["is_fraud"])
+                        for m in sample["messages"]],
+            "phone": [(_body({"phone_number": p}), None) for p in sample["phones"]],
+            "url": [(_body({"url": u}), None) for u in sample["urls"]],
+        }
+    else:
+        pools = {
+            "message": [(_body({"message": m["message"], "sender_phone": m["sender_phone"]}), m["is_fraud"])
+                        for m in generate_messages(count, seed=seed)],
+            "phone": [(_body({"phone_number": p}), None) for p in generate_phones(count, seed=seed)],
+            "url": [(_body({"url": u}), None) for u in generate_urls(count, seed=seed)],
+        }
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    items = []
+    for kind in rng.choices(kinds, weights, k=count):
+        body, expected = rng.choice(pools[kind])
+        items.append((kind, body, expected))
+    return items
+
+
+class RequestError(Exception):
+    """Bağlantı / protokol hatası (hata sayacındaki etiketiyle)"""
+
+
+class HTTPPool:
+    """Sabit boyutlu keep-alive HTTP/1.1 bağlantı havuzu (ek bağımlılık yok)"""
+
+    def __init__(self, url: str, size: int):
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError("Sadece http:// hedefler desteklenir")
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.base = parts.path.rstrip("/")
+        self.size = size
+        self._idle: "asyncio.Queue[Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]]" = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(None)   # None = henüz açılmamış bağlantı
+        self.connects = 0
+
+    async def check(self) -> None:
+        """Sunucuya bağlanılabiliyor mu? (OSError fırlatır)"""
+        _, writer = await asyncio.open_connection(self.host, self.port)
+        writer.close()
+
+    async def post(self, path: str, body: bytes) -> Tuple[int, bytes]:
+        connection = await self._idle.get()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(self.host, self.port)
+                self.connects += 1
+            reader, writer = connection
+            writer.write((f"POST {self.base}{path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode()
+                         + body)
+            status, payload, keep_alive = await self._read_response(reader)
+            if not keep_alive:
+                writer.close()
+                connection = None
+            return status, payload
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            raise RequestError("connection") from e
+        except BaseException:
+            # İptal edilen (zaman aşımı) istekte bağlantının durumu belirsizdir
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            raise
+        finally:
+            self._idle.put_nowait(connection)
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.split(b"\r\n")
+        status = int(lines[0][9:12])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip().lower()
+        if headers.get(b"transfer-encoding") == b"chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if not size:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        else:
+            payload = await reader.readexactly(int(headers.get(b"content-length", b"0")))
+        return status, payload, headers.get(b"connection") != b"close"
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            if connection is not None:
+                connection[1].close()
+
+
+class InProcessTarget:
+    """Uygulamayı süreç içinden çağırır; eşzamanlılık semaforla sınırlanır"""
+
+    def __init__(self, client, size: int):
+        self.client = client
+        self.size = size
+        self._slots = asyncio.Semaphore(size)
+
+    async def post(self, path: str, body: bytes) -> Tuple[int, bytes]:
+        async with self._slots:
+            response = await self.client.request("POST", path, body=body,
+                                                 headers={"content-type": "application/json"})
+            return response.status_code, response.body
+
+    async def close(self) -> None:
+        pass
+
+
+class PhaseStats:
+    """Bir ölçüm adımının sonuçları"""
+
+    def __init__(self, offered_rate: Optional[float]):
+        self.offered_rate = offered_rate
+        self.latencies: Dict[str, List[int]] = {kind: [] for kind in ENDPOINTS}
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.mismatches = 0
+        self.elapsed = 0.0
+
+    def record(self, kind: str, expected: Optional[bool], latency_ns: int,
+               status: Optional[int], payload: bytes = b"", error: Optional[str] = None) -> None:
+        if error is not None:
+            self.errors[error] += 1
+            return
+        self.latencies[kind].append(latency_ns)
+        self.statuses[status] += 1
+        if status != 200:
+            self.errors[f"http_{status}"] += 1
+        elif expected is not None and json.loads(payload).get("is_fraud") != expected:
+            self.mismatches += 1
+
+    def summary(self) -> Dict[str, Any]:
+        completed = [value for values in self.latencies.values() for value in values]
+        completed.sort()
+        attempted = len(completed) + sum(self.errors[e] for e in ("timeout", "connection"))
+        failed = sum(self.errors.values())
+        result = {
+            "offered_rps": self.offered_rate,
+            "requests": attempted,
+            "rps": round(len(completed) / self.elapsed, 1) if self.elapsed else 0.0,
+            "ok_rps": round(self.statuses[200] / self.elapsed, 1) if self.elapsed else 0.0,
+            "error_rate": round(failed / attempted, 4) if attempted else 0.0,
+            "errors": dict(self.errors),
+            "label_mismatches": self.mismatches,
+            "latency_ms": _percentiles(completed),
+            "endpoints": {
+                kind: {"requests": len(values), "latency_ms": _percentiles(sorted(values))}
+                for kind, values in self.latencies.items() if values
+            },
+        }
+        return result
+
+
+def _percentiles(sorted_ns: List[int]) -> Dict[str, float]:
+    if not sorted_ns:
+        return {}
+    result = {f"p{p:g}": round(sorted_ns[min(len(sorted_ns) - 1, int(len(sorted_ns) * p / 100))] / 1e6, 2)
+              for p in PERCENTILES}
+    result["max"] = round(sorted_ns[-1] / 1e6, 2)
+    return result
+
+
+async def _send(target, item: Item, start_ns: int, timeout: float, stats: PhaseStats) -> None:
+    kind, body, expected = item
+    try:
+        status, payload = await asyncio.wait_for(target.post(ENDPOINTS[kind], body), timeout)
+    except asyncio.TimeoutError:
+        stats.record(kind, expected, 0, None, error="timeout")
+    except RequestError as e:
+        stats.record(kind, expected, 0, None, error=str(e))
+    else:
+        stats.record(kind, expected, time.perf_counter_ns() - start_ns, status, payload)
+
+
+async def run_closed(target, items: List[Item], duration: float, timeout: float) -> PhaseStats:
+    """Kapalı döngü: her istemci yanıtı alınca hemen yeni istek gönderir"""
+    stats = PhaseStats(None)
+    deadline = time.perf_counter() + duration
+    counter = iter(range(sys.maxsize))
+
+    async def client():
+        while time.perf_counter() < deadline:
+            await _send(target, items[next(counter) % len(items)], time.perf_counter_ns(), timeout, stats)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(target.size)))
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+async def run_open(target, items: List[Item], rate: float, duration: float, timeout: float,
+                   poisson: bool = False, seed: int = 0) -> PhaseStats:
+    """Açık döngü: istekler planlanan anlarda gönderilir, gecikme plandan ölçülür"""
+    stats = PhaseStats(rate)
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    tasks = set()
+    started_ns = time.perf_counter_ns()
+    offset = 0.0
+    index = 0
+    while offset < duration:
+        scheduled_ns = started_ns + int(offset * 1e9)
+        delay = (scheduled_ns - time.perf_counter_ns()) / 1e9
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = loop.create_task(_send(target, items[index % len(items)], scheduled_ns, timeout, stats))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        index += 1
+        offset += rng.expovariate(rate) if poisson else 1.0 / rate
+    if tasks:
+        await asyncio.gather(*tasks)
+    stats.elapsed = (time.perf_counter_ns() - started_ns) / 1e9
+    return stats
+
+
+def find_saturation(results: List[Dict[str, Any]], factor: float) -> Optional[Dict[str, Any]]:
+    """Gecikmenin keskin arttığı / hızın tutturulamadığı ilk adım"""
+    if not results or not results[0]["latency_ms"]:
+        return None
+    base_p99 = results[0]["latency_ms"]["p99"]
+    for result in results:
+        p99 = result["latency_ms"].get("p99", math.inf)
+        if (p99 > factor * max(base_p99, 0.1) or result["error_rate"] > 0.01
+                or result["rps"] < 0.9 * result["offered_rps"]):
+            return result
+    return None
+
+
+def print_row(label: str, result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(f"{label:>10} | {result['rps']:>9,.0f} | " + " | ".join(
+        f"{latency.get(f'p{p:g}', 0):>7.2f}" for p in PERCENTILES
+    ) + f" | {result['error_rate']:>6.2%} | {result['label_mismatches']:>5}")
+
+
+async def run(args) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    items = build_items(args.corpus, mix, args.count, args.seed)
+    client = None
+    if args.in_process:
+        sys.path.insert(0, str(APP_DIR))
+        from asgi_client import InProcessClient
+        import main
+        client = InProcessClient(main.app)
+        await client.startup()
+        target = InProcessTarget(client, args.concurrency)
+        where = "süreç içi (ASGI)"
+    else:
+        target = HTTPPool(args.url, args.concurrency)
+        await target.check()
+        where = args.url
+
+    rates = args.rates or ([args.rate] if args.rate else [None])
+    mix_text = ", ".join(f"{kind} %{share * 100:.0f}" for kind, share in mix.items())
+    print(f"Hedef: {where} | bağlantı: {args.concurrency} | karışım: {mix_text} | "
+          f"veri: {args.corpus} | adım: {args.duration:g}s")
+    print(f"{'istek/s':>10} | {'gerçek/s':>9} | " + " | ".join(f"{f'p{p:g} ms':>7}" for p in PERCENTILES)
+          + f" | {'hata':>6} | {'etiket':>5}")
+    print("-" * 82)
+    results = []
+    try:
+        if args.warmup > 0:
+            await run_closed(target, items, args.warmup, args.timeout)
+        for rate in rates:
+            if rate is None:
+                stats = await run_closed(target, items, args.duration, args.timeout)
+            else:
+                stats = await run_open(target, items, rate, args.duration, args.timeout, args.poisson, args.seed)
+            result = stats.summary()
+            results.append(result)
+            print_row("kapalı" if rate is None else f"{rate:,.0f}", result)
+    finally:
+        await target.close()
+        if client is not None:
+            await client.shutdown()
+
+    report: Dict[str, Any] = {"target": where, "concurrency": args.concurrency, "mix": mix, "steps": results}
+    if args.rates:
+        saturation = find_saturation(results, args.saturation_factor)
+        report["saturation_rps"] = saturation["offered_rps"] if saturation else None
+        if saturation:
+            print(f"\nDoyma noktası: ~{saturation['offered_rps']:,.0f} istek/s "
+                  f"(p99 {results[0]['latency_ms']['p99']:.2f} -> {saturation['latency_ms'].get('p99', 0):.2f} ms, "
+                  f"gerçekleşen {saturation['rps']:,.0f}/s, hata {saturation['error_rate']:.2%})")
+        else:
+            print("\nÖlçülen aralıkta doyma görülmedi; daha yüksek hızlar deneyin.")
+    for kind, endpoint in results[-1]["endpoints"].items():
+        latency = endpoint["latency_ms"]
+        print(f"  {ENDPOINTS[kind]:<18} {endpoint['requests']:>8,} istek  p50 {latency['p50']:.2f} ms  "
+              f"p99 {latency['p99']:.2f} ms")
+    errors = results[-1]["errors"]
+    if errors:
+        print("  hatalar: " + ", ".join(f"{name}={count}" for name, count in sorted(errors.items())))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Patterna Shield Mini yük üreticisi")
+    parser.add_argument("--url", default=os.environ.get("PATTERNA_URL", "http://127.0.0.1:8000"),
+                        help="Sunucu adresi")
+    parser.add_argument("--in-process", action="store_true", help="Uygulamayı bu süreçte çalıştır (sunucusuz)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Bağlantı havuzu / eşzamanlı istek sayısı")
+    parser.add_argument("--rate", type=float, help="Açık döngü istek hızı (istek/s); yoksa kapalı döngü")
+    parser.add_argument("--rates", type=float, nargs="+", help="Doyma taraması için artan hızlar")
+    parser.add_argument("--poisson", action="store_true", help="Sabit aralık yerine Poisson varışlar")
+    parser.add_argument("--duration", type=float, default=10.0, help="Adım başına süre (sn)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Ölçülmeyen ısınma süresi (sn)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="İstek zaman aşımı (sn, bekleme dahil)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="İstek karışımı (tür=oran,...)")
+    parser.add_argument("--corpus", choices=("synthetic", "sample"), default="synthetic",
+                        help="İstek içeriği: sentetik trafik veya sample_data.json")
+    parser.add_argument("--count", type=int, default=5000, help="Üretilecek farklı istek sayısı")
+    parser.add_argument("--saturation-factor", type=float, default=3.0,
+                        help="Doyma: p99'un ilk adımın kaç katına çıktığı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak da yazdır")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency en az 1 olmalı")
+
+    try:
+        report = asyncio.run(run(args))
+    except (ConnectionError, OSError) as e:
+        print(f"❌ {args.url} adresine bağlanılamıyor ({e}). Önce 'python main.py' ile başlatın "
+              f"veya --in-process kullanın.")
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Patterna Shield Mini - JSON Yanıtları
+=====================================
+
+FastAPI endpoint'in döndürdüğü değeri her istekte yeniden işler:
+response_model'e göre tekrar doğrular, `jsonable_encoder` ile sözlüğe
+çevirir ve `json.dumps` ile serileştirir. Sık çağrılan yollarda bu iş
+atlanır:
+
+- StaticJSON   : içeriği süreç boyunca değişmeyen yanıtlar (/,
+                 /full-system-info) başlangıçta bir kez byte'a çevrilir.
+                 ETag + If-None-Match ile değişmemişse gövdesiz 304 döner.
+- json_response: /analyze/* yanıt modelleri doğrudan byte'a çevrilir
+                 (yeniden doğrulama yok). orjson kuruluysa o kullanılır,
+                 değilse Pydantic'in serileştiricisi; çıktı ikisinde de
+                 FastAPI'ninkiyle byte byte aynıdır.
+
+Serileştirici PATTERNA_JSON ile seçilir: auto (varsayılan), orjson, pydantic.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # opsiyonel bağımlılık
+    orjson = None
+
+JSON_BACKEND = os.environ.get("PATTERNA_JSON", "auto")
+if JSON_BACKEND not in ("auto", "orjson", "pydantic"):
+    raise ValueError(f"Geçersiz PATTERNA_JSON: {JSON_BACKEND} (auto, orjson, pydantic)")
+if JSON_BACKEND == "orjson" and orjson is None:
+    raise ImportError("PATTERNA_JSON=orjson için 'pip install orjson' gerekli")
+USE_ORJSON = orjson is not None and JSON_BACKEND != "pydantic"
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _model_fields(obj: Any) -> dict:
+    # İç içe modeller (BatchItemResult.result vb.) alan sözlüğüyle serileşir.
+    # Alias / computed field kullanan modeller için uygun değildir.
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Sözlük / liste -> JSON byte'ları (FastAPI JSONResponse ile aynı biçim)"""
+    if USE_ORJSON:
+        return orjson.dumps(content, default=_model_fields)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_model(model: BaseModel) -> bytes:
+    """Pydantic modeli -> JSON byte'ları (doğrulama tekrarlanmaz)"""
+    if USE_ORJSON:
+        return orjson.dumps(model.__dict__, default=_model_fields)
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """Modeli / sözlüğü FastAPI'nin serileştirme yolunu atlayarak döndür"""
+    body = dumps_model(content) if isinstance(content, BaseModel) else dumps(content)
+    return Response(body, status_code=status_code, media_type=JSON_MEDIA_TYPE)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığı ETag'i kapsıyor mu (zayıf karşılaştırma, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class StaticJSON:
+    """Bir kez serileştirilmiş, ETag'li JSON yanıtı"""
+
+    __slots__ = ("body", "etag", "_headers")
+
+    def __init__(self, content: Any):
+        self.body = dumps(content)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:16] + '"'
+        # no-cache: istemci saklayabilir ama her seferinde ETag ile doğrular
+        self._headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+
+    def response(self, if_none_match: Optional[str] = None) -> Response:
+        if etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=self._headers)
+        return Response(self.body, media_type=JSON_MEDIA_TYPE, headers=self._headers)
@@ -0,0 +1,248 @@
+"""
+Patterna Shield Mini - Çoklu Keyword Eşleştirici
+================================================
+
+Aho-Corasick otomatı ile tüm keyword listelerini (fraud, aciliyet, para)
+tek seferde derler ve mesajı tek geçişte tarar.
+
+Her keyword için ayrı `kw in text` taraması yapmak yerine metin bir kez
+dolaşılır; maliyet keyword sayısından bağımsız olarak metin uzunluğuyla
+orantılıdır. Binlerce kural eklendiğinde bile tarama süresi sabit kalır.
+
+Keyword'ler verilen `variants` fonksiyonuyla (kural setinde katlanmış
+biçim + ASCII yazımı, bkz. text_normalizer.py) mesajla aynı biçime
+çevrilir; yazımlarından biri aynı olan keyword'ler bir kez sayılır,
+sonuçta kural dosyasındaki yazımları döner.
+
+Keyword alfabesi (birkaç ASCII dışı harf, ör. "ı", hariç) ASCII ise
+geçiş tablosu düz bir diziye (durum x karakter sınıfı) gömülür: metin
+C'de byte'a ve karakter sınıflarına çevrilir, tarama döngüsü karakter
+başına tek dizi erişimi yapar (sözlük aramasına göre ~%25 hızlı).
+Otomatın en büyük parçası olan bu tablo worker'lar arasında paylaşılan
+bellekte tutulabilir (`shared_state` / `from_shared_state`).
+"""
+
+from array import array
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Tabloda ASCII dışı keyword harflerine ayrılan kontrol karakterleri
+# (SMS metninde geçmez; geçerse o harf gibi taranır)
+_EXTRA_BYTES = "\x01\x02\x03\x04\x05\x06\x07\x08"
+
+
+class KeywordMatcher:
+    """Kategori bazlı Aho-Corasick keyword otomatı"""
+
+    def __init__(self, categories: Dict[str, Iterable[str]],
+                 variants: Optional[Callable[[str], Iterable[str]]] = None):
+        # Kategori -> keyword listesi (orijinal sıra korunur; yazımlarından
+        # biri önceki bir keyword'le aynı olan tekrarlar atılır)
+        self.categories: Dict[str, List[str]] = {}
+        forms: Dict[str, List[Tuple[str, ...]]] = {}
+        for name, words in categories.items():
+            seen: Set[str] = set()
+            kept: List[str] = []
+            kept_forms: List[Tuple[str, ...]] = []
+            for word in words:
+                spellings = tuple(f for f in (variants(word) if variants and word else (word,)) if f)
+                if not spellings or seen.intersection(spellings):
+                    continue
+                seen.update(spellings)
+                kept.append(word)
+                kept_forms.append(spellings)
+            self.categories[name] = kept
+            forms[name] = kept_forms
+
+        # Keyword id -> (kategori, kural dosyasındaki yazımı). Id'ler kategori
+        # ve kategori içi sırayla verilir; sıralı id'ler sonucun sırasıdır.
+        # Otomatın çıktıları yazım değil keyword id'leridir: bir keyword'ün
+        # iki yazımı birden bulunsa da tek id döner
+        self._keywords: List[Tuple[str, str]] = []
+        # Yazım -> o yazımla bulunan keyword id'leri
+        self._patterns: Dict[str, Tuple[int, ...]] = {}
+        for name, spellings_list in forms.items():
+            for word, spellings in zip(self.categories[name], spellings_list):
+                kid = len(self._keywords)
+                self._keywords.append((name, word))
+                for spelling in spellings:
+                    self._patterns[spelling] = self._patterns.get(spelling, ()) + (kid,)
+
+        goto, output = self._build_trie(self._patterns)
+        self._root = goto[0]
+        self._delta: Optional[List[Dict[str, int]]] = None
+        self._table: Optional[array] = None
+        if not self._build_table(goto, output):
+            self._build(goto, output)
+
+    @staticmethod
+    def _build_trie(patterns: Dict[str, Tuple[int, ...]]) -> Tuple[List[Dict[str, int]], List[Tuple[int, ...]]]:
+        """Keyword trie'si: durum -> {karakter: sonraki durum}, durum -> keyword id'leri"""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Tuple[int, ...]] = [()]
+        for word, kids in patterns.items():
+            state = 0
+            for ch in word:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    output.append(())
+                state = nxt
+            output[state] = output[state] + kids
+        return goto, output
+
+    def _build(self, goto: List[Dict[str, int]], output: List[Tuple[int, ...]]) -> None:
+        """Failure link'leri sözlük tabanlı DFA'ya göm"""
+        # BFS ile failure link'leri; her durumun çıktısı failure zinciriyle birleşir.
+        # Failure'lar geçiş tablosuna gömülür (DFA), tarama sırasında failure
+        # zinciri yürünmez. Her durumda sadece kökten farklı olan geçişler
+        # saklanır; tablo binlerce keyword'de de küçük kalır.
+        root = goto[0]
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        queue = deque(root.values())
+        while queue:
+            state = queue.popleft()
+            f = fail[state]
+            transitions = dict(delta[f])
+            transitions.update(goto[state])
+            delta[state] = {ch: nxt for ch, nxt in transitions.items() if root.get(ch, 0) != nxt}
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fail[nxt] = delta[f].get(ch, root.get(ch, 0))
+                if output[fail[nxt]]:
+                    output[nxt] = output[nxt] + output[fail[nxt]]
+
+        self._delta = delta
+        self._output = [frozenset(o) if o else None for o in output]
+
+    def _build_table(self, goto: List[Dict[str, int]], output: List[Tuple[int, ...]]) -> bool:
+        """ASCII alfabede DFA'yı düz diziye göm (durum * sınıf sayısı + sınıf)"""
+        alphabet = sorted({ch for transitions in goto for ch in transitions})
+        # encode("ascii", "replace") ASCII dışı karakterleri "?" yapar; "?" keyword'de
+        # geçiyorsa ayırt edilemez, sözlük tabanlı taramaya düşülür. Az sayıdaki
+        # ASCII dışı keyword harfi taramadan önce kontrol karakterlerine çevrilir.
+        extra = [ch for ch in alphabet if not ch.isascii()]
+        if "?" in alphabet or len(extra) > len(_EXTRA_BYTES):
+            return False
+        self._extra = tuple(zip(extra, _EXTRA_BYTES))
+        byte_of = dict(self._extra)
+        classes = bytearray(256)  # 0 = keyword'lerde geçmeyen karakter
+        class_of: Dict[str, int] = {}
+        for cls, ch in enumerate(alphabet, 1):
+            classes[ord(byte_of.get(ch, ch))] = cls
+            class_of[ch] = cls
+        width = len(alphabet) + 1
+
+        # Hücre değeri: sonraki durum * width; çıktısı olan durumlar negatif
+        # saklanır (kök durumun çıktısı olmaz), döngüde tek karşılaştırma yeter.
+        # BFS sırasıyla her satır failure durumunun satırının kopyasıyla başlar
+        # (C'de), üstüne sadece trie geçişleri yazılır.
+        table = array("i", bytes(4 * len(goto) * width))
+        fail = [0] * len(goto)
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            base = state * width
+            f = fail[state]
+            if state:
+                table[base:base + width] = table[f * width:f * width + width]
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                cls = class_of[ch]
+                if state:
+                    fail[nxt] = abs(table[f * width + cls]) // width
+                    if output[fail[nxt]]:
+                        output[nxt] = output[nxt] + output[fail[nxt]]
+                table[base + cls] = -nxt * width if output[nxt] else nxt * width
+
+        self._classes = bytes(classes)
+        self._table = table
+        self._table_output = {state * width: frozenset(out) for state, out in enumerate(output) if out}
+        return True
+
+    def shared_state(self) -> Tuple[Dict[str, Any], Optional[array]]:
+        """(geçiş tablosu hariç durum, geçiş tablosu); durum JSON'a yazılabilir, tablo yoksa None"""
+        state: Dict[str, Any] = {
+            "categories": self.categories,
+            "keywords": self._keywords,
+            "patterns": self._patterns,
+            "root": self._root,
+        }
+        if self._table is None:
+            state["delta"] = self._delta
+            state["output"] = [sorted(out) if out else None for out in self._output]
+        else:
+            state["extra"] = self._extra
+            state["classes"] = self._classes.hex()
+            state["table_output"] = [[base, sorted(out)] for base, out in self._table_output.items()]
+        return state, self._table
+
+    @classmethod
+    def from_shared_state(cls, state: Dict[str, Any], table) -> "KeywordMatcher":
+        """shared_state'ten (JSON'dan okunmuş hâli dahil) otomat; tablo salt okunur
+        bir görünüm (memoryview) olabilir"""
+        matcher = cls.__new__(cls)
+        matcher.categories = {name: list(words) for name, words in state["categories"].items()}
+        matcher._keywords = [(name, word) for name, word in state["keywords"]]
+        matcher._patterns = {spelling: tuple(kids) for spelling, kids in state["patterns"].items()}
+        matcher._root = state["root"]
+        matcher._delta = state.get("delta")
+        matcher._table = table
+        if table is None:
+            matcher._output = [frozenset(out) if out else None for out in state["output"]]
+        else:
+            matcher._extra = tuple((ch, byte) for ch, byte in state["extra"])
+            matcher._classes = bytes.fromhex(state["classes"])
+            matcher._table_output = {base: frozenset(out) for base, out in state["table_output"]}
+        return matcher
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._patterns)
+
+    def scan(self, text: str) -> Set[int]:
+        """Metni tek geçişte tara, bulunan keyword id'lerini döndür"""
+        if self._table is not None:
+            return self._scan_table(text)
+        delta = self._delta
+        root_get = self._root.get
+        output = self._output
+
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            nxt = delta[state].get(ch)
+            state = root_get(ch, 0) if nxt is None else nxt
+            out = output[state]
+            if out is not None:
+                found |= out
+        return found
+
+    def _scan_table(self, text: str) -> Set[int]:
+        table = self._table
+        output = self._table_output
+        found: Set[int] = set()
+        state = 0
+        if not text.isascii():
+            for ch, byte in self._extra:
+                if ch in text:
+                    text = text.replace(ch, byte)
+        for cls in text.encode("ascii", "replace").translate(self._classes):
+            state = table[state + cls]
+            if state < 0:
+                state = -state
+                found |= output[state]
+        return found
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Kategori -> bulunan keyword'ler (kategori listesindeki sırayla)"""
+        hits: Dict[str, List[str]] = {name: [] for name in self.categories}
+        keywords = self._keywords
+        # Maliyet keyword sayısıyla değil, bulunan keyword sayısıyla orantılı
+        for kid in sorted(self.scan(text)):
+            name, word = keywords[kid]
+            hits[name].append(word)
+        return hits
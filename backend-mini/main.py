@@ -26,308 +26,574 @@ Bu mini versiyon sadece temel özellikleri içerir:
 Detaylar için: FULL_SYSTEM_OVERVIEW.py dosyasını inceleyin.
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import re
-import requests
-from typing import List, Dict, Any
-import sqlite3
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+import anyio
+from contextlib import asynccontextmanager
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+import hmac
+import json
+from typing import Any, List, Optional
 from datetime import datetime
 import os
 
+import scoring
+from admission import AdmissionMiddleware, controller_from_env
+from json_responses import StaticJSON, dumps_model, json_response
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY as METRICS_REGISTRY, MetricsMiddleware
+from phone_blacklist import get_phone_blacklist
+from shared_tables import get_shared_tables, memory_report
+from rules import RuleError
+from text_classifier import get_text_classifier
+from threat_feed import get_threat_feed
+# Modeller ve skorlama fonksiyonları scoring.py'dedir (FastAPI'siz kullanım için);
+# önbellek / yazıcı nesnelerine scoring.X üzerinden erişilir (testlerde değiştirilebilir)
+from scoring import (
+    AnalysisResponse, BatchAnalysisRequest, BatchAnalysisResponse, MessageAnalysisRequest,
+    PhoneCheckRequest, URLCheckRequest, RULE_STORE,
+    build_batch_response, score_message, score_message_batch, score_phone, score_url,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Kara liste ilk istekte değil başlangıçta, event loop dışında yüklenir
+    await anyio.to_thread.run_sync(get_phone_blacklist)
+    # Paylaşılan modda başka bir süreçte yayınlanan kara liste tablosu eşlenir
+    get_phone_blacklist().start_watcher(RULES_WATCH_INTERVAL)
+    RULE_STORE.start_watcher(RULES_WATCH_INTERVAL)
+    # Tehdit listesi indeksi mmap ile eşlenir (okuma yok); yeniden derlenince izleyici alır
+    get_threat_feed().start_watcher(RULES_WATCH_INTERVAL)
+    # Sınıflandırıcı modeli (varsa) NumPy ve hash tablolarıyla birlikte başlangıçta yüklenir
+    await anyio.to_thread.run_sync(get_text_classifier)
+    get_text_classifier().start_watcher(RULES_WATCH_INTERVAL)
+    if scoring.REPORT_WRITER is not None:
+        await anyio.to_thread.run_sync(scoring.REPORT_WRITER.start)
+    if ADMISSION is not None:
+        ADMISSION.start()
+    yield
+    if ADMISSION is not None:
+        ADMISSION.stop()
+        scoring.set_degraded(False)
+    RULE_STORE.stop_watcher()
+    get_phone_blacklist().stop_watcher()
+    get_threat_feed().stop_watcher()
+    get_text_classifier().stop_watcher()
+    if scoring.REPORT_WRITER is not None:
+        # Kuyrukta bekleyen kararlar kapanışta yazılır
+        await anyio.to_thread.run_sync(scoring.REPORT_WRITER.close)
+
 # FastAPI uygulaması
 app = FastAPI(
     title="Patterna Shield Mini",
     description="Basit Dolandırıcılık Tespit API - Başlangıç Sürümü",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Request/Response modelleri
-class MessageAnalysisRequest(BaseModel):
-    message: str
-    sender_phone: str = None
-
-class PhoneCheckRequest(BaseModel):
-    phone_number: str
-
-class URLCheckRequest(BaseModel):
-    url: str
-
-class AnalysisResponse(BaseModel):
-    is_fraud: bool
-    risk_score: int  # 0-100 arası
-    reasons: List[str]
-    analysis_type: str
-
-# Basit dolandırıcılık keyword'leri
-FRAUD_KEYWORDS = [
-    "acil", "hemen", "son şans", "kazandınız", "ödül", "tebrikler",
-    "ücretsiz", "bedava", "promosyon", "kampanya", "bonus",
-    "kredi kartı", "banka", "hesap", "şifre", "pin", "cvv",
-    "tıkla", "link", "site", "gir", "onayla", "doğrula",
-    "para", "ödeme", "transfer", "gönder", "yatır"
-]
-
-# Risk puanlama fonksiyonu
-def calculate_risk_score(message: str, phone: str = None) -> tuple[int, List[str]]:
-    """Basit risk puanlama algoritması"""
-    score = 0
-    reasons = []
-    
-    message_lower = message.lower()
-    
-    # Keyword kontrolü
-    found_keywords = [kw for kw in FRAUD_KEYWORDS if kw in message_lower]
-    if found_keywords:
-        score += len(found_keywords) * 15
-        reasons.append(f"Şüpheli kelimeler: {', '.join(found_keywords[:3])}")
-    
-    # URL kontrolü
-    if re.search(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', message):
-        score += 25
-        reasons.append("Mesajda link bulunuyor")
-    
-    # Telefon numarası kontrolü
-    phone_pattern = r'(\+90|0)?[5][0-9]{9}'
-    if re.search(phone_pattern, message):
-        score += 20
-        reasons.append("Mesajda telefon numarası var")
-    
-    # Aciliyet ifadeleri
-    urgency_words = ["acil", "hemen", "şimdi", "derhal", "son", "kaçırma"]
-    if any(word in message_lower for word in urgency_words):
-        score += 30
-        reasons.append("Aciliyet ifadeleri kullanılmış")
-    
-    # Para/ödeme ifadeleri
-    money_words = ["para", "tl", "lira", "ödeme", "transfer", "kredi"]
-    if any(word in message_lower for word in money_words):
-        score += 25
-        reasons.append("Para/ödeme ile ilgili kelimeler")
-    
-    return min(score, 100), reasons
+# İstemci hız sınırında X-Client-Id başlığına güvenilen proxy IP'leri (virgülle ayrılmış);
+# boşsa istemci her zaman bağlantının IP'sidir
+TRUSTED_PROXIES = tuple(ip.strip() for ip in os.environ.get("PATTERNA_TRUSTED_PROXIES", "").split(",") if ip.strip())
 
-# Telefon numarası risk kontrolü
-def check_phone_risk(phone: str) -> tuple[int, List[str]]:
-    """Basit telefon numarası risk kontrolü"""
-    reasons = []
-    score = 0
-    
-    # Basit format kontrolü
-    if not re.match(r'^(\+90|0)?[5][0-9]{9}$', phone.replace(' ', '').replace('-', '')):
-        score += 50
-        reasons.append("Geçersiz telefon formatı")
-    
-    # Bilinen şüpheli prefix'ler (örnek)
-    suspicious_prefixes = ["0850", "0900", "+90850"]
-    for prefix in suspicious_prefixes:
-        if phone.startswith(prefix):
-            score += 40
-            reasons.append(f"Şüpheli numara prefix'i: {prefix}")
-    
-    return min(score, 100), reasons
+# /analyze/* kabul kontrolü (eşzamanlılık sınırı, süre sınırlı kuyruk, istemci hız sınırı);
+# reddedilen istekler de aşağıdaki metriklerde 429 / 503 olarak sayılır
+app.add_middleware(AdmissionMiddleware, controller=lambda: ADMISSION, streams=("/analyze/stream",),
+                   trusted_proxies=TRUSTED_PROXIES)
 
-# URL güvenlik kontrolü
-def check_url_safety(url: str) -> tuple[int, List[str]]:
-    """Basit URL güvenlik kontrolü"""
-    reasons = []
-    score = 0
-    
-    # Temel format kontrolü
-    if not url.startswith(('http://', 'https://')):
-        score += 30
-        reasons.append("Güvensiz protokol")
+# Endpoint bazında istek sayısı / gecikme / in-flight (sadece tanımlı route'lar etiketlenir)
+app.add_middleware(MetricsMiddleware, paths=lambda: [route.path for route in app.routes])
+
+# Kural dosyası kontrol aralığı (saniye, 0 = izleme kapalı)
+RULES_WATCH_INTERVAL = float(os.environ.get("PATTERNA_RULES_WATCH", "2"))
+
+# Kabul kontrolü (PATTERNA_ADMISSION=0 ile kapatılır); baskı altında skorlama kısıtlı moda geçer
+ADMISSION = controller_from_env(on_degraded=scoring.set_degraded)
+
+# Admin endpoint'leri için token (tanımlı değilse sadece localhost'tan erişilir)
+ADMIN_TOKEN = os.environ.get("PATTERNA_ADMIN_TOKEN")
+
+# Skorlama thread havuzu: büyük işler (batch, uzun mesaj, akış parçaları)
+# event loop'u bloklamamak için bu havuzda çalışır. Her worker sürecinin
+# kendi havuzu vardır.
+SCORING_THREADS = int(os.environ.get("PATTERNA_SCORING_THREADS", "4"))
+
+# Bu uzunluğa kadar olan mesajlar event loop'ta doğrudan skorlanır
+# (~10µs'lik skorlama, thread'e geçişin ~50µs'lik maliyetinden ucuzdur)
+INLINE_SCORE_MAX_CHARS = int(os.environ.get("PATTERNA_INLINE_MAX_CHARS", "2000"))
+
+_scoring_limiter: Optional[anyio.CapacityLimiter] = None
+
+async def run_scoring(func, *args):
+    """CPU-bound skorlamayı event loop dışında, sınırlı thread havuzunda çalıştır"""
+    global _scoring_limiter
+    if _scoring_limiter is None:
+        # CapacityLimiter çalışan bir event loop içinde oluşturulmalı
+        _scoring_limiter = anyio.CapacityLimiter(SCORING_THREADS)
+    return await anyio.to_thread.run_sync(func, *args, limiter=_scoring_limiter)
+
+# NDJSON akışında tek satır için izin verilen en fazla boyut
+MAX_STREAM_LINE_BYTES = 64 * 1024
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """İstek gövdesi okunurken sonuç yazan NDJSON yanıtı"""
+    media_type = "application/x-ndjson"
     
-    # Şüpheli domain'ler
-    suspicious_domains = [
-        "bit.ly", "tinyurl.com", "t.co", "ow.ly",
-        "bankam.com", "garanti.net", "yapikredi.net"
-    ]
+    async def __call__(self, scope, receive, send) -> None:
+        # StreamingResponse'un disconnect dinleyicisi receive() kanalından
+        # istek gövdesini de tüketir; bu yüzden gövde doğrudan akıtılır.
+        # İstemci koparsa request.stream() ClientDisconnect fırlatır.
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+def _parse_stream_line(line: bytes) -> Any:
+    """NDJSON satırı -> MessageAnalysisRequest veya hata metni"""
+    try:
+        return MessageAnalysisRequest.model_validate_json(line)
+    except ValidationError as e:
+        return f"Geçersiz istek: {e.errors()[0]['msg']}"
+
+def _stream_result_line(result: Any, line_no: int) -> bytes:
+    """Karar veya hata (metin / Exception) -> yanıt satırı"""
+    if isinstance(result, Exception):
+        result = f"Analiz hatası: {str(result)}"
+    if isinstance(result, str):
+        return json.dumps({"line": line_no, "error": result}, ensure_ascii=False).encode() + b"\n"
+    return dumps_model(result) + b"\n"
+
+def _stream_line_result(line: bytes, line_no: int) -> bytes:
+    """Tek NDJSON satırını skorla, yanıt satırını döndür"""
+    result = _parse_stream_line(line)
+    if isinstance(result, MessageAnalysisRequest):
+        try:
+            result = score_message(result)
+        except Exception as e:
+            result = e
+    return _stream_result_line(result, line_no)
+
+def _stream_line_too_long(line_no: int) -> bytes:
+    error = {"line": line_no, "error": f"Satır çok uzun (>{MAX_STREAM_LINE_BYTES} byte)"}
+    return json.dumps(error, ensure_ascii=False).encode() + b"\n"
+
+def _stream_chunk_output(lines: List[tuple[int, Optional[bytes]]]) -> bytes:
+    """Bir parçadaki satırları skorla; None satır = çok uzun"""
+    results = [None if line is None else _parse_stream_line(line) for _, line in lines]
+    # Parçadaki geçerli istekler toplu hattan geçer (model aşaması tek seferde çalışır)
+    requests = [r for r in results if isinstance(r, MessageAnalysisRequest)]
+    responses = iter(score_message_batch(requests))
+    return b"".join(
+        _stream_line_too_long(line_no) if result is None else _stream_result_line(
+            next(responses) if isinstance(result, MessageAnalysisRequest) else result, line_no)
+        for (line_no, _), result in zip(lines, results)
+    )
+
+async def stream_verdicts(request: Request):
+    """İstek gövdesini parça parça oku, her satırın sonucunu hemen yaz.
     
-    for domain in suspicious_domains:
-        if domain in url:
-            score += 60
-            reasons.append(f"Şüpheli domain: {domain}")
+    Bir sonraki parça ancak önceki parçanın sonuçları gönderildikten sonra
+    okunur; yavaş istemci hem okumayı hem yazmayı yavaşlatır (backpressure).
+    Bellekte en fazla bir parça + bir satır tutulur.
+    """
+    buffer = bytearray()
+    line_no = 0
+    skipping = False  # MAX_STREAM_LINE_BYTES'ı aşan satırın kalanı atlanıyor
     
-    # IP adresi kontrolü
-    ip_pattern = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
-    if re.search(ip_pattern, url):
-        score += 70
-        reasons.append("IP adresi kullanılmış (domain yerine)")
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            output: List[tuple[int, Optional[bytes]]] = []
+            output_bytes = 0
+            
+            while True:
+                newline = buffer.find(b"\n")
+                if newline < 0:
+                    break
+                line = bytes(buffer[:newline])
+                del buffer[:newline + 1]
+                if skipping:
+                    skipping = False
+                    continue
+                line_no += 1
+                if len(line) > MAX_STREAM_LINE_BYTES:
+                    output.append((line_no, None))
+                elif line.strip():
+                    output.append((line_no, line))
+                    output_bytes += len(line)
+            
+            if len(buffer) > MAX_STREAM_LINE_BYTES:
+                if not skipping:
+                    line_no += 1
+                    output.append((line_no, None))
+                    skipping = True
+                buffer.clear()
+            
+            if output:
+                if output_bytes <= INLINE_SCORE_MAX_CHARS:
+                    yield _stream_chunk_output(output)
+                else:
+                    yield await run_scoring(_stream_chunk_output, output)
+        
+        # Sonunda newline olmayan son satır
+        if buffer.strip() and not skipping:
+            yield _stream_line_result(bytes(buffer), line_no + 1)
     
-    return min(score, 100), reasons
+    except ClientDisconnect:
+        return
 
 # API Endpoints
 
+# Sabit yanıtlar başlangıçta bir kez serileştirilir (load balancer / dashboard
+# yoklamaları her istekte jsonable_encoder'dan geçmez, ETag ile 304 alabilir)
+ROOT_INFO = StaticJSON({
+    "message": "🛡️ Patterna Shield Mini API",
+    "version": "1.0.0",
+    "status": "active",
+    "note": "Bu MINI versiyon - Öğrenme amaçlı!",
+    "full_system_info": {
+        "description": "Tam Patterna Shield sistemi çok daha güçlü özelliklere sahip",
+        "features": [
+            "🤖 AI/ML Pattern Detection",
+            "📊 Otomatik Data Pipeline", 
+            "🇹🇷 Turkish Fraud Intelligence",
+            "🚀 Production Ready (100K+ msg/day)",
+            "📈 Real-time Monitoring",
+            "🛡️ Enterprise Security"
+        ],
+        "performance": "Tam sistem %98+ doğruluk oranı ile çalışır",
+        "scale": "Production'da günde 100K+ mesaj analiz edebilir"
+    },
+    "mini_endpoints": [
+        "/docs - API Documentation",
+        "/analyze/message - Mesaj analizi (basit)",
+        "/analyze/batch - Toplu mesaj analizi",
+        "/analyze/stream - NDJSON akış analizi",
+        "/analyze/phone - Telefon kontrolü (temel)", 
+        "/analyze/url - URL kontrolü (basit)",
+        "/metrics - Prometheus metrikleri",
+        "/admin/rules - Kural seti sürümü / yeniden yükleme",
+        "/full-system-info - Tam sistem özellikleri"
+    ]
+})
+
 @app.get("/")
-def root():
+async def root(request: Request):
     """Ana sayfa - API durumu ve tam sistem bilgisi"""
-    return {
-        "message": "🛡️ Patterna Shield Mini API",
-        "version": "1.0.0",
-        "status": "active",
-        "note": "Bu MINI versiyon - Öğrenme amaçlı!",
-        "full_system_info": {
-            "description": "Tam Patterna Shield sistemi çok daha güçlü özelliklere sahip",
-            "features": [
-                "🤖 AI/ML Pattern Detection",
-                "📊 Otomatik Data Pipeline", 
-                "🇹🇷 Turkish Fraud Intelligence",
-                "🚀 Production Ready (100K+ msg/day)",
-                "📈 Real-time Monitoring",
-                "🛡️ Enterprise Security"
-            ],
-            "performance": "Tam sistem %98+ doğruluk oranı ile çalışır",
-            "scale": "Production'da günde 100K+ mesaj analiz edebilir"
-        },
-        "mini_endpoints": [
-            "/docs - API Documentation",
-            "/analyze/message - Mesaj analizi (basit)",
-            "/analyze/phone - Telefon kontrolü (temel)", 
-            "/analyze/url - URL kontrolü (basit)",
-            "/full-system-info - Tam sistem özellikleri"
-        ]
-    }
+    return ROOT_INFO.response(request.headers.get("if-none-match"))
 
 @app.post("/analyze/message", response_model=AnalysisResponse)
-def analyze_message(request: MessageAnalysisRequest):
+async def analyze_message(request: MessageAnalysisRequest):
     """Mesaj dolandırıcılık analizi"""
     try:
-        risk_score, reasons = calculate_risk_score(request.message, request.sender_phone)
-        
-        # Telefon kontrolü varsa ekle
-        if request.sender_phone:
-            phone_score, phone_reasons = check_phone_risk(request.sender_phone)
-            risk_score = min(risk_score + (phone_score // 2), 100)
-            reasons.extend(phone_reasons)
-        
-        is_fraud = risk_score >= 60
-        
-        return AnalysisResponse(
-            is_fraud=is_fraud,
-            risk_score=risk_score,
-            reasons=reasons if reasons else ["Şüpheli içerik tespit edilmedi"],
-            analysis_type="message"
-        )
+        if len(request.message) <= INLINE_SCORE_MAX_CHARS:
+            return json_response(score_message(request))
+        return json_response(await run_scoring(score_message, request))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analiz hatası: {str(e)}")
 
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(request: BatchAnalysisRequest):
+    """Toplu mesaj analizi - sonuçlar giriş sırasıyla döner"""
+    # Skorlama + serileştirme thread havuzunda; event loop bloklanmaz
+    body = await run_scoring(batch_response_json, request.messages)
+    return Response(body, media_type="application/json")
+
+def batch_response_json(items: List[Any]) -> bytes:
+    """Batch'i skorla ve yanıtı JSON'a çevir (thread havuzunda çalışır)"""
+    return dumps_model(build_batch_response(items))
+
+@app.post("/analyze/stream", response_class=NDJSONStreamingResponse)
+async def analyze_stream(request: Request):
+    """NDJSON akış analizi - her satır bir MessageAnalysisRequest"""
+    return NDJSONStreamingResponse(stream_verdicts(request))
+
 @app.post("/analyze/phone", response_model=AnalysisResponse)
-def analyze_phone(request: PhoneCheckRequest):
+async def analyze_phone(request: PhoneCheckRequest):
     """Telefon numarası risk analizi"""
     try:
-        risk_score, reasons = check_phone_risk(request.phone_number)
-        is_fraud = risk_score >= 50
-        
-        return AnalysisResponse(
-            is_fraud=is_fraud,
-            risk_score=risk_score,
-            reasons=reasons if reasons else ["Numara güvenli görünüyor"],
-            analysis_type="phone"
-        )
+        return json_response(score_phone(request.phone_number))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Telefon analiz hatası: {str(e)}")
 
 @app.post("/analyze/url", response_model=AnalysisResponse)
-def analyze_url(request: URLCheckRequest):
+async def analyze_url(request: URLCheckRequest):
     """URL güvenlik analizi"""
     try:
-        risk_score, reasons = check_url_safety(request.url)
-        is_fraud = risk_score >= 50
-        
-        return AnalysisResponse(
-            is_fraud=is_fraud,
-            risk_score=risk_score,
-            reasons=reasons if reasons else ["URL güvenli görünüyor"],
-            analysis_type="url"
-        )
+        return json_response(score_url(request.url))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"URL analiz hatası: {str(e)}")
 
-@app.get("/full-system-info")
-def full_system_info():
-    """Tam Patterna Shield sistemi özellikleri"""
-    return {
-        "title": "🛡️ TAM PATTERNA SHIELD SİSTEMİ",
-        "comparison": {
-            "mini_version": {
-                "files": "1 dosya (300 satır)",
-                "features": "Temel fraud detection",
-                "setup_time": "2 dakika",
-                "target": "Öğrenme ve prototype"
-            },
-            "full_version": {
-                "files": "15+ dosya (2000+ satır)",
-                "features": "Enterprise-grade AI system",
-                "setup_time": "10+ dakika",
-                "target": "Production deployment"
-            }
+FULL_SYSTEM_INFO = StaticJSON({
+    "title": "🛡️ TAM PATTERNA SHIELD SİSTEMİ",
+    "comparison": {
+        "mini_version": {
+            "files": "1 dosya (300 satır)",
+            "features": "Temel fraud detection",
+            "setup_time": "2 dakika",
+            "target": "Öğrenme ve prototype"
         },
-        "full_system_features": {
-            "ai_ml": {
-                "description": "Advanced AI/ML Pattern Detection",
-                "technologies": ["Scikit-learn", "NLP", "Anomaly Detection"],
-                "capabilities": "Machine learning tabanlı fraud pattern recognition"
-            },
-            "auto_pipeline": {
-                "description": "Otomatik Data Pipeline",
-                "technologies": ["GitHub API", "APScheduler", "Real-time updates"],
-                "capabilities": "GitHub, Şikayetvar.com'dan otomatik veri toplama"
-            },
-            "turkish_intelligence": {
-                "description": "Turkish Fraud Intelligence",
-                "technologies": ["Turkish NLP", "Local patterns", "Cultural context"],
-                "capabilities": "Türkiye'ye özel fraud detection ve language processing"
-            },
-            "performance": {
-                "description": "Enterprise Performance",
-                "metrics": {
-                    "daily_capacity": "100K+ messages per day",
-                    "accuracy": "98%+ doğruluk oranı",
-                    "response_time": "<50ms average",
-                    "uptime": "99.9% availability"
-                }
-            }
+        "full_version": {
+            "files": "15+ dosya (2000+ satır)",
+            "features": "Enterprise-grade AI system",
+            "setup_time": "10+ dakika",
+            "target": "Production deployment"
+        }
+    },
+    "full_system_features": {
+        "ai_ml": {
+            "description": "Advanced AI/ML Pattern Detection",
+            "technologies": ["Scikit-learn", "NLP", "Anomaly Detection"],
+            "capabilities": "Machine learning tabanlı fraud pattern recognition"
         },
-        "production_capabilities": {
-            "scalability": "Kubernetes auto-scaling",
-            "monitoring": "Prometheus + Grafana dashboards",
-            "security": "Enterprise-grade authentication & rate limiting",
-            "deployment": "Docker containerization",
-            "database": "Optimized SQLite with advanced queries",
-            "apis": "RESTful APIs with comprehensive documentation"
+        "auto_pipeline": {
+            "description": "Otomatik Data Pipeline",
+            "technologies": ["GitHub API", "APScheduler", "Real-time updates"],
+            "capabilities": "GitHub, Şikayetvar.com'dan otomatik veri toplama"
         },
-        "use_cases": [
-            "🏢 Enterprise fraud prevention systems",
-            "📱 Mobile app SMS protection",
-            "🌐 Web service fraud detection",
-            "📊 Real-time threat monitoring",
-            "🇹🇷 Turkish market fraud intelligence"
-        ],
-        "learning_path": {
-            "step_1": "Bu mini sistem ile temel mantığı öğrenin",
-            "step_2": "Fraud detection algoritmasını geliştirin",
-            "step_3": "Tam sistemi inceleyin ve production'a geçin"
+        "turkish_intelligence": {
+            "description": "Turkish Fraud Intelligence",
+            "technologies": ["Turkish NLP", "Local patterns", "Cultural context"],
+            "capabilities": "Türkiye'ye özel fraud detection ve language processing"
         },
-        "note": "Bu mini versiyon, tam sistemin sadece %5'ini temsil eder. Tam sistem çok daha güçlü!"
+        "performance": {
+            "description": "Enterprise Performance",
+            "metrics": {
+                "daily_capacity": "100K+ messages per day",
+                "accuracy": "98%+ doğruluk oranı",
+                "response_time": "<50ms average",
+                "uptime": "99.9% availability"
+            }
+        }
+    },
+    "production_capabilities": {
+        "scalability": "Kubernetes auto-scaling",
+        "monitoring": "Prometheus + Grafana dashboards",
+        "security": "Enterprise-grade authentication & rate limiting",
+        "deployment": "Docker containerization",
+        "database": "Optimized SQLite with advanced queries",
+        "apis": "RESTful APIs with comprehensive documentation"
+    },
+    "use_cases": [
+        "🏢 Enterprise fraud prevention systems",
+        "📱 Mobile app SMS protection",
+        "🌐 Web service fraud detection",
+        "📊 Real-time threat monitoring",
+        "🇹🇷 Turkish market fraud intelligence"
+    ],
+    "learning_path": {
+        "step_1": "Bu mini sistem ile temel mantığı öğrenin",
+        "step_2": "Fraud detection algoritmasını geliştirin",
+        "step_3": "Tam sistemi inceleyin ve production'a geçin"
+    },
+    "note": "Bu mini versiyon, tam sistemin sadece %5'ini temsil eder. Tam sistem çok daha güçlü!"
+})
+
+@app.get("/full-system-info")
+async def full_system_info(request: Request):
+    """Tam Patterna Shield sistemi özellikleri"""
+    return FULL_SYSTEM_INFO.response(request.headers.get("if-none-match"))
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Karar önbelleği istatistikleri"""
+    if scoring.VERDICT_CACHE is None:
+        return {"enabled": False}
+    rules = RULE_STORE.current
+    return {"enabled": True, "rules_version": rules.version, "rules_fingerprint": rules.fingerprint,
+            **scoring.VERDICT_CACHE.stats()}
+
+def require_admin(request: Request) -> None:
+    """Admin erişimi: token tanımlıysa X-Admin-Token, değilse sadece localhost"""
+    if ADMIN_TOKEN:
+        if not hmac.compare_digest(request.headers.get("x-admin-token", ""), ADMIN_TOKEN):
+            raise HTTPException(status_code=403, detail="Geçersiz admin token")
+    elif not request.client or request.client.host not in ("127.0.0.1", "::1", "localhost"):
+        raise HTTPException(status_code=403, detail="Admin endpoint'lerine sadece localhost'tan erişilebilir")
+
+@app.get("/admin/rules")
+async def rules_status(request: Request):
+    """Geçerli kural seti sürümü"""
+    require_admin(request)
+    return {"pid": os.getpid(), **RULE_STORE.status()}
+
+@app.post("/admin/rules/reload")
+async def reload_rules(request: Request):
+    """Kural dosyasını arka planda derle ve atomik olarak devreye al.
+    
+    Çok worker'lı modda istek tek bir worker'a düşer; diğer worker'lar
+    değişikliği dosya izleyiciyle (PATTERNA_RULES_WATCH) alır.
+    """
+    require_admin(request)
+    try:
+        snapshot, changed = await anyio.to_thread.run_sync(RULE_STORE.reload)
+    except RuleError as e:
+        raise HTTPException(status_code=422, detail=f"Kural dosyası yüklenemedi: {str(e)}")
+    return {"pid": os.getpid(), "reloaded": changed, **snapshot.info()}
+
+@app.get("/admin/memory")
+async def memory_status(request: Request):
+    """Worker başına ve toplam RSS / PSS, paylaşılan tablolar (/proc, Linux)"""
+    require_admin(request)
+    shared = get_shared_tables()
+    report = await anyio.to_thread.run_sync(memory_report)
+    return {
+        "pid": os.getpid(),
+        **report,
+        "rules_shared": RULE_STORE.current.shared,
+        "phone_blacklist": get_phone_blacklist().status(),
+        "shared_tables": shared.status() if shared is not None else {"enabled": False},
     }
 
+@app.get("/admin/threat-feed")
+async def threat_feed_status(request: Request):
+    """Eşlenmiş tehdit listesi indeksi (python threat_feed.py build ile derlenir)"""
+    require_admin(request)
+    return {"pid": os.getpid(), **get_threat_feed().status()}
+
+@app.get("/admin/text-classifier")
+async def text_classifier_status(request: Request):
+    """Metin sınıflandırıcı modeli (python text_classifier.py train ile eğitilir)"""
+    require_admin(request)
+    return {"pid": os.getpid(), **get_text_classifier().status()}
+
+@app.get("/admin/admission")
+async def admission_status(request: Request):
+    """Kabul kontrolü durumu: eşzamanlılık, kuyruk, reddedilenler, kısıtlı mod (bu worker)"""
+    require_admin(request)
+    if ADMISSION is None:
+        return {"pid": os.getpid(), "enabled": False}
+    return {"pid": os.getpid(), "enabled": True, **ADMISSION.stats()}
+
+@app.get("/admin/sender-velocity")
+async def sender_velocity_status(request: Request, top: int = 10):
+    """Gönderen hızı izleyicisi ve penceredeki en yoğun gönderenler (bu worker)"""
+    require_admin(request)
+    if scoring.SENDER_VELOCITY is None:
+        return {"pid": os.getpid(), "enabled": False}
+    tracker = scoring.SENDER_VELOCITY
+    # Tüm slotlar taranır; event loop bloklanmasın
+    senders = await anyio.to_thread.run_sync(tracker.top, max(1, min(top, 100)))
+    return {
+        "pid": os.getpid(),
+        "enabled": True,
+        **tracker.stats(),
+        "limits": dict(RULE_STORE.current.sender_velocity),
+        "top_senders": [{"sender": f"+{sender}" if isinstance(sender, int) else sender, "messages": count}
+                        for sender, count in senders],
+    }
+
+@app.get("/admin/campaigns")
+async def campaign_list(request: Request, limit: int = 50, fraud_only: bool = False, min_count: int = 2):
+    """Yakın kopya mesaj kampanyaları, mesaj sayısına göre (analist incelemesi, bu worker)"""
+    require_admin(request)
+    if scoring.CAMPAIGN_INDEX is None:
+        return {"pid": os.getpid(), "enabled": False}
+    index = scoring.CAMPAIGN_INDEX
+    # Tüm kampanyalar taranır; event loop bloklanmasın
+    campaigns = await anyio.to_thread.run_sync(index.campaigns, max(1, min(limit, 500)), fraud_only, min_count)
+    return {"pid": os.getpid(), "enabled": True, **index.stats(), "items": campaigns}
+
+@app.get("/admin/campaigns/{campaign_id}")
+async def campaign_detail(request: Request, campaign_id: int):
+    """Tek kampanyanın sayıları ve örnek mesajları"""
+    require_admin(request)
+    campaign = scoring.CAMPAIGN_INDEX.get(campaign_id) if scoring.CAMPAIGN_INDEX is not None else None
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Kampanya bulunamadı (süresi dolmuş veya başka worker'da)")
+    return {"pid": os.getpid(), **campaign}
+
+def _cache_metrics() -> List[str]:
+    """Karar önbelleği sayaçlarını Prometheus satırlarına çevir"""
+    if scoring.VERDICT_CACHE is None:
+        return []
+    stats = scoring.VERDICT_CACHE.stats()
+    lines = []
+    for key, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"),
+                      ("entries", "gauge"), ("bytes", "gauge")):
+        name = f"patterna_verdict_cache_{key}" + ("_total" if kind == "counter" else "")
+        lines += [f"# TYPE {name} {kind}", f"{name} {stats[key]}"]
+    return lines
+
+METRICS_REGISTRY.add_collector(_cache_metrics)
+
+def _report_metrics() -> List[str]:
+    """Karar kayıt yazıcısı sayaçları"""
+    if scoring.REPORT_WRITER is None:
+        return []
+    stats = scoring.REPORT_WRITER.stats()
+    lines = []
+    for key, kind in (("written", "counter"), ("dropped", "counter"), ("loop_drops", "counter"),
+                      ("errors", "counter"), ("queued", "gauge")):
+        name = f"patterna_reports_{key}" + ("_total" if kind == "counter" else "")
+        lines += [f"# TYPE {name} {kind}", f"{name} {stats[key]}"]
+    return lines
+
+METRICS_REGISTRY.add_collector(_report_metrics)
+
+def _velocity_metrics() -> List[str]:
+    """Gönderen hızı izleyicisi sayaçları"""
+    if scoring.SENDER_VELOCITY is None:
+        return []
+    stats = scoring.SENDER_VELOCITY.stats()
+    lines = []
+    for key, kind in (("recorded", "counter"), ("evictions", "counter"), ("tracked", "gauge")):
+        name = f"patterna_sender_velocity_{key}" + ("_total" if kind == "counter" else "")
+        lines += [f"# TYPE {name} {kind}", f"{name} {stats[key]}"]
+    return lines
+
+METRICS_REGISTRY.add_collector(_velocity_metrics)
+
+def _campaign_metrics() -> List[str]:
+    """Kampanya indeksi sayaçları"""
+    if scoring.CAMPAIGN_INDEX is None:
+        return []
+    stats = scoring.CAMPAIGN_INDEX.stats()
+    lines = []
+    for key, kind in (("observed", "counter"), ("matched", "counter"), ("evictions", "counter"),
+                      ("campaigns", "gauge"), ("fraud_campaigns", "gauge")):
+        name = f"patterna_campaign_index_{key}" + ("_total" if kind == "counter" else "")
+        lines += [f"# TYPE {name} {kind}", f"{name} {stats[key]}"]
+    return lines
+
+METRICS_REGISTRY.add_collector(_campaign_metrics)
+
+def _admission_metrics() -> List[str]:
+    """Kabul kontrolü sayaçları"""
+    if ADMISSION is None:
+        return []
+    stats = ADMISSION.stats()
+    lines = ["# TYPE patterna_admission_admitted_total counter",
+             f"patterna_admission_admitted_total {stats['admitted']}",
+             "# TYPE patterna_admission_rejected_total counter"]
+    lines += [f'patterna_admission_rejected_total{{reason="{reason}"}} {count}'
+              for reason, count in sorted(stats["rejected"].items())]
+    for key, value in (("in_flight", stats["in_flight"]), ("queued", stats["queued"]),
+                       ("streams", stats["streams"]), ("degraded", int(stats["degraded"])),
+                       ("loop_lag_seconds", ADMISSION.loop_lag)):
+        lines += [f"# TYPE patterna_admission_{key} gauge", f"patterna_admission_{key} {value}"]
+    return lines
+
+METRICS_REGISTRY.add_collector(_admission_metrics)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrikleri (text format)"""
+    return Response(METRICS_REGISTRY.render(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
 @app.get("/health")
-def health_check():
+async def health_check():
     """Sistem sağlık kontrolü"""
-    return {
+    return json_response({
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "version": "1.0.0 (Mini)",
         "note": "Bu mini versiyon - Tam sistem çok daha kapsamlı!",
         "full_system_note": "Production tam sistemde advanced monitoring ve metrics mevcut"
-    }
+    })
 
 if __name__ == "__main__":
-    import uvicorn
     print("🛡️ Patterna Shield Mini başlatılıyor...")
     print("� Bu MINI versiyon - Öğrenme amaçlı!")
     print("🚀 Tam sistem: Production-ready, AI/ML, 100K+ msg/day capacity")
@@ -340,4 +606,6 @@ if __name__ == "__main__":
     print("⚡ Mini sistemde basit rule-based detection")
     print("🧠 Tam sistemde AI/ML tabanlı advanced detection")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Seçenekler için: python server.py --help
+    from server import run_server
+    run_server()
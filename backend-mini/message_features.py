@@ -0,0 +1,89 @@
+"""
+Patterna Shield Mini - Mesaj Özellik Çıkarımı
+=============================================
+
+Mesaj bir kez taranır ve tüm skorlayıcıların ortak kullandığı bir
+`MessageFeatures` nesnesi üretilir:
+
+- normalized   : Türkçe kurallarla küçük harfli, temizlenmiş metin
+- folded       : aksanları katlanmış metin (keyword eşleştirme bunu tarar)
+- keyword_hits : kategori -> bulunan keyword'ler (tek Aho-Corasick geçişi)
+- urls         : mesajdaki linkler
+- phones       : mesajdaki telefon numaraları
+- ips          : mesajdaki IP adresleri (link host'u olanlar dahil)
+
+URL, IP ve telefon desenleri tek bir birleşik regex ile tek geçişte bulunur.
+Link içindeki rakamlar telefon numarası olarak sayılmaz.
+"""
+
+import re
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Dict, List
+
+from keyword_matcher import KeywordMatcher
+from metrics import STAGE_KEYWORD, STAGE_PATTERN_REGEX
+from text_normalizer import normalize
+
+URL_PATTERN = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+IP_PATTERN = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
+PHONE_PATTERN = r'(?:\+90|0)?[5][0-9]{9}'
+
+# Baştaki lookahead, regex motorunun sadece h / rakam / + ile başlayan
+# konumlarda alternatifleri denemesini sağlar (~3x hızlı)
+_FEATURE_RE = re.compile(
+    f"(?=[h0-9+])(?:(?P<url>{URL_PATTERN})|(?P<ip>{IP_PATTERN})|(?P<phone>{PHONE_PATTERN}))"
+)
+_IP_RE = re.compile(IP_PATTERN)
+
+
+@dataclass(frozen=True)
+class MessageFeatures:
+    """Mesajdan bir kez çıkarılan, skorlayıcıların paylaştığı özellikler"""
+    text: str
+    normalized: str
+    folded: str
+    keyword_hits: Dict[str, List[str]]
+    urls: List[str] = field(default_factory=list)
+    phones: List[str] = field(default_factory=list)
+    ips: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """Hiçbir şüpheli özellik yok mu?"""
+        return not (self.urls or self.phones or self.ips or any(self.keyword_hits.values()))
+
+
+def extract_features(message: str, matcher: KeywordMatcher) -> MessageFeatures:
+    """Mesajı tek geçişte tarayıp özellik nesnesini üret"""
+    normalized, folded = normalize(message)
+    urls, phones, ips = [], [], []
+
+    start = perf_counter_ns()
+    for match in _FEATURE_RE.finditer(message):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "url":
+            urls.append(value)
+            # IP adresi içeren linkler (http://192.168.1.1/...)
+            ip = _IP_RE.search(value)
+            if ip:
+                ips.append(ip.group())
+        elif kind == "phone":
+            phones.append(value)
+        else:
+            ips.append(value)
+    regex_done = perf_counter_ns()
+    keyword_hits = matcher.match(folded)
+    STAGE_PATTERN_REGEX.observe_ns(regex_done - start)
+    STAGE_KEYWORD.observe_ns(perf_counter_ns() - regex_done)
+
+    return MessageFeatures(
+        text=message,
+        normalized=normalized,
+        folded=folded,
+        keyword_hits=keyword_hits,
+        urls=urls,
+        phones=phones,
+        ips=ips,
+    )
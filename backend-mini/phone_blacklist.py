@@ -0,0 +1,454 @@
+"""
+Patterna Shield Mini - Telefon Kara Listesi
+===========================================
+
+Kalıcı kaynak SQLite (WAL modu) içindeki `phone_blacklist` tablosudur
+(şema: FULL_SYSTEM_OVERVIEW.py). Sorgu yolunda veritabanına gidilmez:
+numaralar başlangıçta E.164 tam sayı anahtarlara (phone_numbers.py)
+çevrilip bellekteki açık adresli bir hash set'e yüklenir. Üyelik kontrolü
+liste boyutundan bağımsızdır ve 10M+ numarada da mikro saniyenin altında
+kalır; SQLite'a sadece eşleşen (nadir) numaraların detayları için gidilir.
+Toplu skorlama aynı tabloyu NumPy ile sorgular (`contains_keys`).
+
+PATTERNA_SHARED_TABLES=1 ile tablo worker'lar arasında paylaşılır
+(shared_tables.py): bir kez kurulur, worker'lar salt okunur eşler. İçe
+aktarma aynı modda yeni tabloyu yayınlar, çalışan worker'lar izleyiciyle
+eşler.
+
+Toplu içe aktarma:
+    python phone_blacklist.py import numaralar.csv --source sikayetvar
+    python phone_blacklist.py stats
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from phone_numbers import e164_key, load_numpy
+from shared_tables import SharedTables, get_shared_tables
+
+# Veri dizini (PATTERNA_DATA_DIR, varsayılan: $XDG_DATA_HOME/patterna-shield);
+# kaynak koduyla aynı dizine yazılmaz
+DATA_DIR = os.environ.get("PATTERNA_DATA_DIR") or os.path.join(
+    os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share"), "patterna-shield")
+
+# Veritabanı dosyası (PATTERNA_DB_PATH ile değiştirilebilir); fraud_reports da aynı dosyadadır
+DEFAULT_DB_PATH = os.environ.get("PATTERNA_DB_PATH") or os.path.join(DATA_DIR, "patterna_shield.db")
+
+# Toplu içe aktarmada bir transaction'daki satır sayısı ve SQLite sayfa önbelleği
+IMPORT_BATCH_SIZE = 200_000
+IMPORT_CACHE_KB = 128 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS phone_blacklist (
+    phone_number VARCHAR(20) PRIMARY KEY,
+    risk_level INTEGER,
+    reported_count INTEGER,
+    last_reported TIMESTAMP,
+    source VARCHAR(100)
+) WITHOUT ROWID
+"""
+
+UPSERT_SQL = """
+INSERT INTO phone_blacklist (phone_number, risk_level, reported_count, last_reported, source)
+VALUES (?, ?, 1, ?, ?)
+ON CONFLICT(phone_number) DO UPDATE SET
+    risk_level = MAX(risk_level, excluded.risk_level),
+    reported_count = reported_count + 1,
+    last_reported = excluded.last_reported,
+    source = excluded.source
+"""
+
+# ---------------------------------------------------------------------------
+# Bellek içi üyelik yapısı
+# ---------------------------------------------------------------------------
+
+_HASH_MULT = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class IntHashSet:
+    """Pozitif int64 anahtarlar için açık adresli (linear probing) hash set.
+
+    Tablo düz bir `array('q')` olduğundan Python set'ine göre ~3 kat daha az
+    bellek kullanır (10M numara ~270 MB). Boş slot 0 ile işaretlenir.
+    Okumalar kilitsizdir; büyüme yeni tabloyla atomik olarak değiştirilir.
+    Tablo salt okunur bir görünüm (paylaşılan bellek) olabilir; ilk
+    eklemede özel bir kopyaya geçilir.
+    """
+
+    def __init__(self, keys: Iterable[int] = (), capacity: int = 0):
+        self._count = 0
+        self._state = self._allocate(capacity)
+        self.update(keys)
+
+    @classmethod
+    def from_table(cls, table, count: int) -> "IntHashSet":
+        """Kurulmuş slot tablosunu (ör. eşlenmiş memoryview) kopyalamadan kullan"""
+        keys = cls.__new__(cls)
+        keys._count = count
+        keys._state = (table, 64 - (len(table).bit_length() - 1), len(table) - 1)
+        return keys
+
+    @property
+    def table(self):
+        """Slot tablosu (boş slotlar 0)"""
+        return self._state[0]
+
+    @staticmethod
+    def _allocate(expected: int) -> Tuple[array, int, int]:
+        # Doluluk oranı en fazla %50
+        bits = max(4, (max(expected, 1) * 2 - 1).bit_length())
+        size = 1 << bits
+        return array("q", bytes(8 * size)), 64 - bits, size - 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: int) -> bool:
+        table, shift, mask = self._state
+        i = ((key * _HASH_MULT) & _MASK64) >> shift
+        while True:
+            value = table[i]
+            if value == key:
+                return True
+            if not value:
+                return False
+            i = (i + 1) & mask
+
+    def add(self, key: int) -> None:
+        table, shift, mask = self._state
+        if (self._count + 1) * 2 > mask + 1:
+            self._resize((self._count + 1) * 2)
+            table, shift, mask = self._state
+        elif not isinstance(table, array):
+            table = array("q", table)
+            self._state = table, shift, mask
+        i = ((key * _HASH_MULT) & _MASK64) >> shift
+        while True:
+            value = table[i]
+            if value == key:
+                return
+            if not value:
+                table[i] = key
+                self._count += 1
+                return
+            i = (i + 1) & mask
+
+    def update(self, keys: Iterable[int]) -> None:
+        if hasattr(keys, "__len__") and len(keys) + self._count > (self._state[2] + 1) // 2:
+            self._resize(len(keys) + self._count)
+        for key in keys:
+            self.add(key)
+
+    def _resize(self, expected: int) -> None:
+        old_table = self._state[0]
+        table, shift, mask = state = self._allocate(expected)
+        for key in old_table:
+            if key:
+                i = ((key * _HASH_MULT) & _MASK64) >> shift
+                while table[i]:
+                    i = (i + 1) & mask
+                table[i] = key
+        self._state = state
+
+    def contains_keys(self, keys):
+        """NumPy anahtar dizisi için üyelik maskesi (toplu yol)
+
+        Tablo kopyalanmadan NumPy'ye açılır; her turda henüz boş slota veya
+        anahtara ulaşmamış sorgular bir sonraki slotu dener.
+        """
+        np = load_numpy()
+        table, shift, mask = self._state
+        slots_table = np.frombuffer(table, dtype=np.int64)
+        found = np.zeros(len(keys), dtype=bool)
+        pending = np.flatnonzero(keys > 0)
+        wanted = keys[pending]
+        with np.errstate(over="ignore"):
+            slots = ((wanted.astype(np.uint64) * np.uint64(_HASH_MULT)) >> np.uint64(shift)).astype(np.int64)
+        while pending.size:
+            values = slots_table[slots]
+            hit = values == wanted
+            found[pending[hit]] = True
+            more = ~hit & (values != 0)
+            pending, wanted, slots = pending[more], wanted[more], (slots[more] + 1) & mask
+        return found
+
+    @property
+    def memory_bytes(self) -> int:
+        table = self._state[0]
+        return len(table) * table.itemsize
+
+
+# ---------------------------------------------------------------------------
+# Kara liste deposu
+# ---------------------------------------------------------------------------
+
+class PhoneBlacklist:
+    """SQLite (kalıcı) + IntHashSet (sorgu yolu) telefon kara listesi"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, shared: Optional[SharedTables] = None):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._keys = IntHashSet()
+        # İçerik her değiştiğinde artar (karar önbelleği geçersiz kılınır)
+        self.generation = 0
+        # Paylaşılan tablo adı veritabanı yolundan türetilir; eşlenen dosya izlenir
+        self._shared = shared
+        self._shared_name = "blacklist-" + hashlib.sha1(os.path.abspath(db_path).encode("utf-8")).hexdigest()[:12]
+        self._shared_path: Optional[str] = None
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.reload()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def reload(self) -> None:
+        """Tüm anahtarları veritabanından yeniden yükle"""
+        # Veritabanı henüz yoksa okuma yolunda dosya oluşturulmaz
+        if self._conn is None and not os.path.exists(self.db_path):
+            return
+        with self._lock:
+            conn = self._connect()
+            count = conn.execute("SELECT COUNT(*) FROM phone_blacklist").fetchone()[0]
+            keys = self._attach_shared(conn, count) if self._shared is not None else None
+            if keys is None:
+                keys = self._read_keys(conn, count)
+        self._keys = keys
+        self.generation += 1
+
+    @staticmethod
+    def _read_keys(conn: sqlite3.Connection, count: int) -> IntHashSet:
+        keys = IntHashSet(capacity=count)
+        for (number,) in conn.execute("SELECT phone_number FROM phone_blacklist"):
+            keys.add(int(number))
+        return keys
+
+    def _attach_shared(self, conn: sqlite3.Connection, count: int) -> Optional[IntHashSet]:
+        """Yayınlanmış tabloyu eşle; yoksa veya satır sayısı tutmuyorsa bir kez kurup yayınla"""
+        def build():
+            keys = self._read_keys(conn, count)
+            return {"count": len(keys), "db": self.db_path}, {"slots": keys.table}
+
+        try:
+            table = self._shared.attach(self._shared_name, build, accept=lambda meta: meta["count"] == count)
+        except (OSError, ValueError) as e:
+            # Dizin yazılamıyor / dolu: bu worker özel kopyayla devam eder
+            self._shared.last_error = f"{self._shared_name}: {e}"
+            return None
+        self._shared_path = table.path
+        return IntHashSet.from_table(table.array("slots"), table.meta["count"])
+
+    def publish(self) -> None:
+        """Bellekteki tabloyu yayınla; paylaşılan modda çalışan worker'lar izleyiciyle eşler"""
+        if self._shared is None:
+            return
+        keys = self._keys
+        try:
+            table = self._shared.publish(self._shared_name, {"count": len(keys), "db": self.db_path},
+                                         {"slots": keys.table})
+        except OSError as e:
+            # Veritabanı güncel; worker'lar yeniden başlarken tabloyu kendileri kurar
+            self._shared.last_error = f"{self._shared_name}: {e}"
+            return
+        # Özel kopya yerine yayınlanan tablo kullanılır
+        self._keys = IntHashSet.from_table(table.array("slots"), table.meta["count"])
+        self._shared_path = table.path
+
+    def reload_if_published(self) -> bool:
+        """Başka bir süreç yeni tablo yayınladıysa onu eşle (dosya izleyici için)"""
+        if self._shared is None:
+            return False
+        path = self._shared.current_path(self._shared_name)
+        if path is None or path == self._shared_path:
+            return False
+        table = self._shared.open(self._shared_name)
+        if table is None:
+            return False  # o arada yenisi yayınlandı; sonraki turda eşlenir
+        self._keys = IntHashSet.from_table(table.array("slots"), table.meta["count"])
+        self._shared_path = table.path
+        self.generation += 1
+        return True
+
+    def start_watcher(self, interval: float) -> None:
+        """Yayınlanan tabloyu `interval` saniyede bir kontrol eden thread (sadece paylaşılan modda)"""
+        if self._shared is None or self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                self.reload_if_published()
+
+        self._watcher = threading.Thread(target=watch, name="phone-blacklist-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def status(self) -> Dict:
+        return {
+            "numbers": len(self._keys),
+            "table_bytes": self._keys.memory_bytes,
+            "shared": isinstance(self._keys.table, memoryview),
+            "shared_path": self._shared_path,
+            "shared_error": self._shared.last_error if self._shared is not None else None,
+            "generation": self.generation,
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, phone: str) -> bool:
+        key = e164_key(phone)
+        return key is not None and key in self._keys
+
+    def contains_keys(self, keys):
+        """Anahtar dizisindeki numaralar kara listede mi (NumPy bool dizisi)"""
+        return self._keys.contains_keys(keys)
+
+    def lookup(self, phone: str) -> Optional[Dict]:
+        """Kara listedeyse kayıt detaylarını döndür"""
+        return self.lookup_key(e164_key(phone))
+
+    def lookup_key(self, key: Optional[int]) -> Optional[Dict]:
+        """lookup'ın E.164 anahtarıyla çağrılan hâli"""
+        if key is None or key not in self._keys:
+            return None
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT risk_level, reported_count, last_reported, source "
+                "FROM phone_blacklist WHERE phone_number = ?",
+                (str(key),),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "phone_number": str(key),
+            "risk_level": row[0],
+            "reported_count": row[1],
+            "last_reported": row[2],
+            "source": row[3],
+        }
+
+    def add(self, phone: str, risk_level: int = 80, source: str = "manual") -> bool:
+        """Tek numara ekle (varsa şikayet sayısı artar)"""
+        return self.bulk_import([(phone, risk_level, source)]) == 1
+
+    def bulk_import(self, rows: Iterable[Tuple[str, int, str]]) -> int:
+        """(numara, risk_level, source) satırlarını toplu içe aktar.
+
+        Satırlar IMPORT_BATCH_SIZE'lık transaction'larla yazılır; geçersiz
+        numaralar atlanır. İçe aktarılan satır sayısını döndürür.
+        """
+        now = datetime.now().isoformat()
+        imported = 0
+        with self._lock:
+            conn = self._connect()
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(f"PRAGMA cache_size=-{IMPORT_CACHE_KB}")
+            try:
+                batch = []
+                for phone, risk_level, source in rows:
+                    key = e164_key(phone)
+                    if key is None:
+                        continue
+                    batch.append((key, risk_level, source))
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        imported += self._write_batch(conn, batch, now)
+                        batch = []
+                if batch:
+                    imported += self._write_batch(conn, batch, now)
+            finally:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA cache_size=-2000")
+        if imported:
+            self.publish()
+        return imported
+
+    def _write_batch(self, conn: sqlite3.Connection, batch, now: str) -> int:
+        # Anahtar sırasıyla yazmak B-tree sayfa erişimlerini sıralı hale getirir (~2x)
+        batch.sort()
+        with conn:
+            conn.executemany(UPSERT_SQL, ((str(key), risk, now, source) for key, risk, source in batch))
+        for key, _, _ in batch:
+            self._keys.add(key)
+        self.generation += 1
+        return len(batch)
+
+
+def read_import_file(path: str, risk_level: int, source: str) -> Iterator[Tuple[str, int, str]]:
+    """CSV (phone_number[,risk_level[,source]]) veya satır başına bir numara"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].strip().lower() == "phone_number":
+                continue
+            row_risk = int(row[1]) if len(row) > 1 and row[1].strip().isdigit() else risk_level
+            row_source = row[2].strip() if len(row) > 2 and row[2].strip() else source
+            yield row[0].strip(), row_risk, row_source
+
+
+_blacklist: Optional[PhoneBlacklist] = None
+_blacklist_lock = threading.Lock()
+
+
+def get_phone_blacklist() -> PhoneBlacklist:
+    """Süreç genelindeki kara liste (ilk kullanımda yüklenir)"""
+    global _blacklist
+    if _blacklist is None:
+        with _blacklist_lock:
+            if _blacklist is None:
+                _blacklist = PhoneBlacklist(shared=get_shared_tables())
+    return _blacklist
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telefon kara listesi yönetimi")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite veritabanı")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = sub.add_parser("import", help="CSV / numara listesi içe aktar")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--risk-level", type=int, default=80)
+    import_cmd.add_argument("--source", default="import")
+
+    sub.add_parser("stats", help="Kara liste istatistikleri")
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+    blacklist = PhoneBlacklist(args.db, shared=get_shared_tables())
+
+    if args.command == "import":
+        count = blacklist.bulk_import(read_import_file(args.path, args.risk_level, args.source))
+        elapsed = time.perf_counter() - started
+        print(f"✅ {count:,} numara içe aktarıldı ({elapsed:.1f}s, {count / max(elapsed, 1e-9):,.0f} satır/s)")
+    print(f"📞 Kara listede {len(blacklist):,} numara ({args.db})", file=sys.stderr)
+    status = blacklist.status()
+    if status["shared"]:
+        print(f"🗂️  Paylaşılan tablo: {status['shared_path']}", file=sys.stderr)
+    elif status["shared_error"]:
+        print(f"⚠️  Paylaşılan tablo yayınlanamadı: {status['shared_error']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Patterna Shield Mini - Telefon Numarası Kanonikleştirme
+=======================================================
+
+Numaralar E.164 biçiminde tek bir tam sayı anahtara çevrilir (ülke kodu +
+ulusal numara; "+", "00" ve baştaki 0 olmadan). "0532 123 45 67",
+"+90 (532) 123-45-67", "905321234567" ve "5321234567" aynı anahtara,
+905321234567'ye çevrilir. Kara liste (phone_blacklist.py) bu anahtarı
+saklar. Şüpheli prefix'ler de ham metinle değil anahtarla karşılaştırılır:
+"0 850 ..." gibi boşluklu yazım artık kaçmaz, "0850" ve "+90850" aynı
+prefix'tir.
+
+Türkiye numaraları, ulusal numaranın ilk üç hanesiyle prefix tablosundan
+sınıflandırılır: mobil (ve operatör), sabit hat (il alan kodları), 0800,
+0850, 0900 ve tahsis edilmemiş aralıklar. Operatör, aralığın ilk tahsis
+edildiği operatördür. Taşınan numaralarda güncel operatör farklı olabilir.
+
+Toplu yol: `e164_keys` ve `classify_keys` aynı kuralları NumPy dizi
+işlemleriyle uygular. Karakter kodları sütun sütun işlendiğinden Python'da
+numara başına döngü yoktur. NumPy opsiyoneldir ve sadece toplu yol
+kullanıldığında import edilir; tekil sorgu yolu ona bağlı değildir.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+# Numara içinde yok sayılan ayırıcılar ve kabul edilen en uzun yazım
+SEPARATORS = "+-() .\t"
+MAX_PHONE_CHARS = 32
+
+_SEPARATORS = str.maketrans("", "", SEPARATORS)
+
+# Türkiye anahtar aralığı: 90 + 10 haneli ulusal numara
+TR_BASE = 900_000_000_000
+TR_END = 910_000_000_000
+
+# Numara sınıfları (toplu yolda uint8 kodları)
+INVALID, MOBILE, GEOGRAPHIC, TOLL_FREE, CORPORATE, PREMIUM, UNASSIGNED, INTERNATIONAL = range(8)
+KIND_NAMES = ("invalid", "mobile", "geographic", "toll_free", "corporate", "premium", "unassigned", "international")
+KIND_LABELS = (
+    "Geçersiz", "Mobil", "Sabit hat", "Ücretsiz hat (0800)", "Kurumsal numara (0850)",
+    "Ücretli hat (0900)", "Tahsis edilmemiş aralık", "Yurt dışı numara",
+)
+
+# Mobil operatörler (0 = bilinmiyor)
+OPERATOR_NAMES = ("", "Turkcell", "Vodafone", "Türk Telekom")
+TURKCELL, VODAFONE, TURK_TELEKOM = 1, 2, 3
+
+# İl alan kodları (İstanbul iki kodlu: 212 Avrupa, 216 Anadolu)
+GEOGRAPHIC_CODES = (
+    212, 216, 222, 224, 226, 228, 232, 236, 242, 246, 248, 252, 256, 258, 262, 264, 266, 272,
+    274, 276, 282, 284, 286, 288,
+    312, 318, 322, 324, 326, 328, 332, 338, 342, 344, 346, 348, 352, 354, 356, 358, 362, 364,
+    366, 368, 370, 372, 374, 376, 378, 380, 382, 384, 386, 388,
+    412, 414, 416, 422, 424, 426, 428, 432, 434, 436, 438, 442, 446, 452, 454, 456, 458, 462,
+    464, 466, 472, 474, 476, 478, 482, 484, 486, 488,
+)
+
+MOBILE_OPERATORS = {
+    **{code: TURKCELL for code in range(530, 540)},
+    **{code: VODAFONE for code in range(540, 550)},
+    **{code: TURK_TELEKOM for code in (501, 505, 506, 507, 551, 552, 553, 554, 555, 559)},
+}
+
+
+def _build_prefix_tables() -> Tuple[bytes, bytes]:
+    # Ulusal numaranın ilk üç hanesi (000-999) -> sınıf / operatör
+    kinds = bytearray([UNASSIGNED]) * 1000
+    operators = bytearray(1000)
+    for code in range(500, 600):
+        kinds[code] = MOBILE
+    for code, operator in MOBILE_OPERATORS.items():
+        operators[code] = operator
+    for code in GEOGRAPHIC_CODES:
+        kinds[code] = GEOGRAPHIC
+    kinds[800] = TOLL_FREE
+    kinds[850] = CORPORATE
+    kinds[900] = PREMIUM
+    return bytes(kinds), bytes(operators)
+
+
+KIND_TABLE, OPERATOR_TABLE = _build_prefix_tables()
+
+
+def e164_key(phone: str) -> Optional[int]:
+    """Numarayı E.164 tam sayı anahtarına çevir (geçersizse None)
+
+    "+" veya "00" ile başlayan numaralar ülke kodunu içerir. Diğerleri
+    Türkiye numarası kabul edilir: 0XXXXXXXXXX, XXXXXXXXXX, 90XXXXXXXXXX.
+    Bunlara uymayan 7-15 haneli numaralar "+" olmadan yazılmış ülke kodlu
+    numara sayılır.
+    """
+    if len(phone) > MAX_PHONE_CHARS:
+        return None
+    digits = phone.translate(_SEPARATORS)
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    if phone.lstrip(" \t").startswith("+"):
+        international = digits
+    elif digits.startswith("00"):
+        international = digits[2:]
+    else:
+        length = len(digits)
+        if length == 12 and digits.startswith("90"):
+            return int(digits)
+        if length == 11 and digits[0] == "0":
+            return TR_BASE + int(digits)
+        if length == 10:
+            return TR_BASE + int(digits) if digits[0] != "0" else None
+        international = digits
+    if 7 <= len(international) <= 15 and international[0] != "0":
+        return int(international)
+    return None
+
+
+def classify(key: Optional[int]) -> Tuple[int, int]:
+    """Anahtarın (sınıf, operatör) kodları"""
+    if not key:
+        return INVALID, 0
+    if TR_BASE <= key < TR_END:
+        code = (key - TR_BASE) // 10_000_000
+        return KIND_TABLE[code], OPERATOR_TABLE[code]
+    # 90 ile başlayan ama 12 hane olmayan: eksik / fazla haneli Türkiye numarası
+    return (INVALID if str(key).startswith("90") else INTERNATIONAL), 0
+
+
+def describe(key: Optional[int]) -> str:
+    """Sınıf etiketi (mobil numaralarda operatörle)"""
+    kind, operator = classify(key)
+    if operator:
+        return f"{KIND_LABELS[kind]} ({OPERATOR_NAMES[operator]})"
+    return KIND_LABELS[kind]
+
+
+def prefix_digits(prefix: str) -> Optional[str]:
+    """Kural dosyasındaki prefix'i anahtarın baş hanelerine çevir
+
+    "+90850", "0090850", "0850" ve "850" -> "90850". "+" / "00" ile
+    başlamayanlar Türkiye numarası prefix'i kabul edilir.
+    """
+    text = prefix.strip()
+    digits = text.translate(_SEPARATORS)
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    if text.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    else:
+        digits = "90" + digits[1:] if digits[0] == "0" else "90" + digits
+    if not digits or digits[0] == "0" or len(digits) > 15:
+        return None
+    return digits
+
+
+class PhonePrefixes:
+    """Şüpheli numara prefix'leri (aynı haneye çıkan yazımlar tek prefix sayılır)"""
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, prefixes: Iterable[str]):
+        entries = {}
+        for prefix in prefixes:
+            digits = prefix_digits(prefix)
+            if digits is None:
+                raise ValueError(f"Geçersiz telefon prefix'i: {prefix!r}")
+            entries.setdefault(digits, prefix)
+        # (baş haneler, kural dosyasındaki yazım)
+        self._entries: Tuple[Tuple[str, str], ...] = tuple(entries.items())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def match(self, key: Optional[int]) -> List[str]:
+        """Anahtarın eşleştiği prefix'ler (kural dosyasındaki yazımlarıyla)"""
+        if not key or not self._entries:
+            return []
+        text = str(key)
+        return [prefix for digits, prefix in self._entries if text.startswith(digits)]
+
+    def count_keys(self, keys):
+        """Anahtar dizisindeki her numaranın eşleştiği prefix sayısı (NumPy)"""
+        np = load_numpy()
+        counts = np.zeros(len(keys), dtype=np.int16)
+        if not self._entries:
+            return counts
+        lengths = key_lengths(keys)
+        for digits, _ in self._entries:
+            drop = np.maximum(lengths - len(digits), 0)
+            counts += (lengths >= len(digits)) & (keys // _pow10()[drop] == int(digits))
+        return counts
+
+
+# ---------------------------------------------------------------------------
+# Toplu (NumPy) yol
+# ---------------------------------------------------------------------------
+
+# Bir seferde işlenen numara sayısı (ara diziler işlemci önbelleğinde kalır)
+BATCH_CHUNK = 65_536
+
+_numpy = None
+_POW10 = None
+
+
+def load_numpy():
+    """NumPy'yi ilk kullanımda import et (tekil yol ve başlangıç ona bağlı değil)"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError as e:  # opsiyonel bağımlılık
+            raise ImportError("Toplu telefon skorlama için 'pip install numpy' gerekli") from e
+        _numpy = numpy
+    return _numpy
+
+
+def _pow10():
+    global _POW10
+    if _POW10 is None:
+        np = load_numpy()
+        _POW10 = 10 ** np.arange(19, dtype=np.int64)
+    return _POW10
+
+
+def key_lengths(keys):
+    """Anahtarların hane sayısı (0 -> 0)"""
+    np = load_numpy()
+    return np.searchsorted(_pow10(), keys, side="right").astype(np.int64)
+
+
+# Karakter sınıfları (toplu yol): kodu 128 ve üstü olanlar geçersiz sayılır
+_BAD, _DIGIT, _SEPARATOR, _BLANK, _PAD = range(5)
+
+
+def _build_char_classes() -> bytes:
+    classes = bytearray([_BAD]) * 129
+    for code in range(ord("0"), ord("9") + 1):
+        classes[code] = _DIGIT
+    for ch in SEPARATORS:
+        classes[ord(ch)] = _SEPARATOR
+    classes[ord(" ")] = classes[ord("\t")] = _BLANK
+    classes[0] = _PAD                   # dizinin dolgu karakteri (metin sonu)
+    return bytes(classes)
+
+
+CHAR_CLASSES = _build_char_classes()
+
+
+def _chunk_keys(codes, np):
+    """(numara, karakter) kod matrisi -> anahtarlar (e164_key ile aynı kurallar)"""
+    rows = np.arange(codes.shape[0])
+    classes = np.frombuffer(CHAR_CLASSES, dtype=np.uint8)[np.minimum(codes, 128)]
+    pad = classes == _PAD
+    # Metin içindeki NUL dolgu sayılmaz: dolgudan sonra dolgu dışı karakter gelemez
+    valid = (classes != _BAD).all(axis=1) & ~(pad[:, :-1] & ~pad[:, 1:]).any(axis=1)
+    # İlk boşluk / tab dışı karakter "+" ise numara ülke kodunu içerir
+    plus = codes[rows, (classes < _BLANK).argmax(axis=1)] == ord("+")
+
+    # Sütun sütun Horner: hane ise value = value * 10 + hane, değilse değişmez
+    is_digit = np.ascontiguousarray((classes == _DIGIT).T)
+    digits = np.ascontiguousarray(codes.T).astype(np.int64) - ord("0")
+    value = np.zeros(len(rows), dtype=np.int64)
+    for column_digit, column_value in zip(is_digit, digits):
+        value = np.where(column_digit, value * 10 + column_value, value)
+    length = is_digit.sum(axis=0, dtype=np.int64)
+
+    pow10 = _pow10()
+    # Baştaki sıfırlar value'da kaybolur ama ilk hanelerin sayısal değeri korunur ("05" -> 5)
+    first = value // pow10[np.clip(length - 1, 0, 18)]
+    first_two = value // pow10[np.clip(length - 2, 0, 18)]
+    third = value // pow10[np.clip(length - 3, 0, 18)]
+
+    national = ~plus & ((first_two != 0) | (length < 2))
+    international = np.where(plus, length, length - 2)
+    international_ok = (~national & (international >= 7) & (international <= 15)
+                        & (np.where(plus, first, third) != 0))
+    tr_full = national & (length == 12) & (first_two == 90)
+    tr_trunk = national & (length == 11) & (first == 0)
+    tr_short = national & (length == 10)
+    other = national & ~tr_full & ~tr_trunk & ~tr_short & (length >= 7) & (length <= 15) & (first != 0)
+
+    keys = np.where(international_ok | tr_full | other, value, 0)
+    keys = np.where(tr_trunk | (tr_short & (first != 0)), TR_BASE + value, keys)
+    return np.where(valid, keys, 0)
+
+
+def e164_keys(phones):
+    """Numara dizisi / listesi -> int64 anahtar dizisi (geçersiz numaralar 0)"""
+    np = load_numpy()
+    count = len(phones)
+    keys = np.zeros(count, dtype=np.int64)
+    # Bir fazla sütun: son sütun doluysa yazım MAX_PHONE_CHARS'tan uzundur (kırpılmıştır)
+    width = MAX_PHONE_CHARS + 1
+    for start in range(0, count, BATCH_CHUNK):
+        text = np.asarray(phones[start:start + BATCH_CHUNK], dtype=f"<U{width}")
+        codes = text.view(np.uint32).reshape(len(text), width)
+        # Metinler sola yaslıdır: en uzun numaradan sonraki sütunlar boştur
+        used = int(np.count_nonzero(codes.any(axis=0)))
+        keys[start:start + len(text)] = _chunk_keys(codes[:, :min(used + 1, width)], np)
+    return keys
+
+
+def classify_keys(keys) -> Tuple:
+    """Anahtar dizisi -> (sınıf, operatör) uint8 dizileri (classify ile aynı)"""
+    np = load_numpy()
+    kind_table = np.frombuffer(KIND_TABLE, dtype=np.uint8)
+    operator_table = np.frombuffer(OPERATOR_TABLE, dtype=np.uint8)
+    turkish = (keys >= TR_BASE) & (keys < TR_END)
+    code = np.where(turkish, (keys - TR_BASE) // 10_000_000, 0)
+    kinds = np.where(turkish, kind_table[code], INTERNATIONAL).astype(np.uint8)
+    operators = np.where(turkish, operator_table[code], 0).astype(np.uint8)
+    lengths = key_lengths(keys)
+    wrong_length = ~turkish & (keys // _pow10()[np.clip(lengths - 2, 0, 18)] == 90)
+    kinds[(keys <= 0) | wrong_length] = INVALID
+    return kinds, operators
@@ -0,0 +1,215 @@
+"""
+Patterna Shield Mini - Karar Kayıt Yazıcısı
+===========================================
+
+Her karar denetim ve yeniden eğitim için `fraud_reports` tablosuna
+(şema: FULL_SYSTEM_OVERVIEW.py) yazılır. İstek işleyicileri veritabanına
+dokunmaz: kayıt sınırlı bir kuyruğa eklenir (~0.3µs), arka plandaki yazıcı
+thread'i kuyruğu toplu transaction'larla SQLite'a (WAL) boşaltır.
+
+- batch_size      : bir transaction'daki en fazla satır; kuyruk bu boyuta
+                    ulaşınca beklemeden yazılır
+- flush_interval  : kuyruk dolmasa da en geç bu sürede (sn) bir yazılır
+- queue_size      : bellekte bekleyebilecek en fazla kayıt
+- policy          : kuyruk doluyken ne yapılacağı
+    drop_newest   - yeni kayıt atılır (varsayılan; istek asla beklemez)
+    drop_oldest   - en eski bekleyen kayıt atılır
+    block         - yer açılana kadar en fazla block_timeout sn beklenir,
+                    sonra yeni kayıt atılır (kayıp yerine gecikme).
+                    Event loop thread'inden gelen kayıtlar beklemez
+                    (beklemek worker'ın tüm bağlantılarını dondurur),
+                    drop_newest gibi atılır
+Atılan kayıtlar `dropped` sayacında görülür.
+
+Varsayılan veritabanı kara listeyle aynı dosyadır (phone_blacklist.py,
+PATTERNA_DATA_DIR / PATTERNA_DB_PATH).
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+from phone_blacklist import DEFAULT_DB_PATH
+
+POLICIES = ("drop_newest", "drop_oldest", "block")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fraud_reports (
+    id INTEGER PRIMARY KEY,
+    message_hash VARCHAR(64),
+    sender_phone VARCHAR(20),
+    risk_score INTEGER,
+    is_fraud BOOLEAN,
+    detection_method VARCHAR(50),
+    created_at TIMESTAMP,
+    ai_confidence FLOAT
+)
+"""
+
+# Zaman damgası SQLite içinde (C tarafında) biçimlendirilir; yazıcı thread'i
+# satır başına Python işi yapmaz, GIL'i istek thread'lerine bırakır
+INSERT_SQL = """
+INSERT INTO fraud_reports (message_hash, sender_phone, risk_score, is_fraud, detection_method, created_at)
+VALUES (?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%f', ?, 'unixepoch', 'localtime'))
+"""
+
+# (message_hash, sender_phone, risk_score, is_fraud, detection_method, created_at[unix])
+Report = Tuple[Optional[str], Optional[str], int, bool, str, float]
+
+
+class ReportWriter:
+    """Sınırlı kuyruk + arka plan thread'i ile toplu SQLite yazıcısı"""
+
+    def __init__(self, db_path: Optional[str] = None, batch_size: int = 500,
+                 flush_interval: float = 1.0, queue_size: int = 100_000,
+                 policy: str = "drop_newest", block_timeout: float = 0.05):
+        if policy not in POLICIES:
+            raise ValueError(f"Geçersiz kuyruk politikası: {policy} ({', '.join(POLICIES)})")
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.queue_size = max(1, queue_size)
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        # deque.append / popleft thread-safe; drop_oldest için maxlen yeterli
+        self._queue: deque = deque(maxlen=self.queue_size if policy == "drop_oldest" else None)
+        self._wakeup = threading.Event()
+        self._space = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Sayaçlar sıcak yolda kilitsiz güncellenir (yaklaşık değerlerdir)
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.loop_drops = 0  # block politikasında event loop'ta beklenmeden atılanlar
+        self.flushes = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    # İstek tarafı
+
+    def submit(self, report: Report) -> bool:
+        """Kaydı kuyruğa ekle; yazıcı çalışmıyorsa veya kayıt atıldıysa False"""
+        if not self._running:
+            return False
+        queue = self._queue
+        if len(queue) >= self.queue_size:
+            if self.policy == "drop_oldest":
+                self.dropped += 1  # maxlen'li deque en eski kaydı kendisi düşürür
+            elif self.policy == "drop_newest" or not self._wait_for_space():
+                self.dropped += 1
+                return False
+        queue.append(report)
+        self.submitted += 1
+        if len(queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _wait_for_space(self) -> bool:
+        # block: yazıcı kuyruğu boşaltana kadar en fazla block_timeout bekle
+        self._wakeup.set()
+        if _on_event_loop():
+            self.loop_drops += 1
+            return False
+        with self._space:
+            return self._space.wait_for(lambda: len(self._queue) < self.queue_size, self.block_timeout)
+
+    # Yazıcı tarafı
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        conn = self._connect()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(conn,), name="report-writer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Yeni kayıtları durdur, kuyruğun kalanını yaz"""
+        if self._thread is None:
+            return
+        self._running = False
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(SCHEMA)
+        conn.commit()
+        return conn
+
+    def _run(self, conn: sqlite3.Connection) -> None:
+        try:
+            while self._running:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                self._drain(conn)
+            self._drain(conn)
+        finally:
+            conn.close()
+
+    def _drain(self, conn: sqlite3.Connection) -> None:
+        queue = self._queue
+        while queue:
+            batch = []
+            try:
+                for _ in range(self.batch_size):
+                    batch.append(queue.popleft())
+            except IndexError:
+                pass
+            if self.policy == "block":
+                with self._space:
+                    self._space.notify_all()
+            self._write(conn, batch)
+
+    def _write(self, conn: sqlite3.Connection, rows: list) -> None:
+        try:
+            with conn:
+                conn.executemany(INSERT_SQL, rows)
+            self.written += len(rows)
+            self.flushes += 1
+        except sqlite3.Error as e:
+            # Veritabanı geçici olarak kilitli / dolu: bu batch kaybedilir, yazıcı durmaz
+            self.errors += 1
+            self.dropped += len(rows)
+            self.last_error = str(e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "db_path": self.db_path,
+            "policy": self.policy,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            "queue_size": self.queue_size,
+            "queued": len(self._queue),
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "loop_drops": self.loop_drops,
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+def _on_event_loop() -> bool:
+    """Çağıran thread'de çalışan bir asyncio event loop'u var mı?"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
@@ -0,0 +1,424 @@
+"""
+Patterna Shield Mini - Kural Seti
+=================================
+
+Keyword listeleri, şüpheli telefon prefix'leri, şüpheli domain'ler, puan
+ağırlıkları ve karar eşikleri `rules.json` dosyasında tutulur. Dosya
+değiştirilemez (immutable) bir `RuleSnapshot`'a derlenir: keyword otomatı,
+domain indeksi ve telefon prefix'leri (E.164 anahtar haneleri) yükleme
+sırasında bir kez kurulur.
+
+Yeniden yükleme (admin endpoint'i veya dosya izleyici) yeni snapshot'ı
+arka planda tamamen kurar ve tek bir referans ataması ile değiştirir.
+Okuyucular kilit almaz: her istek başta `RULE_STORE.current`'ı bir kez
+okur ve işlemin sonuna kadar aynı snapshot'ı kullanır; yarım güncellenmiş
+kural seti görülemez. Hatalı dosya yüklenmez, eski snapshot geçerli kalır.
+
+Derlenmiş tablolar (keyword otomatı + domain indeksi) içerik hash'iyle
+kural dosyasının yanındaki `__pycache__/` dizinine yazılır. Aynı kurallarla
+açılan sonraki süreçler (diğer worker'lar, sıfırdan ölçeklenen pod'lar)
+otomatı yeniden kurmaz, hazır hâlini yükler. Önbellek `.pyc` dosyaları
+gibi bir hızlandırmadır: okunamaz veya bozuksa sessizce yeniden derlenir;
+PATTERNA_RULES_CACHE=0 ile kapatılır. Dosya pickle değildir (JSON durum +
+ham diziler) ve sadece bu kullanıcıya ait, başkalarının yazamadığı bir
+dizinden okunur.
+
+PATTERNA_SHARED_TABLES=1 ile derlenmiş tablolar (otomatın geçiş tablosu,
+domain hash dizileri, domain listesi) worker'ların özel belleğine
+yüklenmez; içerik hash'iyle paylaşılan bellekte bir kez yayınlanır ve
+worker'lar salt okunur eşler (shared_tables.py). Kural değişikliğini
+izleyicisiyle gören worker'lardan ilki tabloyu kurar, diğerleri eşler.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+from keyword_matcher import KeywordMatcher
+from phone_numbers import PhonePrefixes
+from shared_tables import (
+    MappedTable, SharedTables, StringTable, get_shared_tables, pack_strings, private_directory, write_table,
+)
+from text_normalizer import keyword_variants
+from url_reputation import DomainIndex, HashedDomainIndex
+
+DEFAULT_RULES_PATH = os.environ.get(
+    "PATTERNA_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules.json")
+)
+
+KEYWORD_CATEGORIES = ("fraud", "urgency", "money")
+
+# Dosyada verilmeyen ağırlık / eşikler için varsayılanlar
+DEFAULT_WEIGHTS = {
+    # Mesaj
+    "fraud_keyword": 15,      # bulunan her şüpheli kelime
+    "link": 25,
+    "phone_number": 20,
+    "urgency": 30,
+    "money": 25,
+    "text_classifier": 40,    # olasılıkla çarpılır (text_classifier.py)
+    # Telefon
+    "invalid_phone_format": 50,
+    "suspicious_prefix": 40,
+    "blacklisted_phone": 70,
+    # URL
+    "insecure_protocol": 30,
+    "suspicious_domain": 60,
+    "ip_address": 70,
+    "threat_feed": 80,        # tehdit listesindeki URL (threat_feed.py)
+    # Gönderen
+    "sender_velocity": 60,    # kritik hız; şüpheli hızda yarısı (sender_velocity.py)
+}
+DEFAULT_THRESHOLDS = {"message": 60, "phone": 50, "url": 50}
+# Gönderen başına dakikadaki mesaj sınırları (0 -> o kademe kapalı)
+DEFAULT_SENDER_VELOCITY = {"suspicious_per_minute": 30, "critical_per_minute": 300}
+# Sınıflandırıcı puanının eklendiği en düşük dolandırıcılık olasılığı (yüzde)
+DEFAULT_TEXT_CLASSIFIER = {"min_probability": 50}
+DEFAULT_PIPELINE = {"prefilter": 1, "early_exit": 1}   # 0 = kapalı (scoring.score_message_rules)
+DEFAULT_MAX_MESSAGE_URLS = 5
+
+# Derlenmiş tablo önbelleği (PATTERNA_RULES_CACHE_DIR verilmezse kural dosyasının yanındaki __pycache__)
+RULES_CACHE_ENABLED = os.environ.get("PATTERNA_RULES_CACHE", "1") != "0"
+RULES_CACHE_DIR = os.environ.get("PATTERNA_RULES_CACHE_DIR")
+# KeywordMatcher / DomainIndex iç yapısı değişince artırılmalı (eski dosyalar kullanılmaz)
+COMPILED_FORMAT = 3
+# Dizinde tutulacak en fazla derlenmiş kural dosyası (en yeniler kalır)
+COMPILED_KEEP = 4
+
+
+class RuleError(ValueError):
+    """Kural dosyası okunamadı veya geçersiz"""
+
+
+@dataclass(frozen=True)
+class RuleSnapshot:
+    """Derlenmiş, değiştirilemez kural seti"""
+    version: str
+    fingerprint: str          # içerik hash'i (sürüm etiketi değişmese de farklıdır)
+    generation: int           # süreç içinde her başarılı yüklemede artar
+    source: str
+    loaded_at: float
+    fraud_keywords: Tuple[str, ...]
+    urgency_words: Tuple[str, ...]
+    money_words: Tuple[str, ...]
+    suspicious_prefixes: Tuple[str, ...]
+    phone_prefixes: PhonePrefixes     # suspicious_prefixes'in anahtar haneleri
+    suspicious_domains: Sequence[str]   # paylaşılan modda StringTable
+    weights: Mapping[str, int]
+    thresholds: Mapping[str, int]
+    max_message_urls: int
+    sender_velocity: Mapping[str, int]
+    text_classifier: Mapping[str, int]
+    pipeline: Mapping[str, int]
+    matcher: KeywordMatcher
+    domain_index: Union[DomainIndex, HashedDomainIndex]
+    shared: bool = False              # tablolar paylaşılan bellekten eşlendi
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "generation": self.generation,
+            "source": self.source,
+            "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.loaded_at)),
+            "keywords": {name: len(words) for name, words in self.matcher.categories.items()},
+            "suspicious_prefixes": len(self.suspicious_prefixes),
+            "suspicious_domains": len(self.suspicious_domains),
+            "shared_tables": self.shared,
+        }
+
+
+def _string_list(data: Dict, key: str, where: str = "") -> Tuple[str, ...]:
+    value = data.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise RuleError(f"'{where}{key}' bir metin listesi olmalı")
+    return tuple(v for v in value if v.strip())
+
+
+def _int_map(data: Dict, key: str, defaults: Dict[str, int]) -> Mapping[str, int]:
+    value = data.get(key, {})
+    if not isinstance(value, dict):
+        raise RuleError(f"'{key}' bir nesne olmalı")
+    unknown = set(value) - set(defaults)
+    if unknown:
+        raise RuleError(f"Bilinmeyen '{key}' alanı: {', '.join(sorted(unknown))}")
+    merged = dict(defaults)
+    for name, number in value.items():
+        if not isinstance(number, int) or isinstance(number, bool) or number < 0:
+            raise RuleError(f"'{key}.{name}' negatif olmayan bir tamsayı olmalı")
+        merged[name] = number
+    return MappingProxyType(merged)
+
+
+def _compiled_cache_dir(source: str) -> Optional[str]:
+    if not RULES_CACHE_ENABLED or source == "<memory>":
+        return None
+    return RULES_CACHE_DIR or os.path.join(os.path.dirname(os.path.abspath(source)), "__pycache__")
+
+
+def _load_compiled(path: str, fingerprint: str) -> Optional[Tuple[KeywordMatcher, DomainIndex]]:
+    try:
+        table = MappedTable(path)
+        if table.meta.get("fingerprint") != fingerprint:
+            return None
+        keyword_table = None
+        if "keyword_table" in table:
+            keyword_table = array("i")
+            keyword_table.frombytes(table.array("keyword_table").cast("B"))
+        matcher = KeywordMatcher.from_shared_state(json.loads(bytes(table.array("matcher"))), keyword_table)
+        domain_index = DomainIndex.load(bytes(table.array("domain_rules")))
+    except (OSError, ValueError, KeyError, TypeError):
+        # Yok / yarım / eski formatta dosya: yeniden derlenir ve üzerine yazılır
+        return None
+    return matcher, domain_index
+
+
+def _save_compiled(cache_dir: str, path: str, fingerprint: str, tables: Tuple[KeywordMatcher, DomainIndex]) -> None:
+    # Geçici dosya + os.replace: aynı anda açılan worker'lar yarım dosya görmez
+    matcher, domain_index = tables
+    state, keyword_table = matcher.shared_state()
+    arrays = {"matcher": json.dumps(state, ensure_ascii=False).encode("utf-8"), "domain_rules": domain_index.dump()}
+    if keyword_table is not None:
+        arrays["keyword_table"] = keyword_table
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=".rules-", suffix=".tmp", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_table(f, {"fingerprint": fingerprint, "format": COMPILED_FORMAT}, arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # Eski kural sürümlerinin (ve eski pickle biçiminin) dosyalarını temizle
+        compiled = sorted(
+            (entry for entry in os.scandir(cache_dir)
+             if entry.name.startswith("rules-") and entry.name.endswith((".tbl", ".pickle"))),
+            key=lambda entry: entry.stat().st_mtime_ns, reverse=True,
+        )
+        for entry in compiled[COMPILED_KEEP:]:
+            os.unlink(entry.path)
+    except OSError:
+        # Salt okunur dizin vb.: önbelleksiz devam
+        pass
+
+
+def _compile_tables(categories: Dict[str, Tuple[str, ...]], domains: Tuple[str, ...],
+                    fingerprint: str, cache_dir: Optional[str]) -> Tuple[KeywordMatcher, DomainIndex]:
+    """Keyword otomatı + domain indeksi (varsa diskteki derlenmiş hâlinden)"""
+    if cache_dir is not None:
+        try:
+            cache_dir = private_directory(cache_dir)
+        except OSError:
+            # Başka kullanıcının yazabildiği dizindeki dosyaya güvenilmez: önbelleksiz derlenir
+            cache_dir = None
+    if cache_dir is None:
+        return KeywordMatcher(categories, variants=keyword_variants), DomainIndex(domains)
+    path = os.path.join(cache_dir, f"rules-{fingerprint}.v{COMPILED_FORMAT}.tbl")
+    tables = _load_compiled(path, fingerprint)
+    if tables is None:
+        tables = KeywordMatcher(categories, variants=keyword_variants), DomainIndex(domains)
+        _save_compiled(cache_dir, path, fingerprint, tables)
+    return tables
+
+
+def _shared_rule_tables(shared: SharedTables, categories: Dict[str, Tuple[str, ...]], domains: Tuple[str, ...],
+                        fingerprint: str) -> Optional[Tuple[KeywordMatcher, HashedDomainIndex, StringTable]]:
+    """Keyword otomatı + domain indeksi + domain listesi, paylaşılan tablodan (bir kez kurulur)"""
+    name = f"rules-{fingerprint}.v{COMPILED_FORMAT}"
+
+    def build():
+        shared.prune("rules-", COMPILED_KEEP - 1)
+        state, table = KeywordMatcher(categories, variants=keyword_variants).shared_state()
+        domain_hashes, wildcard_hashes = HashedDomainIndex.from_index(DomainIndex(domains)).arrays()
+        offsets, data = pack_strings(domains)
+        arrays = {"matcher": json.dumps(state, ensure_ascii=False).encode("utf-8"),
+                  "domains": domain_hashes, "wildcards": wildcard_hashes,
+                  "domain_offsets": offsets, "domain_data": data}
+        if table is not None:
+            arrays["keyword_table"] = table
+        return {"fingerprint": fingerprint}, arrays
+
+    try:
+        mapped = shared.attach(name, build)
+        matcher = KeywordMatcher.from_shared_state(
+            json.loads(bytes(mapped.array("matcher"))),
+            mapped.array("keyword_table") if "keyword_table" in mapped else None)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # Dizin yazılamıyor / dolu / güvensiz: bu worker özel kopyayla devam eder
+        shared.last_error = f"{name}: {e}"
+        return None
+    domain_index = HashedDomainIndex(mapped.array("domains"), mapped.array("wildcards"))
+    return matcher, domain_index, StringTable(mapped.array("domain_offsets"), mapped.array("domain_data"))
+
+
+def compile_rules(data: Any, source: str = "<memory>", generation: int = 0) -> RuleSnapshot:
+    """Kural sözlüğünü doğrula ve snapshot'a derle (dosyadan gelen kurallar önbelleklenir)"""
+    if not isinstance(data, dict):
+        raise RuleError("Kural dosyası bir JSON nesnesi olmalı")
+    keywords = data.get("keywords")
+    if not isinstance(keywords, dict):
+        raise RuleError("'keywords' alanı eksik")
+    missing = [name for name in KEYWORD_CATEGORIES if name not in keywords]
+    if missing:
+        raise RuleError(f"Eksik keyword kategorisi: {', '.join(missing)}")
+    categories = {name: _string_list(keywords, name, "keywords.") for name in KEYWORD_CATEGORIES}
+
+    max_urls = data.get("max_message_urls", DEFAULT_MAX_MESSAGE_URLS)
+    if not isinstance(max_urls, int) or isinstance(max_urls, bool) or max_urls < 1:
+        raise RuleError("'max_message_urls' pozitif bir tamsayı olmalı")
+
+    prefixes = _string_list(data, "suspicious_phone_prefixes")
+    try:
+        phone_prefixes = PhonePrefixes(prefixes)
+    except ValueError as e:
+        raise RuleError(f"'suspicious_phone_prefixes': {e}") from e
+
+    velocity = _int_map(data, "sender_velocity", DEFAULT_SENDER_VELOCITY)
+    if 0 < velocity["critical_per_minute"] < velocity["suspicious_per_minute"]:
+        raise RuleError("'sender_velocity.critical_per_minute' suspicious_per_minute'dan küçük olamaz")
+
+    classifier = _int_map(data, "text_classifier", DEFAULT_TEXT_CLASSIFIER)
+    if classifier["min_probability"] > 100:
+        raise RuleError("'text_classifier.min_probability' 0-100 aralığında olmalı")
+
+    pipeline = _int_map(data, "pipeline", DEFAULT_PIPELINE)
+    if any(value > 1 for value in pipeline.values()):
+        raise RuleError("'pipeline' alanları 0 veya 1 olmalı")
+
+    domains = _string_list(data, "suspicious_domains")
+    canonical = json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    fingerprint = hashlib.sha256(canonical).hexdigest()[:16]
+    shared = get_shared_tables() if source != "<memory>" else None
+    tables = _shared_rule_tables(shared, categories, domains, fingerprint) if shared is not None else None
+    if tables is not None:
+        matcher, domain_index, domains = tables
+    else:
+        matcher, domain_index = _compile_tables(categories, domains, fingerprint, _compiled_cache_dir(source))
+
+    return RuleSnapshot(
+        version=str(data.get("version", "0")),
+        fingerprint=fingerprint,
+        generation=generation,
+        source=source,
+        loaded_at=time.time(),
+        fraud_keywords=categories["fraud"],
+        urgency_words=categories["urgency"],
+        money_words=categories["money"],
+        suspicious_prefixes=prefixes,
+        phone_prefixes=phone_prefixes,
+        suspicious_domains=domains,
+        weights=_int_map(data, "weights", DEFAULT_WEIGHTS),
+        thresholds=_int_map(data, "thresholds", DEFAULT_THRESHOLDS),
+        max_message_urls=max_urls,
+        sender_velocity=velocity,
+        text_classifier=classifier,
+        pipeline=pipeline,
+        matcher=matcher,
+        domain_index=domain_index,
+        shared=tables is not None,
+    )
+
+
+def load_rules(path: Optional[str] = None, generation: int = 0) -> RuleSnapshot:
+    """Kural dosyasını oku ve derle"""
+    path = path or DEFAULT_RULES_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except OSError as e:
+        raise RuleError(f"Kural dosyası okunamadı: {e}") from e
+    except json.JSONDecodeError as e:
+        raise RuleError(f"Kural dosyası geçersiz JSON: {e}") from e
+    return compile_rules(data, source=path, generation=generation)
+
+
+class RuleStore:
+    """Geçerli snapshot'ı tutar; yeniden yüklemede atomik olarak değiştirir"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DEFAULT_RULES_PATH
+        self._file_state = self._stat()
+        self._snapshot = load_rules(self.path, generation=1)
+        self._reload_lock = threading.Lock()  # sadece yükleyiciler arasında
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def current(self) -> RuleSnapshot:
+        """Geçerli snapshot (kilitsiz; tek referans okuması)"""
+        return self._snapshot
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self) -> Tuple[RuleSnapshot, bool]:
+        """Dosyayı yeniden derle -> (geçerli snapshot, değişti mi)
+
+        İçerik aynıysa snapshot değiştirilmez (önbellek korunur). Hatalı
+        dosyada RuleError fırlatılır ve eski snapshot geçerli kalır.
+        """
+        with self._reload_lock:
+            file_state = self._stat()
+            current = self._snapshot
+            try:
+                snapshot = load_rules(self.path, generation=current.generation + 1)
+            except RuleError as e:
+                self.last_error = str(e)
+                raise
+            self._file_state = file_state
+            self.last_error = None
+            if snapshot.fingerprint == current.fingerprint:
+                return current, False
+            self._snapshot = snapshot
+            self.reloads += 1
+            return snapshot, True
+
+    def reload_if_changed(self) -> bool:
+        """Dosya değiştiyse yeniden yükle (dosya izleyici için)"""
+        if self._stat() == self._file_state:
+            return False
+        try:
+            return self.reload()[1]
+        except RuleError:
+            # Yarım yazılmış / hatalı dosya: eski kurallarla devam, sonraki turda tekrar denenir
+            return False
+
+    def start_watcher(self, interval: float) -> None:
+        """Dosyayı `interval` saniyede bir kontrol eden arka plan thread'i"""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name="rules-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self.current.info(),
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+            "watching": self._watcher is not None,
+        }
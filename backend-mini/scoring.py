@@ -0,0 +1,608 @@
+"""
+Patterna Shield Mini - Skorlama
+===============================
+
+Mesaj / telefon / URL risk puanlama mantığı, istek-yanıt modelleri ve
+süreç genelindeki kural seti, karar önbelleği ve karar kayıt yazıcısı.
+
+Bu modül FastAPI'ye bağlı değildir: HTTP API (main.py) yanında toplu
+skorlama CLI'ı (bulk_score.py) ve benchmark'lar da doğrudan bunu import
+eder; web çatısının import maliyetini (~150ms) ödemezler.
+"""
+
+from pydantic import BaseModel, Field, ValidationError
+from dataclasses import dataclass
+import re
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence
+from time import perf_counter_ns, time
+import os
+
+from campaign_index import CampaignIndex, CampaignMatch
+from message_features import MessageFeatures, extract_features
+from metrics import (
+    EXIT_DEGRADED, EXIT_LOOKUPS, EXIT_MODEL, EXIT_PREFILTER, EXIT_RULES, STAGE_PHONE_RISK, STAGE_TEXT_CLASSIFIER,
+    STAGE_URL_RISK, record_verdict,
+)
+from phone_blacklist import get_phone_blacklist
+from phone_numbers import (
+    INVALID, KIND_LABELS, MOBILE, classify, classify_keys, e164_key, e164_keys, load_numpy,
+)
+from report_writer import ReportWriter
+from rules import RuleSnapshot, RuleStore
+from sender_velocity import SenderVelocity
+from text_classifier import get_text_classifier
+from threat_feed import get_threat_feed
+from url_reputation import extract_host
+from verdict_cache import VerdictCache, message_hash
+
+# Request/Response modelleri
+class MessageAnalysisRequest(BaseModel):
+    message: str
+    sender_phone: Optional[str] = None
+
+class PhoneCheckRequest(BaseModel):
+    phone_number: str
+
+class URLCheckRequest(BaseModel):
+    url: str
+
+class AnalysisResponse(BaseModel):
+    is_fraud: bool
+    risk_score: int  # 0-100 arası
+    reasons: List[str]
+    analysis_type: str
+
+# Toplu analizde tek istekte kabul edilen en fazla mesaj
+MAX_BATCH_SIZE = 5000
+
+class BatchAnalysisRequest(BaseModel):
+    # Her eleman bir MessageAnalysisRequest; hatalı elemanlar tüm isteği düşürmez
+    messages: List[Any] = Field(..., max_length=MAX_BATCH_SIZE)
+
+class BatchItemResult(BaseModel):
+    index: int
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+class BatchAnalysisResponse(BaseModel):
+    total: int
+    failed: int
+    results: List[BatchItemResult]
+
+# Kural seti (keyword'ler, prefix'ler, domain'ler, ağırlıklar, eşikler) rules.json'dan
+# derlenir; dosya değişince veya /admin/rules/reload ile atomik olarak yenilenir
+RULE_STORE = RuleStore()
+
+# Karar önbelleği (PATTERNA_CACHE_MB=0 ile kapatılır)
+VERDICT_CACHE_MB = float(os.environ.get("PATTERNA_CACHE_MB", "64"))
+VERDICT_CACHE_TTL = float(os.environ.get("PATTERNA_CACHE_TTL", "600"))
+VERDICT_CACHE = VerdictCache(int(VERDICT_CACHE_MB * 2**20), VERDICT_CACHE_TTL) if VERDICT_CACHE_MB > 0 else None
+
+# Karar kaydı: her karar fraud_reports tablosuna arka planda, toplu yazılır
+# (PATTERNA_REPORTS=0 ile kapatılır)
+REPORT_WRITER = ReportWriter(
+    batch_size=int(os.environ.get("PATTERNA_REPORT_BATCH", "500")),
+    flush_interval=float(os.environ.get("PATTERNA_REPORT_FLUSH", "1.0")),
+    queue_size=int(os.environ.get("PATTERNA_REPORT_QUEUE", "100000")),
+    policy=os.environ.get("PATTERNA_REPORT_POLICY", "drop_newest"),
+) if os.environ.get("PATTERNA_REPORTS", "1") != "0" else None
+
+# Gönderen hızı: numara başına son penceredeki mesaj sayısı (PATTERNA_VELOCITY=0 ile kapatılır)
+SENDER_VELOCITY = SenderVelocity(
+    capacity=int(os.environ.get("PATTERNA_VELOCITY_SENDERS", "100000")),
+    window_seconds=float(os.environ.get("PATTERNA_VELOCITY_WINDOW", "60")),
+    buckets=int(os.environ.get("PATTERNA_VELOCITY_BUCKETS", "6")),
+) if os.environ.get("PATTERNA_VELOCITY", "1") != "0" else None
+
+# Kampanya indeksi: yakın kopya mesajları kampanyalarda toplar (PATTERNA_CAMPAIGNS=0 ile kapatılır)
+CAMPAIGN_INDEX = CampaignIndex(
+    capacity=int(os.environ.get("PATTERNA_CAMPAIGN_CAPACITY", "20000")),
+    ttl_seconds=float(os.environ.get("PATTERNA_CAMPAIGN_TTL", "21600")),
+    threshold=float(os.environ.get("PATTERNA_CAMPAIGN_SIMILARITY", "0.6")),
+) if os.environ.get("PATTERNA_CAMPAIGNS", "1") != "0" else None
+
+# Kısıtlı mod: aşırı yükte (admission.py) pahalı aşamalar atlanır (model, kampanya indeksi)
+# ve bu sırada hesaplanan kararlar önbelleğe yazılmaz
+DEGRADED = False
+
+def set_degraded(on: bool) -> None:
+    global DEGRADED
+    DEGRADED = on
+
+# Mesajda bulgu yoksa dönen gerekçe
+NO_FINDINGS_REASON = "Şüpheli içerik tespit edilmedi"
+
+def current_rules_version(rules: Optional[RuleSnapshot] = None) -> tuple:
+    """Kararları etkileyen kural + kara liste + tehdit listesi + model sürümü (hepsi monoton artar)"""
+    rules = rules or RULE_STORE.current
+    return (rules.generation, get_phone_blacklist().generation, get_threat_feed().generation,
+            get_text_classifier().generation)
+
+# Öğrenilmiş metin sınıflandırıcı (text_classifier.py; model dosyası yoksa atlanır)
+def classify_messages(messages: Sequence[str], folded: bool = False) -> Optional[List[float]]:
+    """Mesajların dolandırıcılık olasılıkları, tek seferde (model yoksa None)"""
+    classifier = get_text_classifier()
+    if classifier.model is None or not messages:
+        return None
+    start = perf_counter_ns()
+    probabilities = classifier.predict_folded(messages) if folded else classifier.predict(messages)
+    STAGE_TEXT_CLASSIFIER.observe_ns(perf_counter_ns() - start)
+    return probabilities
+
+# Mesaj skorlama hattı: ön filtre -> kurallar -> liste aramaları -> model.
+# Şüpheli özelliği olmayan mesaj ön filtreden temiz çıkar; puan tavana (100)
+# ulaşınca kalan aşamalar kararı değiştiremeyeceği için atlanır.
+class RuleScore(NamedTuple):
+    """Model aşamasına kadar hesaplanan mesaj puanı"""
+    score: int
+    reasons: List[str]
+    folded: Optional[str]   # model aşaması çalışacaksa katlanmış metin, hat bittiyse None
+
+def score_message_rules(message: str, features: Optional[MessageFeatures] = None,
+                        rules: Optional[RuleSnapshot] = None) -> RuleScore:
+    """Hattın model öncesi aşamaları (mesaj özellikleri bir kez çıkarılır)"""
+    score = 0
+    reasons = []
+    rules = rules or RULE_STORE.current
+    weights = rules.weights
+    early_exit = rules.pipeline["early_exit"]
+    
+    if features is None:
+        features = extract_features(message, rules.matcher)
+    keyword_hits = features.keyword_hits
+    
+    # 1. Ön filtre: keyword, link, telefon ve IP yoksa kurallar da model de çalışmaz
+    if rules.pipeline["prefilter"] and features.is_empty:
+        EXIT_PREFILTER.inc()
+        return RuleScore(0, reasons, None)
+    
+    # 2. Kurallar
+    found_keywords = keyword_hits["fraud"]
+    if found_keywords:
+        score += len(found_keywords) * weights["fraud_keyword"]
+        reasons.append(f"Şüpheli kelimeler: {', '.join(found_keywords[:3])}")
+    
+    if features.urls:
+        score += weights["link"]
+        reasons.append("Mesajda link bulunuyor")
+    link_reasons_at = len(reasons)
+    
+    if features.phones:
+        score += weights["phone_number"]
+        reasons.append("Mesajda telefon numarası var")
+    
+    if keyword_hits["urgency"]:
+        score += weights["urgency"]
+        reasons.append("Aciliyet ifadeleri kullanılmış")
+    
+    if keyword_hits["money"]:
+        score += weights["money"]
+        reasons.append("Para/ödeme ile ilgili kelimeler")
+    
+    if early_exit and score >= 100:
+        EXIT_RULES.inc()
+        return RuleScore(100, reasons, None)
+    
+    # 3. Liste aramaları: mesajdaki linklerin güvenlik analizi (en riskli linkin yarısı eklenir)
+    if features.urls:
+        url_score, url_reasons = max(
+            (check_url_safety(url, rules) for url in dict.fromkeys(features.urls[:rules.max_message_urls])),
+            key=lambda result: result[0]
+        )
+        if url_score:
+            score += url_score // 2
+            reasons[link_reasons_at:link_reasons_at] = [f"Mesajdaki link: {reason}" for reason in url_reasons]
+    
+    if early_exit and score >= 100:
+        EXIT_LOOKUPS.inc()
+        return RuleScore(100, reasons, None)
+    
+    # 4. Model aşaması (finish_message_score); kısıtlı modda atlanır
+    if DEGRADED:
+        EXIT_DEGRADED.inc()
+        return RuleScore(min(score, 100), reasons, None)
+    return RuleScore(score, reasons, features.folded)
+
+def finish_message_score(partial: RuleScore, fraud_probability: Optional[float],
+                         rules: Optional[RuleSnapshot] = None) -> tuple[int, List[str]]:
+    """Model aşaması: sınıflandırıcı olasılığını puana ekle"""
+    if partial.folded is None:
+        return min(partial.score, 100), partial.reasons
+    EXIT_MODEL.inc()
+    rules = rules or RULE_STORE.current
+    score, reasons = partial.score, partial.reasons
+    if fraud_probability is not None and fraud_probability * 100 >= rules.text_classifier["min_probability"]:
+        score += round(rules.weights["text_classifier"] * fraud_probability)
+        reasons = reasons + [f"Metin sınıflandırıcı: dolandırıcılık olasılığı %{fraud_probability * 100:.0f}"]
+    return min(score, 100), reasons
+
+# Risk puanlama fonksiyonu
+def calculate_risk_score(message: str, phone: str = None,
+                         features: Optional[MessageFeatures] = None,
+                         rules: Optional[RuleSnapshot] = None) -> tuple[int, List[str]]:
+    """Basit risk puanlama algoritması (tüm hat, tek mesaj)"""
+    rules = rules or RULE_STORE.current
+    partial = score_message_rules(message, features, rules)
+    fraud_probability = None
+    if partial.folded is not None:
+        probabilities = classify_messages([partial.folded], folded=True)
+        fraud_probability = probabilities[0] if probabilities else None
+    return finish_message_score(partial, fraud_probability, rules)
+
+def message_phone_result(message_result: tuple[int, List[str]], phone: Optional[str],
+                         rules: RuleSnapshot) -> Optional[tuple[int, List[str]]]:
+    """Gönderen numarası kontrolü (mesaj puanı tavandaysa karar değişmeyeceği için atlanır)"""
+    if not phone or (rules.pipeline["early_exit"] and message_result[0] >= 100):
+        return None
+    return check_phone_risk(phone, rules)
+
+# Telefon numarası risk kontrolü
+def check_phone_risk(phone: str, rules: Optional[RuleSnapshot] = None) -> tuple[int, List[str]]:
+    """Basit telefon numarası risk kontrolü (numara bir kez E.164 anahtarına çevrilir)"""
+    start = perf_counter_ns()
+    reasons = []
+    score = 0
+    rules = rules or RULE_STORE.current
+    weights = rules.weights
+    key = e164_key(phone)
+    
+    # Format / aralık kontrolü: sadece Türkiye mobil numaraları geçerli sayılır
+    kind, _ = classify(key)
+    if kind != MOBILE:
+        score += weights["invalid_phone_format"]
+        reasons.append("Geçersiz telefon formatı" if kind == INVALID else f"Mobil hat değil: {KIND_LABELS[kind]}")
+    
+    # Bilinen şüpheli prefix'ler (yazım biçiminden bağımsız, anahtar haneleriyle)
+    for prefix in rules.phone_prefixes.match(key):
+        score += weights["suspicious_prefix"]
+        reasons.append(f"Şüpheli numara prefix'i: {prefix}")
+    
+    # Kara liste kontrolü (bellekteki set; detay sadece eşleşmede SQLite'tan)
+    entry = get_phone_blacklist().lookup_key(key)
+    if entry:
+        score += weights["blacklisted_phone"]
+        reasons.append(f"Kara listede kayıtlı numara ({entry['reported_count']} şikayet, kaynak: {entry['source']})")
+    
+    STAGE_PHONE_RISK.observe_ns(perf_counter_ns() - start)
+    return min(score, 100), reasons
+
+@dataclass(frozen=True)
+class PhoneBatchScores:
+    """Toplu telefon skorlama sonucu (NumPy dizileri, girdi sırasıyla)"""
+    keys: Any           # int64 E.164 anahtarları (geçersiz numara -> 0)
+    kinds: Any          # uint8 sınıf kodları (phone_numbers.KIND_NAMES)
+    operators: Any      # uint8 operatör kodları (phone_numbers.OPERATOR_NAMES)
+    blacklisted: Any    # bool
+    risk_scores: Any    # int16, 0-100
+    is_fraud: Any       # bool
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def check_phone_risk_batch(phones: Sequence[str], rules: Optional[RuleSnapshot] = None) -> PhoneBatchScores:
+    """check_phone_risk'in NumPy ile toplu hâli
+
+    Puanlar tekil yolla aynıdır; gerekçe metni üretilmez. Liste veya
+    NumPy metin dizisi alır; numara başına Python döngüsü yoktur.
+    """
+    np = load_numpy()
+    rules = rules or RULE_STORE.current
+    weights = rules.weights
+    keys = e164_keys(phones)
+    kinds, operators = classify_keys(keys)
+    blacklisted = get_phone_blacklist().contains_keys(keys)
+    scores = np.where(kinds != MOBILE, weights["invalid_phone_format"], 0)
+    scores += rules.phone_prefixes.count_keys(keys) * weights["suspicious_prefix"]
+    scores += blacklisted * weights["blacklisted_phone"]
+    scores = np.minimum(scores, 100).astype(np.int16)
+    return PhoneBatchScores(keys, kinds, operators, blacklisted, scores, scores >= rules.thresholds["phone"])
+
+# URL güvenlik kontrolü
+def check_url_safety(url: str, rules: Optional[RuleSnapshot] = None) -> tuple[int, List[str]]:
+    """Basit URL güvenlik kontrolü"""
+    start = perf_counter_ns()
+    reasons = []
+    score = 0
+    rules = rules or RULE_STORE.current
+    weights = rules.weights
+    
+    # Temel format kontrolü
+    if not url.startswith(('http://', 'https://')):
+        score += weights["insecure_protocol"]
+        reasons.append("Güvensiz protokol")
+    
+    # Şüpheli domain'ler (host bir kez ayrıştırılır, indekste suffix bazlı aranır)
+    host = extract_host(url)
+    domain_rule = rules.domain_index.match(host) if host else None
+    if domain_rule:
+        score += weights["suspicious_domain"]
+        reasons.append(f"Şüpheli domain: {domain_rule}")
+    
+    # Offline derlenmiş tehdit listeleri (OpenPhish / URLhaus, bkz. threat_feed.py)
+    if get_threat_feed().match(url):
+        score += weights["threat_feed"]
+        reasons.append("Tehdit listesinde kayıtlı link (phishing / zararlı yazılım)")
+    
+    # IP adresi kontrolü
+    ip_pattern = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
+    if re.search(ip_pattern, url):
+        score += weights["ip_address"]
+        reasons.append("IP adresi kullanılmış (domain yerine)")
+    
+    STAGE_URL_RISK.observe_ns(perf_counter_ns() - start)
+    return min(score, 100), reasons
+
+# Mesaj skoru + gönderen numarası skoru -> tek yanıt
+def build_message_response(message_result: tuple[int, List[str]],
+                           phone_result: Optional[tuple[int, List[str]]] = None,
+                           rules: Optional[RuleSnapshot] = None) -> AnalysisResponse:
+    """Mesaj ve telefon skorlarını birleştirip yanıt üret"""
+    rules = rules or RULE_STORE.current
+    risk_score, reasons = message_result
+    reasons = list(reasons)
+    
+    # Telefon kontrolü varsa ekle
+    if phone_result is not None:
+        phone_score, phone_reasons = phone_result
+        risk_score = min(risk_score + (phone_score // 2), 100)
+        reasons.extend(phone_reasons)
+    
+    return AnalysisResponse(
+        is_fraud=risk_score >= rules.thresholds["message"],
+        risk_score=risk_score,
+        reasons=reasons if reasons else [NO_FINDINGS_REASON],
+        analysis_type="message"
+    )
+
+# Gönderen hızı kontrolü
+def check_sender_velocity(phone: Optional[str], rules: Optional[RuleSnapshot] = None) -> tuple[int, List[str]]:
+    """Gönderenin mesajını say ve son penceredeki hızını puanla"""
+    if SENDER_VELOCITY is None or not phone:
+        return 0, []
+    rules = rules or RULE_STORE.current
+    # Geçersiz yazımlı numaralar da sayılır (format değiştirerek kaçılmasın)
+    count = SENDER_VELOCITY.record(e164_key(phone) or phone.strip())
+    per_minute = count * 60 / SENDER_VELOCITY.window_seconds
+    limits = rules.sender_velocity
+    weight = rules.weights["sender_velocity"]
+    window = f"son {SENDER_VELOCITY.window_seconds:g} sn'de {count} mesaj"
+    if limits["critical_per_minute"] and per_minute >= limits["critical_per_minute"]:
+        return weight, [f"Gönderen çok yüksek hızda mesaj gönderiyor ({window})"]
+    if limits["suspicious_per_minute"] and per_minute >= limits["suspicious_per_minute"]:
+        return weight // 2, [f"Gönderen yüksek hızda mesaj gönderiyor ({window})"]
+    return 0, []
+
+def apply_sender_velocity(response: AnalysisResponse, velocity_result: tuple[int, List[str]],
+                          rules: Optional[RuleSnapshot] = None) -> AnalysisResponse:
+    """Mesaj kararına gönderen hızı puanını ekle.
+
+    Hız her istekte değiştiği için önbelleğe hızsız karar yazılır; hız
+    puanı önbellekten gelen karara da bu fonksiyonla eklenir.
+    """
+    velocity_score, velocity_reasons = velocity_result
+    if not velocity_score:
+        return response
+    rules = rules or RULE_STORE.current
+    risk_score = min(response.risk_score + velocity_score, 100)
+    reasons = [] if response.reasons == [NO_FINDINGS_REASON] else list(response.reasons)
+    return AnalysisResponse(
+        is_fraud=risk_score >= rules.thresholds["message"],
+        risk_score=risk_score,
+        reasons=reasons + velocity_reasons,
+        analysis_type="message"
+    )
+
+# Kampanya kontrolü
+def check_campaign(message: str, response: AnalysisResponse) -> Optional[CampaignMatch]:
+    """Mesajı kendi kararıyla kampanya indeksine ekle -> katıldığı bilinen kampanya"""
+    if CAMPAIGN_INDEX is None or DEGRADED:
+        return None
+    return CAMPAIGN_INDEX.observe(message, response.risk_score, response.is_fraud)
+
+def apply_campaign(response: AnalysisResponse, match: Optional[CampaignMatch],
+                   rules: Optional[RuleSnapshot] = None) -> AnalysisResponse:
+    """Bilinen dolandırıcılık kampanyasının varyantına kampanyanın kararını devret.
+
+    Puan, kampanyadaki dolandırıcılık kararlarının en düşüğüne yükseltilir.
+    Önbelleğe ve kampanya istatistiklerine mesajın kendi kararı yazılır.
+    """
+    if match is None or not match.fraud_count or match.fraud_score <= response.risk_score:
+        return response
+    rules = rules or RULE_STORE.current
+    reasons = [] if response.reasons == [NO_FINDINGS_REASON] else list(response.reasons)
+    reasons.append(
+        f"Bilinen dolandırıcılık kampanyasının benzeri (kampanya #{match.id}, "
+        f"{match.count} mesaj, benzerlik %{match.similarity * 100:.0f})"
+    )
+    return AnalysisResponse(
+        is_fraud=match.fraud_score >= rules.thresholds["message"],
+        risk_score=match.fraud_score,
+        reasons=reasons,
+        analysis_type="message"
+    )
+
+# Tek mesaj isteğini skorla
+def score_message(request: MessageAnalysisRequest) -> AnalysisResponse:
+    """Mesaj + (varsa) gönderen numarası analizi (önbellekli)"""
+    # İstek boyunca tek bir kural snapshot'ı kullanılır
+    rules = RULE_STORE.current
+    # Önbellekten dönen mesajlar da gönderen hızına sayılır
+    velocity_result = check_sender_velocity(request.sender_phone, rules)
+    ticket, cached = lookup_verdict(request, rules)
+    key = ticket[0] if ticket else None
+    if cached is not None:
+        response = apply_campaign(cached, check_campaign(request.message, cached), rules)
+        response = apply_sender_velocity(response, velocity_result, rules)
+        report_verdict("message", response, rules, request.message, request.sender_phone, key)
+        return response
+    
+    message_result = calculate_risk_score(request.message, request.sender_phone, rules=rules)
+    phone_result = message_phone_result(message_result, request.sender_phone, rules)
+    response = build_message_response(message_result, phone_result, rules)
+    store_verdict(ticket, response)
+    response = apply_campaign(response, check_campaign(request.message, response), rules)
+    response = apply_sender_velocity(response, velocity_result, rules)
+    report_verdict("message", response, rules, request.message, request.sender_phone, key)
+    return response
+
+def score_message_batch(requests: Sequence[MessageAnalysisRequest]) -> List[Any]:
+    """score_message'ın toplu hâli -> istek sırasıyla yanıt veya hata (Exception)
+
+    Aynı mesaj/numara bir kez hesaplanır. Önce her mesaj hattın model öncesi
+    aşamalarından geçer; modele kalan mesajlar tek NumPy çağrısında
+    sınıflandırılır, sonra kararlar istek sırasıyla tamamlanır.
+    """
+    rules = RULE_STORE.current  # tüm batch aynı kural snapshot'ıyla skorlanır
+    partials: Dict[str, RuleScore] = {}
+    states: List[Any] = []
+    for request in requests:
+        try:
+            velocity_result = check_sender_velocity(request.sender_phone, rules)
+            ticket, cached = lookup_verdict(request, rules)
+            if cached is None and request.message not in partials:
+                partials[request.message] = score_message_rules(request.message, rules=rules)
+            states.append((velocity_result, ticket, cached))
+        except Exception as e:
+            states.append(e)
+    
+    # Model aşaması: hattın sonuna kalan tekil mesajlar tek seferde sınıflandırılır
+    pending = [message for message, partial in partials.items() if partial.folded is not None]
+    probabilities = classify_messages([partials[message].folded for message in pending], folded=True)
+    fraud_probabilities = dict(zip(pending, probabilities)) if probabilities is not None else {}
+    
+    message_results: Dict[str, tuple[int, List[str]]] = {}
+    phone_results: Dict[tuple, Optional[tuple[int, List[str]]]] = {}
+    responses: List[Any] = []
+    for request, state in zip(requests, states):
+        if isinstance(state, Exception):
+            responses.append(state)
+            continue
+        try:
+            velocity_result, ticket, cached = state
+            key = ticket[0] if ticket else None
+            if cached is not None:
+                response = cached
+            else:
+                message_result = message_results.get(request.message)
+                if message_result is None:
+                    message_result = message_results[request.message] = finish_message_score(
+                        partials[request.message], fraud_probabilities.get(request.message), rules)
+                
+                phone_key = (request.sender_phone, message_result[0] >= 100)
+                if phone_key in phone_results:
+                    phone_result = phone_results[phone_key]
+                else:
+                    phone_result = phone_results[phone_key] = message_phone_result(
+                        message_result, request.sender_phone, rules)
+                
+                response = build_message_response(message_result, phone_result, rules)
+                store_verdict(ticket, response)
+            response = apply_campaign(response, check_campaign(request.message, response), rules)
+            response = apply_sender_velocity(response, velocity_result, rules)
+            report_verdict("message", response, rules, request.message, request.sender_phone, key)
+            responses.append(response)
+        except Exception as e:
+            responses.append(e)
+    return responses
+
+def report_verdict(analysis_type: str, response: AnalysisResponse, rules: RuleSnapshot,
+                   subject: Optional[str] = None, phone: Optional[str] = None,
+                   key: Optional[str] = None) -> None:
+    """Kararı say ve fraud_reports'a yazılmak üzere kuyruğa ekle (veritabanına dokunmaz)"""
+    record_verdict(analysis_type, response.is_fraud)
+    if REPORT_WRITER is not None and REPORT_WRITER.running:
+        if key is None and subject is not None:
+            key = verdict_key(subject, phone)
+        REPORT_WRITER.submit((key, phone, response.risk_score, response.is_fraud,
+                              f"{analysis_type}:rules:{rules.version}", time()))
+
+# Karar önbelleği yardımcıları
+def verdict_key(message: str, sender: Optional[str] = None) -> str:
+    """Ham mesaj + E.164 gönderen anahtarı
+
+    Mesaj normalize edilmez: URL ve telefon desenleri ham metinde aranır,
+    "HTTPS://" / "https://" veya araya görünmez karakter girmiş bir numara
+    farklı puan alır; aynı anahtara düşselerdi ilk gönderilen yazımın kararı
+    diğerine dönerdi. Gönderende "0532..." / "+90532..." yazımları aynı
+    anahtara düşer; numara kontrolü zaten sadece E.164 anahtarına bakar.
+    """
+    sender_key = e164_key(sender) if sender else None
+    return message_hash(message, str(sender_key) if sender_key is not None else sender)
+
+def lookup_verdict(request: MessageAnalysisRequest,
+                   rules: Optional[RuleSnapshot] = None) -> tuple[Optional[tuple], Optional[AnalysisResponse]]:
+    """Önbellekte kararı ara -> ((anahtar, sürüm), karar)"""
+    if VERDICT_CACHE is None:
+        return None, None
+    ticket = (verdict_key(request.message, request.sender_phone), current_rules_version(rules))
+    return ticket, VERDICT_CACHE.get(*ticket)
+
+def store_verdict(ticket: Optional[tuple], response: AnalysisResponse) -> None:
+    """Kararı, aranırken geçerli olan kural sürümüyle önbelleğe yaz"""
+    if ticket is not None and not DEGRADED:
+        key, version = ticket
+        VERDICT_CACHE.put(key, response, version, size=sum(len(r) for r in response.reasons))
+
+# Telefon numarası analizi
+def score_phone(phone: str) -> AnalysisResponse:
+    """Telefon numarası risk analizi"""
+    rules = RULE_STORE.current
+    risk_score, reasons = check_phone_risk(phone, rules)
+    
+    response = AnalysisResponse(
+        is_fraud=risk_score >= rules.thresholds["phone"],
+        risk_score=risk_score,
+        reasons=reasons if reasons else ["Numara güvenli görünüyor"],
+        analysis_type="phone"
+    )
+    report_verdict("phone", response, rules, phone=phone)
+    return response
+
+# URL analizi
+def score_url(url: str) -> AnalysisResponse:
+    """URL güvenlik analizi"""
+    rules = RULE_STORE.current
+    risk_score, reasons = check_url_safety(url, rules)
+    
+    response = AnalysisResponse(
+        is_fraud=risk_score >= rules.thresholds["url"],
+        risk_score=risk_score,
+        reasons=reasons if reasons else ["URL güvenli görünüyor"],
+        analysis_type="url"
+    )
+    report_verdict("url", response, rules, subject=url)
+    return response
+
+# Toplu mesaj analizi
+def build_batch_response(items: List[Any]) -> BatchAnalysisResponse:
+    """Batch'i skorla ve toplu yanıtı üret"""
+    results = analyze_message_batch(items)
+    return BatchAnalysisResponse(
+        total=len(results),
+        failed=sum(1 for r in results if r.error is not None),
+        results=results
+    )
+
+def analyze_message_batch(items: List[Any]) -> List[BatchItemResult]:
+    """Mesajları toplu skorla; aynı mesaj/numara batch içinde bir kez hesaplanır"""
+    results: List[Any] = []
+    requests = []
+    for index, item in enumerate(items):
+        try:
+            requests.append(MessageAnalysisRequest.model_validate(item))
+            results.append(index)
+        except ValidationError as e:
+            results.append(BatchItemResult(index=index, error=f"Geçersiz istek: {e.errors()[0]['msg']}"))
+    
+    responses = iter(score_message_batch(requests))
+    for index, result in enumerate(results):
+        if isinstance(result, BatchItemResult):
+            continue
+        response = next(responses)
+        if isinstance(response, Exception):
+            results[index] = BatchItemResult(index=index, error=f"Analiz hatası: {str(response)}")
+        else:
+            results[index] = BatchItemResult(index=index, result=response)
+    
+    return results
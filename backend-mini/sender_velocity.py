@@ -0,0 +1,151 @@
+"""
+Patterna Shield Mini - Gönderen Hızı (Velocity)
+===============================================
+
+Dakikada binlerce mesaj gönderen numara en güçlü dolandırıcılık
+sinyallerinden biridir. Her mesajda gönderen numarası kaydedilir ve son
+pencere (varsayılan 60 sn) içinde o numaradan gelen mesaj sayısı döner.
+
+Yapı: kapasitesi sınırlı bir LRU'da gönderen başına zaman dilimli halka
+sayaçlar. Pencere B dilime bölünür (varsayılan 6 x 10 sn). Sayaçlar
+gönderen başına bir slot olacak şekilde düz `array`'lerde tutulur; LRU
+sadece gönderen -> slot eşlemesidir. Kapasite dolunca en uzun süredir
+mesaj göndermeyen gönderenin slotu yeniden kullanılır. Bellek tekil
+gönderen sayısından bağımsızdır (100K slot ~27 MB). Yoğun gönderenler her
+mesajda LRU'nun sonuna taşındığından milyonlarca tekil gönderen arasında
+da düşürülmez; düşürülenler zaten pencerede az mesajı olanlardır.
+
+Kayıt O(1)'dir: bir sözlük araması, LRU sırası güncellemesi ve en fazla B
+dilimlik ilerletme. Tüm güncellemeler tek bir kilit altında yapılır
+(event loop ve thread havuzu aynı anda kaydedebilir).
+
+Sayaçlar süreç içidir: çok worker'lı modda her worker kendi gördüğü
+trafiği sayar.
+"""
+
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+DEFAULT_CAPACITY = 100_000
+DEFAULT_WINDOW_SECONDS = 60.0
+DEFAULT_BUCKETS = 6
+
+
+class SenderVelocity:
+    """Gönderen başına kayan pencereli mesaj sayacı (sınırlı bellek)"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, window_seconds: float = DEFAULT_WINDOW_SECONDS,
+                 buckets: int = DEFAULT_BUCKETS, clock: Callable[[], float] = time.monotonic):
+        if capacity < 1 or buckets < 1 or window_seconds <= 0:
+            raise ValueError("capacity ve buckets pozitif, window_seconds sıfırdan büyük olmalı")
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self._bucket_seconds = window_seconds / buckets
+        self._clock = clock
+        # gönderen -> slot (en eski başta)
+        self._slots: "OrderedDict[Hashable, int]" = OrderedDict()
+        # Slot i'nin dilim sayaçları: counts[i * buckets:(i + 1) * buckets]
+        self._counts = array("i", bytes(4 * capacity * buckets))
+        self._totals = array("i", bytes(4 * capacity))
+        self._epochs = array("q", bytes(8 * capacity))   # slotun son güncellendiği dilim numarası
+        self._empty = array("i", bytes(4 * buckets))
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _epoch(self, now: Optional[float]) -> int:
+        return int((self._clock() if now is None else now) // self._bucket_seconds)
+
+    def _advance(self, slot: int, epoch: int) -> int:
+        """Slotu `epoch` dilimine ilerlet, pencereden çıkan dilimleri sıfırla -> geçerli dilim"""
+        last = self._epochs[slot]
+        # Saati kilitten önce okuyan thread'in geride kalan zamanı son dilime yazılır
+        if epoch <= last:
+            return last
+        buckets = self.buckets
+        base = slot * buckets
+        if epoch - last >= buckets:
+            self._counts[base:base + buckets] = self._empty
+            self._totals[slot] = 0
+        else:
+            counts = self._counts
+            total = self._totals[slot]
+            for passed in range(last + 1, epoch + 1):
+                index = base + passed % buckets
+                total -= counts[index]
+                counts[index] = 0
+            self._totals[slot] = total
+        self._epochs[slot] = epoch
+        return epoch
+
+    def record(self, sender: Hashable, now: Optional[float] = None) -> int:
+        """Gönderenin bir mesajını say -> penceredeki mesaj sayısı (bu mesaj dahil)"""
+        epoch = self._epoch(now)
+        with self._lock:
+            slots = self._slots
+            slot = slots.get(sender)
+            if slot is None:
+                if len(slots) < self.capacity:
+                    slot = len(slots)
+                else:
+                    _, slot = slots.popitem(last=False)
+                    self.evictions += 1
+                slots[sender] = slot
+                base = slot * self.buckets
+                self._counts[base:base + self.buckets] = self._empty
+                self._totals[slot] = 0
+                self._epochs[slot] = epoch
+            else:
+                slots.move_to_end(sender)
+                epoch = self._advance(slot, epoch)
+            self._counts[slot * self.buckets + epoch % self.buckets] += 1
+            total = self._totals[slot] + 1
+            self._totals[slot] = total
+            self.recorded += 1
+        return total
+
+    def count(self, sender: Hashable, now: Optional[float] = None) -> int:
+        """Penceredeki mesaj sayısı (kaydetmeden, LRU sırasını değiştirmeden)"""
+        epoch = self._epoch(now)
+        with self._lock:
+            slot = self._slots.get(sender)
+            if slot is None:
+                return 0
+            self._advance(slot, epoch)
+            return self._totals[slot]
+
+    def top(self, limit: int = 10, now: Optional[float] = None) -> List[Tuple[Hashable, int]]:
+        """Penceredeki en yoğun gönderenler (tüm slotları tarar; admin / teşhis için)"""
+        epoch = self._epoch(now)
+        counts = []
+        with self._lock:
+            for sender, slot in self._slots.items():
+                self._advance(slot, epoch)
+                if self._totals[slot]:
+                    counts.append((sender, self._totals[slot]))
+        counts.sort(key=lambda item: item[1], reverse=True)
+        return counts[:limit]
+
+    @property
+    def memory_bytes(self) -> int:
+        arrays = (self._counts, self._totals, self._epochs)
+        return sum(len(a) * a.itemsize for a in arrays) + sys.getsizeof(self._slots)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self._slots),
+            "capacity": self.capacity,
+            "window_seconds": self.window_seconds,
+            "buckets": self.buckets,
+            "recorded": self.recorded,
+            "evictions": self.evictions,
+            "memory_bytes": self.memory_bytes,
+        }
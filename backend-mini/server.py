@@ -0,0 +1,115 @@
+"""
+Patterna Shield Mini - Üretim Sunucusu
+======================================
+
+API'yi tek süreçte (geliştirme) veya çok worker'lı (üretim) olarak başlatır.
+Her worker ayrı bir Python sürecidir; CPU-bound skorlama çekirdeklere
+dağılır. Worker içinde kısa istekler event loop'ta, büyük işler (batch,
+uzun mesaj, akış parçaları) sınırlı bir thread havuzunda skorlanır.
+
+Kullanım:
+    python server.py                                  # tek süreç
+    python server.py --workers auto                   # CPU sayısı kadar worker
+    python server.py --workers 8 --scoring-threads 2 --limit-concurrency 512
+
+    python server.py --workers 8 --shared-tables      # kural / kara liste tabloları paylaşılan bellekte
+
+Tüm seçenekler ortam değişkenleriyle de verilebilir (PATTERNA_WORKERS,
+PATTERNA_SCORING_THREADS, PATTERNA_LIMIT_CONCURRENCY, PATTERNA_BACKLOG, ...).
+"""
+
+import argparse
+import os
+import socket
+from typing import List, Optional
+
+from uvicorn.protocols.http.auto import AutoHTTPProtocol
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class NoDelayHTTPProtocol(AutoHTTPProtocol):
+    """TCP_NODELAY'i her bağlantıda açan HTTP protokolü.
+
+    Çok worker'lı modda uvicorn dinleme soketini proto=0 ile açar; asyncio
+    bu durumda kabul edilen bağlantılarda TCP_NODELAY'i açmaz ve keep-alive
+    isteklerde Nagle + gecikmeli ACK yüzünden yanıt başına ~40ms beklenir.
+    """
+
+    def connection_made(self, transport):
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+        super().connection_made(transport)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Sunucu seçenekleri (ortam değişkenleri varsayılan olur)"""
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description="Patterna Shield Mini API sunucusu")
+    parser.add_argument("--host", default=env("PATTERNA_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(env("PATTERNA_PORT", "8000")))
+    parser.add_argument("--workers", default=env("PATTERNA_WORKERS", "1"),
+                        help="Worker süreç sayısı ('auto' = CPU sayısı)")
+    parser.add_argument("--scoring-threads", type=int, default=int(env("PATTERNA_SCORING_THREADS", "4")),
+                        help="Worker başına skorlama thread havuzu boyutu")
+    parser.add_argument("--inline-max-chars", type=int, default=int(env("PATTERNA_INLINE_MAX_CHARS", "2000")),
+                        help="Bu uzunluğa kadar mesajlar event loop'ta skorlanır")
+    parser.add_argument("--limit-concurrency", type=int, default=int(env("PATTERNA_LIMIT_CONCURRENCY", "0")) or None,
+                        help="Worker başına eşzamanlı bağlantı sınırı (aşılırsa 503)")
+    parser.add_argument("--backlog", type=int, default=int(env("PATTERNA_BACKLOG", "2048")))
+    parser.add_argument("--shared-tables", action="store_true", default=env("PATTERNA_SHARED_TABLES", "0") == "1",
+                        help="Kural ve kara liste tablolarını worker'lar arasında paylaş (shared_tables.py)")
+    parser.add_argument("--access-log", action="store_true", help="Erişim logunu aç (istek başına maliyet ekler)")
+    parser.add_argument("--log-level", default=env("PATTERNA_LOG_LEVEL", "info"))
+    args = parser.parse_args(argv)
+    args.workers = (os.cpu_count() or 1) if args.workers == "auto" else int(args.workers)
+    return args
+
+
+def run_server(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    args = parse_args(argv)
+
+    # Worker'lar main.py'yi kendi süreçlerinde import eder; havuz ayarları
+    # ortam değişkeniyle aktarılır
+    os.environ["PATTERNA_SCORING_THREADS"] = str(args.scoring_threads)
+    os.environ["PATTERNA_INLINE_MAX_CHARS"] = str(args.inline_max_chars)
+    os.environ["PATTERNA_SHARED_TABLES"] = "1" if args.shared_tables else "0"
+
+    if args.workers > 1:
+        # Bellek raporu (/admin/memory) aynı ana süreçten başlayan worker'ları toplar
+        os.environ["PATTERNA_WORKER_GROUP"] = str(os.getpid())
+        # Kurallar worker'lar başlamadan bir kez derlenip diske yazılır;
+        # worker'lar otomatı yeniden kurmak yerine derlenmiş hâlini yükler.
+        # Paylaşılan modda kara liste tablosu da burada yayınlanır, worker'lar eşler
+        from rules import RuleError, load_rules
+        try:
+            load_rules()
+        except RuleError:
+            pass  # hata worker'lar kuralları yüklerken raporlanır
+        if args.shared_tables:
+            from phone_blacklist import PhoneBlacklist
+            from shared_tables import get_shared_tables
+            PhoneBlacklist(shared=get_shared_tables())
+
+    uvicorn.run(
+        "main:app",
+        app_dir=APP_DIR,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        http=NoDelayHTTPProtocol,
+        limit_concurrency=args.limit_concurrency,
+        backlog=args.backlog,
+        access_log=args.access_log,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    run_server()
@@ -0,0 +1,445 @@
+"""
+Patterna Shield Mini - Worker'lar Arası Paylaşılan Tablolar
+===========================================================
+
+Çok worker'lı modda her worker kural tablolarını (keyword otomatı, domain
+indeksi) ve telefon kara listesini kendi belleğinde kurar; büyük listelerde
+RSS worker sayısıyla çarpılır (worker başına 1M domain ~180 MB, 10M numara
+~256 MB). PATTERNA_SHARED_TABLES=1 ile tablolar bir kez kurulup paylaşılan
+bellekteki (varsayılan /dev/shm) dosyalara yazılır; worker'lar dosyaları
+mmap ile salt okunur eşler, sayfalar tüm worker'larda tek kopyadır.
+Tehdit listesi indeksi (threat_feed.py) zaten bu şekilde eşlenir.
+
+Yayınlama:
+- Her tablonun bir adı vardır ("rules-<içerik hash'i>", "blacklist-<db>").
+  Tablo `<ad>-<token>.tbl` dosyasına yazılır, ardından `<ad>.json`
+  işaretçisi atomik olarak değiştirilir; okuyucular yarım dosya görmez.
+- Kurulum dizin kilidi (flock) altında yapılır: aynı anda başlayan ya da
+  aynı kural değişikliğini gören N worker'dan ilki kurar, diğerleri kilidi
+  bekleyip hazır tabloyu eşler.
+- Yerini yenisine bırakan tablo dosyaları silinir; eşlemiş worker'lar
+  bırakana kadar sayfalar geçerli kalır (POSIX).
+- Dizin 0700 oluşturulur; başka kullanıcıya ait veya grup / diğerleri
+  tarafından yazılabilen dizine bağlanılmaz (`private_directory`), tüm
+  worker'lar aynı kullanıcıyla çalışmalıdır. Tablolar pickle içermez:
+  sadece JSON metadata ve ham diziler okunur.
+
+Dosya biçimi: başlık (magic, metadata uzunluğu), metadata (JSON: dizi
+ofsetleri ve tipleri), 8 byte hizalı ham diziler (makinenin bayt sırası).
+
+Kullanım:
+    python shared_tables.py list      # yayınlanmış tablolar
+    python shared_tables.py memory    # süreç / worker'ların RSS ve PSS raporu
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import stat
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: kilitsiz; aynı tablo iki kez kurulabilir, sonuç yine tutarlıdır
+    fcntl = None
+
+SHARED_TABLES_ENABLED = os.environ.get("PATTERNA_SHARED_TABLES", "0") == "1"
+DEFAULT_SHARED_DIR = os.environ.get("PATTERNA_SHARED_DIR") or os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "patterna-shield"
+)
+
+# server.py çok worker'lı modda worker'lara ana sürecin pid'ini verir (bellek raporu)
+WORKER_GROUP_ENV = "PATTERNA_WORKER_GROUP"
+
+MAGIC = b"PSTABLE1"
+HEADER = struct.Struct("<8sQ")
+
+# Kurulan tablo: (metadata, dizi adı -> array / bytes)
+TableData = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+def write_table(f, meta: Dict[str, Any], arrays: Dict[str, Any]) -> None:
+    """Tabloyu açık dosyaya yaz (dizi ofsetleri veri bölümünün başına göredir)"""
+    views = {name: memoryview(values) for name, values in arrays.items()}
+    layout = {}
+    offset = 0
+    for name, view in views.items():
+        layout[name] = [offset, view.format, len(view)]
+        offset += view.nbytes + _padding(view.nbytes)
+    blob = json.dumps({**meta, "arrays": layout}, ensure_ascii=False).encode("utf-8")
+    blob += b" " * _padding(HEADER.size + len(blob))
+    f.write(HEADER.pack(MAGIC, len(blob)))
+    f.write(blob)
+    for view in views.values():
+        f.write(view)
+        f.write(b"\0" * _padding(view.nbytes))
+
+
+class MappedTable:
+    """Salt okunur eşlenmiş tablo; diziler kopyasız memoryview olarak döner"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size or HEADER.unpack(header)[0] != MAGIC:
+                raise ValueError(f"Geçersiz paylaşılan tablo: {path}")
+            meta_len = HEADER.unpack(header)[1]
+            self.meta = json.loads(f.read(meta_len))
+            self.size = os.fstat(f.fileno()).st_size
+            self._base = HEADER.size + meta_len
+            for offset, typecode, count in self.meta["arrays"].values():
+                if self._base + offset + count * struct.calcsize(typecode) > self.size:
+                    raise ValueError(f"Eksik paylaşılan tablo: {path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.meta["arrays"]
+
+    def array(self, name: str) -> memoryview:
+        offset, typecode, count = self.meta["arrays"][name]
+        start = self._base + offset
+        return self._view[start:start + count * struct.calcsize(typecode)].cast(typecode)
+
+
+def pack_strings(strings: Iterable[str]) -> Tuple[array, bytes]:
+    """Metin listesi -> (bitiş ofsetleri, UTF-8 veri); StringTable ile okunur"""
+    offsets = array("Q", [0])
+    chunks = []
+    position = 0
+    for text in strings:
+        data = text.encode("utf-8")
+        chunks.append(data)
+        position += len(data)
+        offsets.append(position)
+    return offsets, b"".join(chunks)
+
+
+class StringTable(Sequence):
+    """Paylaşılan tablodaki metin listesi (elemanlar erişimde çözülür)"""
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode("utf-8")
+
+
+def private_directory(path: str) -> str:
+    """Dizini sadece bu kullanıcının yazabileceği şekilde hazırla -> gerçek yolu
+
+    Yoksa 0700 ile oluşturulur. Başka kullanıcıya ait ya da grup / diğerleri
+    tarafından yazılabilen dizin reddedilir (PermissionError): /dev/shm gibi
+    herkesin yazabildiği yerlerde dizini önceden açan biri tablo dosyası
+    yerleştiremez. Sembolik bağ çözülür; bağ sonradan değiştirilse de
+    doğrulanmış dizin kullanılır.
+    """
+    try:
+        os.makedirs(path, mode=0o700)
+    except FileExistsError:
+        pass
+    real = os.path.realpath(path)
+    info = os.stat(real)
+    if not stat.S_ISDIR(info.st_mode):
+        raise NotADirectoryError(f"Dizin değil: {real}")
+    if hasattr(os, "getuid"):  # POSIX; Windows'ta izinler ACL ile yönetilir
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"Dizin başka bir kullanıcıya ait: {real}")
+        if info.st_mode & 0o022:
+            raise PermissionError(f"Dizin grup / diğerleri tarafından yazılabilir: {real}")
+    return real
+
+
+class SharedTables:
+    """Yayınlanmış tabloların dizini (işaretçi dosyaları + dizin kilidi)"""
+
+    def __init__(self, directory: str = DEFAULT_SHARED_DIR):
+        self.directory = directory
+        self._root: Optional[str] = None
+        self.published = 0
+        # Son başarısız kurulum / eşleme (kullanan modül özel kopyaya döner)
+        self.last_error: Optional[str] = None
+
+    @property
+    def root(self) -> str:
+        """Doğrulanmış dizin; ilk erişimde 0700 oluşturulur, güvensizse PermissionError"""
+        if self._root is None:
+            self._root = private_directory(self.directory)
+        return self._root
+
+    def _pointer(self, name: str) -> str:
+        return os.path.join(self.root, name + ".json")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(os.path.join(self.root, ".lock"), "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield  # dosya kapanınca kilit bırakılır
+
+    def current_path(self, name: str) -> Optional[str]:
+        """İşaretçinin gösterdiği tablo dosyası (yayınlanmamışsa None)"""
+        try:
+            with open(self._pointer(name), encoding="utf-8") as f:
+                file_name = json.load(f)["file"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not isinstance(file_name, str) or os.path.basename(file_name) != file_name:
+            return None
+        return os.path.join(self.root, file_name)
+
+    def open(self, name: str) -> Optional[MappedTable]:
+        """Yayınlanmış tabloyu eşle (yoksa / o arada değiştirildiyse None)"""
+        path = self.current_path(name)
+        if path is None:
+            return None
+        try:
+            return MappedTable(path)
+        except (OSError, ValueError):
+            return None
+
+    def attach(self, name: str, build: Callable[[], TableData],
+               accept: Optional[Callable[[Dict[str, Any]], bool]] = None) -> MappedTable:
+        """Yayınlanmış tabloyu eşle; yoksa (veya `accept` reddederse) bir kez kurup yayınla"""
+        table = self.open(name)
+        if table is not None and (accept is None or accept(table.meta)):
+            return table
+        with self._locked():
+            # Kilidi beklerken başka bir worker kurmuş olabilir
+            table = self.open(name)
+            if table is not None and (accept is None or accept(table.meta)):
+                return table
+            return self._publish(name, *build())
+
+    def publish(self, name: str, meta: Dict[str, Any], arrays: Dict[str, Any]) -> MappedTable:
+        """Tabloyu yaz ve işaretçiyi ona çevir (izleyen worker'lar yenisini eşler)"""
+        with self._locked():
+            return self._publish(name, meta, arrays)
+
+    def _publish(self, name: str, meta: Dict[str, Any], arrays: Dict[str, Any]) -> MappedTable:
+        file_name = f"{name}-{os.urandom(6).hex()}.tbl"
+        path = os.path.join(self.root, file_name)
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{name}-", suffix=".tmp", dir=self.root)
+            with os.fdopen(fd, "wb") as f:
+                write_table(f, {**meta, "name": name, "published_at": time.time(), "pid": os.getpid()}, arrays)
+            os.replace(tmp_path, path)
+            self._replace_json(self._pointer(name), {"file": file_name})
+        except BaseException:
+            for leftover in (tmp_path, path):
+                if leftover is not None and os.path.exists(leftover):
+                    os.unlink(leftover)
+            raise
+        self.published += 1
+        self.last_error = None
+        for entry in os.scandir(self.root):
+            if (entry.name.startswith(name + "-") and entry.name.endswith(".tbl")
+                    and len(entry.name) == len(file_name) and entry.name != file_name):
+                self._unlink(entry.path)
+        return MappedTable(path)
+
+    def _replace_json(self, path: str, data: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix=".pointer-", suffix=".tmp", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # Windows'ta eşlenmiş dosya silinemez; sonraki yayında tekrar denenir
+
+    def prune(self, prefix: str, keep: int) -> None:
+        """`prefix` ile başlayan tablolardan en yeni `keep` tanesi dışındakileri sil"""
+        pointers = sorted(
+            (entry for entry in os.scandir(self.root)
+             if entry.name.startswith(prefix) and entry.name.endswith(".json")),
+            key=lambda entry: entry.stat().st_mtime_ns, reverse=True,
+        )
+        for entry in pointers[keep:]:
+            table = self.current_path(entry.name[:-len(".json")])
+            self._unlink(entry.path)
+            if table is not None:
+                self._unlink(table)
+
+    def tables(self) -> List[Dict[str, Any]]:
+        """Yayınlanmış tablolar (ad, dosya, boyut, yayın zamanı)"""
+        try:
+            entries = sorted(os.scandir(self.root), key=lambda entry: entry.name)
+        except OSError:
+            return []
+        result = []
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            name = entry.name[:-len(".json")]
+            table = self.open(name)
+            if table is None:
+                continue
+            result.append({
+                "name": name,
+                "file": os.path.basename(table.path),
+                "bytes": table.size,
+                "published_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(table.meta["published_at"])),
+            })
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "tables": self.tables(),
+            "published": self.published,
+            "last_error": self.last_error,
+        }
+
+
+_shared: Optional[SharedTables] = None
+
+
+def get_shared_tables() -> Optional[SharedTables]:
+    """Süreç genelindeki paylaşılan tablo dizini (PATTERNA_SHARED_TABLES=1 değilse None)"""
+    global _shared
+    if _shared is None and SHARED_TABLES_ENABLED:
+        _shared = SharedTables()
+    return _shared
+
+
+# ---------------------------------------------------------------------------
+# Bellek raporu (/proc, Linux)
+# ---------------------------------------------------------------------------
+
+def process_memory(pid: int) -> Optional[Dict[str, float]]:
+    """Sürecin RSS / PSS / paylaşılan / özel belleği (MB; /proc yoksa None)"""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    values[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return None
+    def mb(*keys: str) -> float:
+        return round(sum(values.get(key, 0) for key in keys) / 1024, 1)
+
+    return {
+        "pid": pid,
+        "rss_mb": mb("Rss"),
+        "pss_mb": mb("Pss"),
+        "shared_mb": mb("Shared_Clean", "Shared_Dirty"),
+        "private_mb": mb("Private_Clean", "Private_Dirty"),
+    }
+
+
+def _cmdline(pid: int) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            # spawn ile başlatılan worker'lar sadece pipe / fd numaralarında ayrılır
+            return re.sub(rb"\d+", b"", f.read()).decode("utf-8", "replace")
+    except OSError:
+        return None
+
+
+def _parent_pid(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            return int(f.read().rpartition(b")")[2].split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def worker_pids() -> List[int]:
+    """Bu süreçle aynı ana süreçten başlatılmış worker'lar (tek süreçte sadece bu süreç)"""
+    me = os.getpid()
+    parent = os.getppid()
+    if os.environ.get(WORKER_GROUP_ENV) != str(parent) or not os.path.isdir("/proc"):
+        return [me]
+    command = _cmdline(me)
+    pids = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit() and _parent_pid(int(entry)) == parent and _cmdline(int(entry)) == command:
+            pids.append(int(entry))
+    return sorted(pids) or [me]
+
+
+def memory_report(pids: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Worker başına ve toplam RSS / PSS.
+
+    RSS paylaşılan sayfaları her süreçte tekrar sayar, PSS paylaşılan sayfayı
+    paylaşan süreç sayısına böler; toplam PSS gerçek bellek kullanımıdır.
+    Aradaki fark worker'ların paylaştığı (paylaşılmasa her worker'da ayrı
+    kopyası olacak) bellektir.
+    """
+    workers = [m for m in (process_memory(pid) for pid in (pids or worker_pids())) if m is not None]
+    if not workers:
+        return {"available": False, "workers": []}
+    rss = sum(m["rss_mb"] for m in workers)
+    pss = sum(m["pss_mb"] for m in workers)
+    return {
+        "available": True,
+        "workers": workers,
+        "total": {
+            "rss_mb": round(rss, 1),
+            "pss_mb": round(pss, 1),
+            "shared_saving_mb": round(rss - pss, 1),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker'lar arası paylaşılan tablolar")
+    parser.add_argument("--dir", default=DEFAULT_SHARED_DIR, help="Paylaşılan tablo dizini")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Yayınlanmış tablolar")
+    memory_cmd = sub.add_parser("memory", help="Süreçlerin RSS / PSS raporu")
+    memory_cmd.add_argument("pids", type=int, nargs="+", help="Worker pid'leri")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        tables = SharedTables(args.dir).tables()
+        for table in tables:
+            print(f"{table['name']:<40} {table['bytes'] / 2**20:>10,.1f} MB  {table['published_at']}")
+        print(f"🗂️  {len(tables)} tablo ({args.dir})", file=sys.stderr)
+    if args.command == "memory":
+        report = memory_report(args.pids)
+        if not report["available"]:
+            print("Bellek raporu için /proc/<pid>/smaps_rollup gerekli", file=sys.stderr)
+            sys.exit(1)
+        print(f"{'pid':>8} | {'RSS MB':>9} | {'PSS MB':>9} | {'paylaşılan':>10} | {'özel':>9}")
+        for m in report["workers"]:
+            print(f"{m['pid']:>8} | {m['rss_mb']:>9,.1f} | {m['pss_mb']:>9,.1f} | "
+                  f"{m['shared_mb']:>10,.1f} | {m['private_mb']:>9,.1f}")
+        total = report["total"]
+        print(f"Toplam RSS {total['rss_mb']:,.1f} MB, PSS {total['pss_mb']:,.1f} MB "
+              f"(paylaşımla kazanılan {total['shared_saving_mb']:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Test ortamı: uygulama modülleri import edilmeden önce veritabanı, kural
+önbelleği ve paylaşılan tablo dizinleri geçici bir dizine yönlendirilir;
+testler çalışma dizinindeki patterna_shield.db'ye dokunmaz.
+"""
+
+import os
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+_TMP = tempfile.mkdtemp(prefix="patterna-tests-")
+os.environ.setdefault("PATTERNA_DATA_DIR", os.path.join(_TMP, "data"))
+os.environ.setdefault("PATTERNA_DB_PATH", os.path.join(_TMP, "patterna_shield.db"))
+os.environ.setdefault("PATTERNA_RULES_CACHE_DIR", os.path.join(_TMP, "rules-cache"))
+os.environ.setdefault("PATTERNA_SHARED_DIR", os.path.join(_TMP, "shared"))
+os.environ.setdefault("PATTERNA_THREAT_FEED", os.path.join(_TMP, "threat_feed.idx"))
+os.environ.setdefault("PATTERNA_SHARED_TABLES", "0")
+os.environ.setdefault("PATTERNA_REPORTS", "0")
@@ -0,0 +1,139 @@
+"""Kabul kontrolü: token bucket, kuyruk, iptal ve akış sınırı"""
+
+import asyncio
+
+from admission import AdmissionController, AdmissionMiddleware, TokenBuckets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    buckets = TokenBuckets(rate=2, burst=2, clock=clock)
+    assert buckets.acquire("a") == 0 and buckets.acquire("a") == 0
+    assert buckets.acquire("a") == 0.5       # bir sonraki token'a kalan süre
+    clock.now = 0.5
+    assert buckets.acquire("a") == 0
+    assert buckets.acquire("b") == 0          # istemciler birbirinden bağımsız
+
+
+def test_token_bucket_capacity_evicts_oldest_client():
+    buckets = TokenBuckets(rate=1, burst=1, capacity=2)
+    for client in ("a", "b", "c"):
+        buckets.acquire(client)
+    assert len(buckets) == 2
+
+
+def test_release_hands_slot_to_waiter():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_wait=1.0)
+        assert await controller.acquire(None) is None
+        waiter = asyncio.create_task(controller.acquire(None))
+        await asyncio.sleep(0.01)
+        assert controller.stats()["queued"] == 1
+        controller.release(0.001)
+        assert await waiter is None
+        assert controller.in_flight == 1
+        controller.release(0.001)
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_full_and_deadline_rejections():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=1, max_wait=0.02)
+        await controller.acquire(None)
+        waiter = asyncio.create_task(controller.acquire(None))
+        await asyncio.sleep(0)
+        assert (await controller.acquire(None))[:2] == (503, "queue_full")
+        assert (await waiter)[:2] == (503, "deadline")
+        assert controller.stats()["queued"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_wait=1.0)
+        await controller.acquire(None)
+        waiter = asyncio.create_task(controller.acquire(None))
+        await asyncio.sleep(0.01)
+        waiter.cancel()                           # istemci bağlantısı koptu
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert controller.stats()["queued"] == 0
+        controller.release(0.001)
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_to_cancelled_waiter_moves_on():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_wait=1.0)
+        await controller.acquire(None)
+        first = asyncio.create_task(controller.acquire(None))
+        second = asyncio.create_task(controller.acquire(None))
+        await asyncio.sleep(0.01)
+        controller.release(0.001)                 # slot first'e devredilir...
+        first.cancel()                            # ...ama first alamadan iptal edilir
+        await asyncio.gather(first, return_exceptions=True)
+        assert await second is None               # slot second'a geçer
+        controller.release(0.001)
+        assert controller.in_flight == 0
+        assert controller.stats()["queued"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_streams_do_not_take_scoring_slots():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_queue=0, max_wait=0.05, max_streams=2)
+        assert await controller.acquire(None, stream=True) is None
+        assert await controller.acquire(None, stream=True) is None
+        assert (await controller.acquire(None, stream=True))[:2] == (503, "streams_full")
+        assert await controller.acquire(None) is None          # mesaj istekleri etkilenmez
+        controller.release(stream=True)
+        assert await controller.acquire(None, stream=True) is None
+        assert controller.stats()["streams"] == 2
+
+    asyncio.run(scenario())
+
+
+def _statuses(middleware, requests):
+    """(peer IP, X-Client-Id) istekleri middleware'den geçir -> yanıt kodları"""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def scenario():
+        statuses = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        for peer, client_id in requests:
+            headers = [(b"x-client-id", client_id.encode())] if client_id else []
+            scope = {"type": "http", "path": "/analyze/message", "headers": headers, "client": (peer, 40000)}
+            await middleware(scope, None, send)
+        return statuses
+
+    middleware.app = app
+    return asyncio.run(scenario())
+
+
+def test_client_header_is_ignored_unless_peer_is_trusted_proxy():
+    controller = AdmissionController(client_rate=0.001, client_burst=1)
+    middleware = AdmissionMiddleware(None, lambda: controller, trusted_proxies=("10.0.0.1",))
+    # Doğrudan bağlanan istemci başlığı değiştirerek yeni bucket alamaz
+    assert _statuses(middleware, [("1.2.3.4", "a"), ("1.2.3.4", "b"), ("1.2.3.4", None)]) == [200, 429, 429]
+    # Güvenilen proxy arkasındaki istemciler başlıkla ayrılır
+    assert _statuses(middleware, [("10.0.0.1", "a"), ("10.0.0.1", "b"), ("10.0.0.1", "a")]) == [200, 200, 429]
+    assert controller.stats()["tracked_clients"] == 3
@@ -0,0 +1,91 @@
+"""Kampanya indeksi: yakın kopyaların gruplanması, TTL ve kapasite sınırları"""
+
+import pytest
+
+from campaign_index import CampaignIndex, message_words, signature, similarity
+
+# Uzun mesajlar: tek kelime değişince Jaccard ~0.9 kalır, LSH kaçırma olasılığı ihmal edilebilir
+KARGO = ("Sayın {name} kargonuz adres bilgileriniz eksik olduğu için dağıtım merkezimizde "
+         "bekletilmektedir lütfen teslimat ücreti olan {amount} TL tutarını bugün içinde "
+         "aşağıdaki bağlantıdan ödeyerek adres bilgilerinizi güncelleyiniz aksi halde "
+         "gönderiniz iade edilecektir {url}")
+BANKA = ("Değerli müşterimiz hesabınızda şüpheli bir işlem tespit edilmiştir güvenliğiniz "
+         "için kartınız geçici olarak kullanıma kapatılmıştır işlemi onaylamak veya iptal "
+         "etmek için müşteri temsilcimizi arayınız {amount} numaralı kayıt oluşturulmuştur")
+TOPLANTI = "Yarın sabah saat onda ofiste proje toplantımız var sunum dosyalarını unutmayalım lütfen"
+
+
+def kargo(name="Ahmet", amount="49,90", url="http://kargo-takip.tk/a1"):
+    return KARGO.format(name=name, amount=amount, url=url)
+
+
+def test_numbers_and_links_do_not_change_the_signature():
+    a = signature(message_words(kargo(amount="49,90", url="http://a.tk/1")))
+    b = signature(message_words(kargo(amount="12,50", url="https://b.com/xyz")))
+    assert similarity(a, b) == 1.0
+
+
+def test_variants_join_the_seed_campaign():
+    index = CampaignIndex()
+    assert index.observe(kargo(), score=85, is_fraud=True, now=0) is None     # tohum
+    match = index.observe(kargo(name="Ayşe", amount="12,50"), score=40, is_fraud=False, now=1)
+    assert match is not None and match.similarity >= index.threshold
+    assert (match.count, match.fraud_count, match.fraud_score) == (1, 1, 85)  # eklenmeden önceki hâli
+    assert len(index) == 1
+    assert index.get(match.id)["count"] == 2
+
+
+def test_unrelated_messages_start_their_own_campaigns():
+    index = CampaignIndex()
+    index.observe(kargo(), score=85, is_fraud=True, now=0)
+    assert index.observe(BANKA.format(amount="7"), score=70, is_fraud=True, now=1) is None
+    assert index.observe(TOPLANTI, score=5, is_fraud=False, now=2) is None
+    assert len(index) == 3
+    assert [c["count"] for c in index.campaigns(fraud_only=True, now=3)] == [1, 1]
+
+
+def test_short_and_riskless_messages_do_not_seed():
+    index = CampaignIndex()
+    assert index.observe("kargonuz yolda", score=90, is_fraud=True, now=0) is None
+    assert index.observe(TOPLANTI, score=0, is_fraud=False, now=0) is None
+    assert len(index) == 0
+    assert index.stats()["observed"] == 1        # kısa mesaj indekse hiç girmez
+
+
+def test_campaigns_expire_after_ttl():
+    now = [0.0]
+    index = CampaignIndex(ttl_seconds=60, clock=lambda: now[0])
+    index.observe(kargo(), score=85, is_fraud=True)
+    now[0] = 30
+    assert index.observe(kargo(name="Ayşe"), score=85, is_fraud=True) is not None
+    now[0] = 30 + 61                             # son mesajdan bu yana TTL geçti
+    assert index.observe(kargo(name="Mehmet"), score=85, is_fraud=True) is None
+    assert len(index) == 1                       # eski kampanya silindi, varyant yeni tohum
+    assert index.stats()["evictions"] == 1
+
+
+def test_capacity_evicts_least_recently_seen_campaign():
+    index = CampaignIndex(capacity=2)
+    index.observe(kargo(), score=85, is_fraud=True, now=0)
+    index.observe(BANKA.format(amount="7"), score=70, is_fraud=True, now=1)
+    index.observe(kargo(name="Ayşe"), score=85, is_fraud=True, now=2)        # kargo kampanyası tazelenir
+    index.observe(TOPLANTI, score=5, is_fraud=False, now=3)                  # banka kampanyası düşer
+    assert len(index) == 2
+    assert index.observe(BANKA.format(amount="8"), score=0, is_fraud=False, now=4) is None
+    assert index.observe(kargo(name="Mehmet"), score=85, is_fraud=True, now=5) is not None
+
+
+def test_recent_signatures_do_not_keep_message_text():
+    index = CampaignIndex()
+    long_message = kargo(name="x" * 100_000)
+    index.observe(long_message, score=85, is_fraud=True, now=0)
+    assert index.observe(long_message, score=85, is_fraud=True, now=1) is not None   # tekrar imzadan bulunur
+    assert all(len(key) == 16 for key in index._recent)
+    assert max(len(c["samples"][0]) for c in index.campaigns(now=2)) <= 160
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        CampaignIndex(capacity=0)
+    with pytest.raises(ValueError):
+        CampaignIndex(threshold=1.5)
@@ -0,0 +1,57 @@
+"""Aho-Corasick keyword eşleştirici: tek geçişte tüm kategoriler"""
+
+import random
+
+from keyword_matcher import KeywordMatcher
+from text_normalizer import keyword_variants, normalize
+
+
+def _naive(categories, text):
+    return {name: [word for word in words if word in text] for name, words in categories.items()}
+
+
+def test_matches_all_categories_in_rule_order():
+    matcher = KeywordMatcher({"fraud": ["kazandınız", "acil"], "urgency": ["acil", "hemen"], "money": ["tl"]})
+    assert matcher.match("acil! hemen kazandınız 500 tl") == {
+        "fraud": ["kazandınız", "acil"], "urgency": ["acil", "hemen"], "money": ["tl"],
+    }
+
+
+def test_overlapping_and_nested_keywords():
+    categories = {"a": ["he", "she", "his", "hers"]}
+    matcher = KeywordMatcher(categories)
+    for text in ("ushers", "she", "hishers", "h", ""):
+        assert matcher.match(text) == _naive(categories, text), text
+
+
+def test_table_and_dict_automata_agree_with_naive_scan():
+    rng = random.Random(1)
+    alphabet = "abcı? "
+    words = list({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))).strip() or "a"
+                  for _ in range(60)})
+    plain = {"x": [w for w in words if "?" not in w][:20], "y": [w for w in words if "?" not in w][20:]}
+    with_question = {"x": words[:30], "y": words[30:]}   # "?" içeren keyword: sözlük tabanlı DFA
+    assert KeywordMatcher(plain)._table is not None
+    assert KeywordMatcher(with_question)._table is None
+    for categories in (plain, with_question):
+        matcher = KeywordMatcher(categories)
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet + "zé") for _ in range(rng.randint(0, 30)))
+            assert matcher.match(text) == _naive(matcher.categories, text), (categories, text)
+
+
+def test_variants_match_ascii_spelling_and_deduplicate():
+    matcher = KeywordMatcher({"fraud": ["kazandınız", "KAZANDINIZ", "şifre"]}, variants=keyword_variants)
+    assert matcher.categories["fraud"] == ["kazandınız", "şifre"]   # aynı yazıma çıkan tekrar atıldı
+    for message in ("KAZANDINIZ", "kazandiniz", "Kazandınız", "ŞİFRE", "sifre"):
+        hits = matcher.match(normalize(message)[1])["fraud"]
+        assert len(hits) == 1, message
+
+
+def test_shared_state_round_trips_through_json():
+    import json
+    matcher = KeywordMatcher({"fraud": ["acil", "ödül"], "money": ["para"]}, variants=keyword_variants)
+    state, table = matcher.shared_state()
+    copy = KeywordMatcher.from_shared_state(json.loads(json.dumps(state)), table)
+    text = normalize("ACİL ödül parası")[1]
+    assert copy.match(text) == matcher.match(text)
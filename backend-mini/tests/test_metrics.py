@@ -0,0 +1,28 @@
+"""İstek metrikleri: etiket kardinalitesi sınırlı kalır"""
+
+import asyncio
+
+from metrics import REGISTRY, MetricsMiddleware
+
+
+def _request(middleware, method, path):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    middleware.app = app
+    asyncio.run(middleware({"type": "http", "method": method, "path": path}, None, send))
+
+
+def test_unknown_methods_and_paths_are_labelled_other():
+    middleware = MetricsMiddleware(None, paths=lambda: ["/analyze/message"])
+    for i in range(5):
+        _request(middleware, f"X-UYDURMA-{i}", "/analyze/message")
+    _request(middleware, "POST", f"/rastgele/{i}")
+    text = REGISTRY.render()
+    assert "X-UYDURMA" not in text and "/rastgele" not in text
+    assert 'method="other",endpoint="/analyze/message",status="200"' in text
+    assert 'method="POST",endpoint="other",status="200"' in text
@@ -0,0 +1,63 @@
+"""Telefon kara listesi: IntHashSet ve SQLite destekli PhoneBlacklist"""
+
+import random
+from array import array
+
+import pytest
+
+from phone_blacklist import IntHashSet, PhoneBlacklist
+
+
+def test_int_hash_set_matches_python_set():
+    rng = random.Random(3)
+    keys = {rng.randrange(1, 10**12) for _ in range(5000)}
+    table = IntHashSet()
+    for key in keys:
+        table.add(key)                           # tekrar tekrar büyür
+    table.update(list(keys)[:100])               # tekrar eden eklemeler sayılmaz
+    assert len(table) == len(keys)
+    assert all(key in table for key in keys)
+    probes = [rng.randrange(1, 10**12) for _ in range(5000)]
+    assert [p in table for p in probes] == [p in keys for p in probes]
+
+
+def test_from_table_copies_on_first_write():
+    source = IntHashSet([11, 22, 33])
+    view = memoryview(source.table).toreadonly()
+    shared = IntHashSet.from_table(view, len(source))
+    assert 22 in shared and 44 not in shared
+    shared.add(44)                               # salt okunur tablo yerine özel kopya
+    assert 44 in shared and isinstance(shared.table, array)
+    assert 44 not in source
+
+
+def test_contains_keys_matches_scalar_lookup():
+    np = pytest.importorskip("numpy")
+    table = IntHashSet(range(1, 2000, 3))
+    keys = np.arange(-5, 2500, dtype=np.int64)
+    assert table.contains_keys(keys).tolist() == [int(k) > 0 and int(k) in table for k in keys]
+
+
+def test_blacklist_persists_and_matches_any_spelling(tmp_path):
+    db_path = str(tmp_path / "data" / "blacklist.db")
+    blacklist = PhoneBlacklist(db_path)
+    assert len(blacklist) == 0
+    assert blacklist.bulk_import([("0532 123 45 67", 90, "test"), ("geçersiz", 80, "test"),
+                                  ("+905421234567", 70, "test")]) == 2
+    assert "+90 532 123 45 67" in blacklist
+    assert "05551234567" not in blacklist
+
+    reopened = PhoneBlacklist(db_path)           # yeni süreç: SQLite'tan yüklenir
+    assert len(reopened) == 2
+    record = reopened.lookup("5421234567")
+    assert record["risk_level"] == 70 and record["source"] == "test"
+    assert reopened.lookup("05551234567") is None
+
+
+def test_repeated_reports_raise_count_and_keep_max_risk(tmp_path):
+    blacklist = PhoneBlacklist(str(tmp_path / "blacklist.db"))
+    blacklist.add("05321234567", risk_level=90, source="a")
+    blacklist.add("05321234567", risk_level=60, source="b")
+    record = blacklist.lookup("05321234567")
+    assert (record["reported_count"], record["risk_level"], record["source"]) == (2, 90, "b")
+    assert len(blacklist) == 1
@@ -0,0 +1,67 @@
+"""Telefon numaraları: E.164 anahtarları, sınıflandırma ve NumPy toplu yol"""
+
+import pytest
+
+from phone_numbers import (
+    CORPORATE, GEOGRAPHIC, INTERNATIONAL, INVALID, MOBILE, PREMIUM, TOLL_FREE, TURKCELL, VODAFONE,
+    PhonePrefixes, classify, classify_keys, e164_key, e164_keys, prefix_digits,
+)
+
+SPELLINGS = ["05321234567", "+90 532 123 45 67", "5321234567", "905321234567", "0090-532-123-45-67",
+             "(0532) 123 45 67"]
+
+
+@pytest.mark.parametrize("phone", SPELLINGS)
+def test_turkish_spellings_share_one_key(phone):
+    assert e164_key(phone) == 905321234567
+
+
+@pytest.mark.parametrize("phone", ["", "abc", "0532123456", "0012", "0" * 40, "05321234567x", "٠٥٣٢١٢٣٤٥٦٧"])
+def test_invalid_numbers(phone):
+    assert e164_key(phone) is None
+
+
+def test_international_numbers():
+    assert e164_key("+44 7911 123456") == e164_key("00447911123456") == 447911123456
+    assert classify(447911123456) == (INTERNATIONAL, 0)
+
+
+@pytest.mark.parametrize("phone, kind, operator", [
+    ("05321234567", MOBILE, TURKCELL),
+    ("05421234567", MOBILE, VODAFONE),
+    ("02121234567", GEOGRAPHIC, 0),
+    ("08001234567", TOLL_FREE, 0),
+    ("08501234567", CORPORATE, 0),
+    ("09001234567", PREMIUM, 0),
+    ("+90532123456", INVALID, 0),     # eksik haneli Türkiye numarası
+])
+def test_classify(phone, kind, operator):
+    assert classify(e164_key(phone)) == (kind, operator)
+
+
+def test_classify_none_is_invalid():
+    assert classify(None) == (INVALID, 0)
+
+
+def test_prefix_spellings():
+    assert prefix_digits("+90850") == prefix_digits("0090850") == prefix_digits("0850") == "90850"
+    assert prefix_digits("x") is None
+    prefixes = PhonePrefixes(["0850", "+90850", "0532"])
+    assert len(prefixes) == 2
+    assert prefixes.match(e164_key("0850 123 45 67")) == ["0850"]
+    assert prefixes.match(None) == []
+    with pytest.raises(ValueError):
+        PhonePrefixes(["abc"])
+
+
+def test_batch_path_matches_scalar_path():
+    np = pytest.importorskip("numpy")
+    phones = SPELLINGS + ["", "abc", "0532123456", "+447911123456", "02121234567", "08501234567",
+                          "09001234567", "+90532123456", "0" * 40, "1234567", "00"]
+    keys = e164_keys(phones)
+    assert keys.tolist() == [e164_key(p) or 0 for p in phones]
+    kinds, operators = classify_keys(keys)
+    assert list(zip(kinds.tolist(), operators.tolist())) == [classify(e164_key(p)) for p in phones]
+    counts = PhonePrefixes(["0850", "0532"]).count_keys(keys)
+    assert counts.tolist() == [len(PhonePrefixes(["0850", "0532"]).match(k or None)) for k in keys.tolist()]
+    assert keys.dtype == np.int64
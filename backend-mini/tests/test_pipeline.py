@@ -0,0 +1,84 @@
+"""Aşamalı skorlama hattı: ön filtre ve erken çıkış tam hatla aynı kararı verir"""
+
+import dataclasses
+import json
+import os
+import sys
+
+import pytest
+
+import scoring
+from metrics import EXIT_LOOKUPS, EXIT_PREFILTER, EXIT_RULES
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(APP_DIR, "benchmarks"))
+
+from traffic import generate_messages  # noqa: E402
+
+
+def _pipeline(prefilter: int, early_exit: int):
+    return dataclasses.replace(scoring.RULE_STORE.current,
+                               pipeline={"prefilter": prefilter, "early_exit": early_exit})
+
+
+def _score(item, rules):
+    message_result = scoring.calculate_risk_score(item["message"], rules=rules)
+    phone_result = scoring.message_phone_result(message_result, item.get("sender_phone"), rules)
+    return scoring.build_message_response(message_result, phone_result, rules)
+
+
+def _sample_messages():
+    with open(os.path.join(APP_DIR, "examples", "sample_data.json"), encoding="utf-8") as f:
+        return [item["data"] for item in json.load(f)["test_messages"]]
+
+
+@pytest.fixture(autouse=True)
+def no_text_model(monkeypatch):
+    # Ön filtreden çıkan mesaja model puanı eklenmez (README); parite modelsiz hat içindir
+    monkeypatch.setattr(scoring, "classify_messages", lambda messages, folded=False: None)
+
+
+def _assert_same_verdict(response, expected):
+    """Puan ve karar aynı; tavanda atlanan aşamaların gerekçeleri düşer, kalanlar aynı sırada"""
+    assert (response.risk_score, response.is_fraud) == (expected.risk_score, expected.is_fraud)
+    if response.reasons != expected.reasons:
+        assert response.risk_score == 100
+        remaining = iter(expected.reasons)
+        assert all(reason in remaining for reason in response.reasons)
+
+
+@pytest.mark.parametrize("messages", [_sample_messages(), generate_messages(500, seed=3)],
+                         ids=["sample_data", "synthetic"])
+def test_prefilter_alone_gives_identical_responses(messages):
+    full, prefiltered = _pipeline(0, 0), _pipeline(1, 0)
+    for item in messages:
+        assert _score(item, prefiltered) == _score(item, full), item["message"]
+
+
+@pytest.mark.parametrize("messages", [_sample_messages(), generate_messages(500, seed=3)],
+                         ids=["sample_data", "synthetic"])
+def test_early_exit_keeps_score_and_verdict(messages):
+    full, fast = _pipeline(0, 0), _pipeline(1, 1)
+    capped = 0
+    for item in messages:
+        expected, response = _score(item, full), _score(item, fast)
+        _assert_same_verdict(response, expected)
+        capped += response.reasons != expected.reasons
+    assert capped            # erken çıkışın gerekçe düşürdüğü mesajlar da sınandı
+
+
+def test_exit_counters_count_only_when_enabled():
+    clean = "Merhaba, bugün toplantımız var mı?"
+    capped = "ACİL! Hesabınız bloke, ödül kazandınız, hemen ödeme yapın: http://bit.ly/x 05321234567"
+    counters = (EXIT_PREFILTER, EXIT_RULES, EXIT_LOOKUPS)
+
+    before = [counter.value for counter in counters]
+    for message in (clean, capped):
+        scoring.calculate_risk_score(message, rules=_pipeline(0, 0))
+    assert [counter.value for counter in counters] == before
+
+    scoring.calculate_risk_score(clean, rules=_pipeline(1, 1))
+    scoring.calculate_risk_score(capped, rules=_pipeline(1, 1))
+    after = [counter.value for counter in counters]
+    assert after[0] == before[0] + 1
+    assert after[1] + after[2] == before[1] + before[2] + 1
@@ -0,0 +1,82 @@
+"""Karar kayıt yazıcısı: toplu yazma ve kuyruk politikaları"""
+
+import asyncio
+import os
+import sqlite3
+import time
+
+import pytest
+
+from report_writer import ReportWriter
+
+
+def _report(i: int):
+    return (f"{i:064x}", "05321234567", 80, True, "message:rules:test", time.time())
+
+
+def _rows(db_path: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM fraud_reports").fetchone()[0]
+
+
+def test_close_flushes_queued_reports(tmp_path):
+    db_path = str(tmp_path / "data" / "reports.db")   # veri dizini gerekirse oluşturulur
+    writer = ReportWriter(db_path, batch_size=10, flush_interval=60)
+    writer.start()
+    for i in range(25):
+        assert writer.submit(_report(i))
+    writer.close()
+    assert _rows(db_path) == 25
+    assert writer.stats()["written"] == 25
+
+
+def test_submit_without_running_writer_is_rejected(tmp_path):
+    writer = ReportWriter(str(tmp_path / "reports.db"))
+    assert not writer.submit(_report(0))
+
+
+def test_drop_newest_when_queue_is_full(tmp_path):
+    writer = ReportWriter(str(tmp_path / "reports.db"), queue_size=2, flush_interval=60, batch_size=100)
+    writer._running = True  # yazıcı thread'i olmadan kuyruğu doldur
+    assert writer.submit(_report(0)) and writer.submit(_report(1))
+    assert not writer.submit(_report(2))
+    assert writer.dropped == 1
+
+
+def test_block_policy_never_waits_on_the_event_loop(tmp_path):
+    writer = ReportWriter(str(tmp_path / "reports.db"), queue_size=1, flush_interval=60,
+                          batch_size=100, policy="block", block_timeout=1.0)
+    writer._running = True
+    writer.submit(_report(0))
+
+    async def submit_on_loop():
+        started = time.monotonic()
+        accepted = writer.submit(_report(1))
+        return accepted, time.monotonic() - started
+
+    accepted, elapsed = asyncio.run(submit_on_loop())
+    assert not accepted
+    assert elapsed < 0.5
+    assert writer.loop_drops == 1
+
+
+def test_block_policy_waits_off_the_event_loop(tmp_path):
+    writer = ReportWriter(str(tmp_path / "reports.db"), queue_size=1, flush_interval=60,
+                          batch_size=100, policy="block", block_timeout=0.05)
+    writer._running = True
+    writer.submit(_report(0))
+    started = time.monotonic()
+    assert not writer.submit(_report(1))
+    assert time.monotonic() - started >= 0.04
+    assert writer.loop_drops == 0
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        ReportWriter(policy="wait")
+
+
+def test_default_data_dir_is_outside_the_source_tree():
+    import phone_blacklist
+    source_dir = os.path.dirname(os.path.abspath(phone_blacklist.__file__))
+    assert not os.path.abspath(phone_blacklist.DATA_DIR).startswith(source_dir)
@@ -0,0 +1,92 @@
+"""Kural dosyasının sıcak yüklenmesi: atomik snapshot değişimi ve hatalı dosyalar"""
+
+import json
+import os
+
+import pytest
+
+import rules
+import scoring
+
+RULES_JSON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rules.json")
+MESSAGE = "Tebrikler, ödül kazandınız"
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    with open(RULES_JSON, encoding="utf-8") as f:
+        data = json.load(f)
+    path = tmp_path / "rules.json"
+
+    def write(text=None, **changes):
+        content = text if text is not None else json.dumps({**data, **changes}, ensure_ascii=False)
+        path.write_text(content, encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))   # aynı ns'de iki yazım
+
+    write()
+    return path, write, data
+
+
+@pytest.fixture
+def store(rules_file, monkeypatch):
+    store = rules.RuleStore(str(rules_file[0]))
+    monkeypatch.setattr(scoring, "RULE_STORE", store)
+    return store
+
+
+def test_reload_swaps_snapshot_and_invalidates_verdict_cache(store, rules_file):
+    _, write, data = rules_file
+    old = store.current
+    request = scoring.MessageAnalysisRequest(message=MESSAGE)
+    before = scoring.score_message(request)
+    hits = scoring.VERDICT_CACHE.hits
+    assert scoring.score_message(request) == before and scoring.VERDICT_CACHE.hits == hits + 1
+
+    write(version="test-2", weights={**data["weights"], "fraud_keyword": data["weights"]["fraud_keyword"] * 2})
+    assert store.reload_if_changed()
+    assert store.current is not old
+    assert (store.current.version, store.current.generation) == ("test-2", old.generation + 1)
+    assert store.reloads == 1 and store.last_error is None
+
+    invalidations = scoring.VERDICT_CACHE.invalidations
+    after = scoring.score_message(request)       # eski kurallarla hesaplanan karar dönmez
+    assert scoring.VERDICT_CACHE.invalidations == invalidations + 1
+    assert after.risk_score > before.risk_score
+
+
+def test_unchanged_content_keeps_snapshot(store, rules_file):
+    _, write, _ = rules_file
+    old = store.current
+    write()
+    assert not store.reload_if_changed()
+    assert store.current is old and store.reloads == 0
+
+
+@pytest.mark.parametrize("content", [
+    '{"version": "yarım", "keywords": {"fraud": ["acil"',              # yarım yazılmış dosya
+    json.dumps({"version": "eksik", "keywords": {"fraud": ["acil"]}}),  # eksik kategori
+    "",
+])
+def test_bad_file_keeps_previous_snapshot(store, rules_file, content):
+    _, write, _ = rules_file
+    old = store.current
+    write(content)
+    assert not store.reload_if_changed()         # izleyici hatayı yutar
+    assert store.current is old
+    assert store.last_error and store.status()["last_error"] == store.last_error
+    with pytest.raises(rules.RuleError):         # /admin/rules/reload hatayı döndürür
+        store.reload()
+    assert store.current is old and store.reloads == 0
+
+    write()                                      # düzeltilen dosya sonraki turda yüklenir
+    store.reload_if_changed()
+    assert store.last_error is None
+
+
+def test_missing_file_keeps_previous_snapshot(store, rules_file):
+    path, _, _ = rules_file
+    old = store.current
+    path.unlink()
+    assert not store.reload_if_changed()
+    assert store.current is old and "okunamadı" in store.last_error
@@ -0,0 +1,67 @@
+"""Derlenmiş kural önbelleği: pickle'sız biçim, parmak izi ve dizin izinleri"""
+
+import os
+
+import pytest
+
+import rules
+from text_normalizer import normalize
+
+CATEGORIES = {"fraud": ("acil", "kazandınız", "şifre"), "urgency": ("hemen",), "money": ("para", "tl")}
+DOMAINS = ("bit.ly", "*.tk", "Evil.COM.")
+MESSAGE = "ACİL! KAZANDINIZ, şifrenizi hemen girin: 500 TL"
+
+
+def _compiled_files(directory):
+    return [name for name in os.listdir(directory) if name.startswith("rules-")]
+
+
+def test_cached_tables_match_fresh_compile(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    fresh_matcher, fresh_domains = rules._compile_tables(CATEGORIES, DOMAINS, "fp1", None)
+    rules._compile_tables(CATEGORIES, DOMAINS, "fp1", cache_dir)
+    matcher, domain_index = rules._compile_tables(CATEGORIES, DOMAINS, "fp1", cache_dir)
+
+    folded = normalize(MESSAGE)[1]
+    assert matcher.match(folded) == fresh_matcher.match(folded)
+    for host in ("bit.ly", "a.b.tk", "tk", "evil.com", "x.evil.com", "example.org"):
+        assert domain_index.match(host) == fresh_domains.match(host)
+    assert oct(os.stat(cache_dir).st_mode & 0o777) == oct(0o700)
+
+
+def test_cache_file_is_not_a_pickle(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    rules._compile_tables(CATEGORIES, DOMAINS, "fp1", cache_dir)
+    (name,) = _compiled_files(cache_dir)
+    assert name.endswith(".tbl")
+    with open(os.path.join(cache_dir, name), "rb") as f:
+        assert f.read(8) == b"PSTABLE1"
+
+
+def test_file_with_other_fingerprint_is_ignored(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    rules._compile_tables(CATEGORIES, DOMAINS, "fp1", cache_dir)
+    (name,) = _compiled_files(cache_dir)
+    # Başka kural setinin adına kopyalanmış dosya kullanılmaz
+    os.rename(os.path.join(cache_dir, name), os.path.join(cache_dir, name.replace("fp1", "fp2")))
+    assert rules._load_compiled(os.path.join(cache_dir, name.replace("fp1", "fp2")), "fp2") is None
+
+
+def test_corrupt_file_falls_back_to_compiling(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    rules._compile_tables(CATEGORIES, DOMAINS, "fp1", cache_dir)
+    (name,) = _compiled_files(cache_dir)
+    with open(os.path.join(cache_dir, name), "r+b") as f:
+        f.truncate(100)
+    matcher, _ = rules._compile_tables(CATEGORIES, DOMAINS, "fp1", cache_dir)
+    assert matcher.match("acil")["fraud"] == ["acil"]
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX izinleri")
+def test_world_writable_cache_dir_is_not_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    os.chmod(cache_dir, 0o777)
+    matcher, _ = rules._compile_tables(CATEGORIES, DOMAINS, "fp1", str(cache_dir))
+    assert matcher.match("acil")["fraud"] == ["acil"]
+    assert _compiled_files(cache_dir) == []
@@ -0,0 +1,92 @@
+"""Gönderen hızı: halka sayaçlar, pencere, LRU ve eşik puanlaması"""
+
+import pytest
+
+import scoring
+from sender_velocity import SenderVelocity
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_counts_expire_after_the_window():
+    clock = FakeClock()
+    velocity = SenderVelocity(window_seconds=60, buckets=6, clock=clock)
+    for _ in range(3):
+        velocity.record("a")
+    clock.now = 25                               # üçüncü dilim
+    assert velocity.record("a") == 4
+    clock.now = 65                               # ilk dilim pencereden çıktı
+    assert velocity.count("a") == 1
+    clock.now = 25 + 60                          # tüm dilimler çıktı
+    assert velocity.count("a") == 0
+    assert velocity.record("a") == 1
+
+
+def test_long_idle_sender_starts_from_zero():
+    clock = FakeClock()
+    velocity = SenderVelocity(window_seconds=60, buckets=6, clock=clock)
+    for _ in range(5):
+        velocity.record("a")
+    clock.now = 3600
+    assert velocity.record("a") == 1
+
+
+def test_least_recently_seen_sender_is_evicted_at_capacity():
+    clock = FakeClock()
+    velocity = SenderVelocity(capacity=2, clock=clock)
+    velocity.record("a")
+    velocity.record("a")
+    velocity.record("b")
+    velocity.record("a")                         # a tazelenir; en eski b
+    velocity.record("c")
+    assert len(velocity) == 2 and velocity.evictions == 1
+    assert velocity.count("b") == 0
+    assert velocity.count("a") == 3              # a'nın sayacı c'ye devredilmedi
+    assert velocity.count("c") == 1
+    assert [sender for sender, _ in velocity.top()] == ["a", "c"]
+
+
+@pytest.fixture
+def velocity(monkeypatch):
+    clock = FakeClock()
+    tracker = SenderVelocity(window_seconds=60, clock=clock)
+    monkeypatch.setattr(scoring, "SENDER_VELOCITY", tracker)
+    return tracker
+
+
+def test_suspicious_rate_adds_half_and_critical_rate_full_weight(velocity):
+    rules = scoring.RULE_STORE.current
+    limits, weight = rules.sender_velocity, rules.weights["sender_velocity"]
+    phone = "05321234567"
+
+    for _ in range(limits["suspicious_per_minute"] - 1):
+        assert scoring.check_sender_velocity(phone, rules) == (0, [])
+    score, reasons = scoring.check_sender_velocity(phone, rules)   # dakikada suspicious_per_minute
+    assert score == weight // 2 and "yüksek hızda" in reasons[0]
+
+    for _ in range(limits["critical_per_minute"] - limits["suspicious_per_minute"] - 1):
+        assert scoring.check_sender_velocity(phone, rules)[0] == weight // 2
+    score, reasons = scoring.check_sender_velocity(phone, rules)   # dakikada critical_per_minute
+    assert score == weight and "çok yüksek hızda" in reasons[0]
+
+    # Aynı numaranın başka yazımı aynı sayaca düşer; farklı numara etkilenmez
+    assert scoring.check_sender_velocity("+90 532 123 45 67", rules)[0] == weight
+    assert scoring.check_sender_velocity("05551234567", rules) == (0, [])
+
+
+def test_velocity_score_is_added_to_the_message_verdict(velocity):
+    rules = scoring.RULE_STORE.current
+    clean = scoring.AnalysisResponse(is_fraud=False, risk_score=10, reasons=[scoring.NO_FINDINGS_REASON],
+                                     analysis_type="message")
+    weight = rules.weights["sender_velocity"]
+    response = scoring.apply_sender_velocity(clean, (weight, ["hız"]), rules)
+    assert response.risk_score == min(10 + weight, 100)
+    assert response.reasons == ["hız"]
+    assert response.is_fraud == (response.risk_score >= rules.thresholds["message"])
+    assert scoring.apply_sender_velocity(clean, (0, []), rules) is clean
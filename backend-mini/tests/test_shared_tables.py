@@ -0,0 +1,99 @@
+"""Paylaşılan tablolar: yayınlama / eşleme, dizin izinleri ve kural tablolarının eşdeğerliği"""
+
+import os
+from array import array
+
+import pytest
+
+import rules
+from shared_tables import SharedTables, StringTable, pack_strings, private_directory
+from text_normalizer import normalize
+from url_reputation import DomainIndex, HashedDomainIndex
+
+posix_only = pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX izinleri")
+
+
+def test_publish_and_attach(tmp_path):
+    shared = SharedTables(str(tmp_path / "shared"))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"count": 3}, {"values": array("Q", [1, 2, 3])}
+
+    first = shared.attach("numbers", build)
+    second = shared.attach("numbers", build)
+    assert builds == [1]                       # ikinci çağrı hazır tabloyu eşler
+    assert list(second.array("values")) == [1, 2, 3]
+    assert second.meta["count"] == first.meta["count"] == 3
+
+    shared.publish("numbers", {"count": 1}, {"values": array("Q", [7])})
+    assert list(shared.open("numbers").array("values")) == [7]
+    assert len([name for name in os.listdir(shared.root) if name.endswith(".tbl")]) == 1
+
+
+def test_accept_rejects_stale_table(tmp_path):
+    shared = SharedTables(str(tmp_path / "shared"))
+    shared.publish("numbers", {"count": 1}, {"values": array("Q", [1])})
+    table = shared.attach("numbers", lambda: ({"count": 2}, {"values": array("Q", [1, 2])}),
+                          accept=lambda meta: meta["count"] == 2)
+    assert list(table.array("values")) == [1, 2]
+
+
+def test_string_table_round_trip():
+    strings = ["bit.ly", "şüpheli.com", ""]
+    table = StringTable(*pack_strings(strings))
+    assert list(table) == strings
+    assert table[-2] == "şüpheli.com"
+
+
+@posix_only
+def test_private_directory_is_created_0700(tmp_path):
+    path = private_directory(str(tmp_path / "new"))
+    assert os.stat(path).st_mode & 0o777 == 0o700
+
+
+@posix_only
+def test_writable_directory_is_refused(tmp_path):
+    directory = tmp_path / "planted"
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        private_directory(str(directory))
+    with pytest.raises(PermissionError):
+        SharedTables(str(directory)).attach("numbers", lambda: ({}, {"values": array("Q")}))
+
+
+@posix_only
+def test_rules_fall_back_to_private_tables_on_unsafe_directory(tmp_path):
+    directory = tmp_path / "planted"
+    directory.mkdir()
+    os.chmod(directory, 0o777)
+    shared = SharedTables(str(directory))
+    assert rules._shared_rule_tables(shared, {"fraud": ("acil",)}, ("bit.ly",), "fp") is None
+    assert "planted" in shared.last_error
+    assert os.listdir(directory) == []
+
+
+def test_shared_rule_tables_match_private_ones(tmp_path):
+    shared = SharedTables(str(tmp_path / "shared"))
+    categories = {"fraud": ("acil", "kazandınız"), "urgency": ("hemen",), "money": ("para",)}
+    domains = ("bit.ly", "*.tk", "evil.com")
+    matcher, domain_index, domain_list = rules._shared_rule_tables(shared, categories, domains, "fp")
+    private_matcher, private_index = rules._compile_tables(categories, domains, "fp", None)
+
+    folded = normalize("ACİL KAZANDINIZ, hemen para")[1]
+    assert matcher.match(folded) == private_matcher.match(folded)
+    for host in ("bit.ly", "x.bit.ly", "a.tk", "tk", "evil.com", "good.org"):
+        assert domain_index.match(host) == private_index.match(host)
+    assert list(domain_list) == list(domains)
+    assert not any(name.endswith(".pickle") for name in os.listdir(shared.root))
+
+
+def test_hashed_domain_index_matches_domain_index():
+    index = DomainIndex(["bit.ly", "*.tk", "a.b.example.com", "*.evil.co"])
+    hashed = HashedDomainIndex.from_index(index)
+    for host in ("bit.ly", "x.bit.ly", "tk", "free.tk", "b.example.com", "a.b.example.com",
+                 "z.a.b.example.com", "evil.co", "x.evil.co", "example.org"):
+        assert hashed.match(host) == index.match(host), host
+    assert len(hashed) == len(index)
@@ -0,0 +1,41 @@
+"""Soğuk başlangıç bütçeleri: import ve ilk yanıt süresi (benchmarks/bench_startup.py)
+
+Her ölçüm yeni bir süreçte yapılır; ısınma turundan sonra üç ölçümün
+medyanı bench_startup.DEFAULT_BUDGETS ile karşılaştırılır.
+"""
+
+import os
+import socket
+import statistics
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import bench_startup  # noqa: E402
+
+REPEAT = 3
+
+
+def _median_ms(measure) -> float:
+    measure()  # ısınma: .pyc ve derlenmiş kural önbelleği oluşsun
+    return statistics.median(measure() for _ in range(REPEAT))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize("module", ["scoring", "main"])
+def test_import_budget(module):
+    budget = bench_startup.DEFAULT_BUDGETS[f"import_{module}"]
+    assert _median_ms(lambda: bench_startup.import_ms(module)) <= budget
+
+
+def test_first_response_budget():
+    port = _free_port()
+    budget = bench_startup.DEFAULT_BUDGETS["first_response"]
+    assert _median_ms(lambda: bench_startup.first_response_ms("127.0.0.1", port)) <= budget
@@ -0,0 +1,41 @@
+"""Türkçe normalizasyon: canonical / folded biçimler ve keyword yazımları"""
+
+from text_normalizer import keyword_variants, normalize
+
+
+def test_turkish_case_rules():
+    assert normalize("ACİL")[0] == "acil"
+    assert normalize("KAZANDINIZ")[0] == "kazandınız"          # I -> ı
+    assert normalize("KAZANDINIZ")[1] == "kazandiniz"           # katlanmış biçimde I -> i
+
+
+def test_ascii_fast_path_matches_general_path():
+    for text in ("Hesabiniz BLOKE", "IBAN gonderin", "acil"):
+        canonical, folded = normalize(text)
+        assert folded == text.lower()
+        assert canonical == text.replace("I", "ı").lower()
+
+
+def test_folding_keeps_dotless_i():
+    canonical, folded = normalize("Şifrenizi güncelleyin, yapın")
+    assert canonical == "şifrenizi güncelleyin, yapın"
+    assert folded == "sifrenizi guncelleyin, yapın"             # "yapin" -> "pin" yanlış eşleşmesin
+
+
+def test_invisible_characters_are_removed():
+    assert normalize("a\u200bc\u00adil\ufeff")[0] == "acil"
+
+
+def test_homoglyphs_and_fullwidth_letters():
+    assert normalize("\u0430cil")[1] == "acil"             # Kiril "а"
+    assert normalize("\uff21\uff23\u0130\uff2c")[0] == "acil"  # tam genişlik
+
+
+def test_decomposed_letters_are_composed():
+    assert normalize("I\u0307")[0] == "i"                  # I + birleşik nokta = İ
+    assert normalize("s\u0327ifre")[1] == "sifre"          # s + çengel = ş
+
+
+def test_keyword_variants():
+    assert keyword_variants("Kazandınız") == ("kazandınız", "kazandiniz")
+    assert keyword_variants("şifre") == ("sifre",)
@@ -0,0 +1,78 @@
+"""Tehdit listesi indeksi: kanonik URL, arama sırası ve mmap'li dosya"""
+
+import pytest
+
+from threat_feed import ThreatFeed, ThreatFeedIndex, build_index, canonical_url, lookup_keys, read_feed_file
+
+
+@pytest.mark.parametrize("url, key", [
+    ("https://www.Evil.COM/giris/", "evil.com/giris"),
+    ("http://evil.com:8080/giris?id=1#x", "evil.com/giris?id=1"),
+    ("evil.com", "evil.com"),
+    ("http://user@evil.com./", "evil.com"),
+    ("http://[2001:db8::1]/x", "2001:db8::1/x"),
+    ("http:///yol", None),
+])
+def test_canonical_url(url, key):
+    assert canonical_url(url) == key
+
+
+def test_lookup_keys_go_from_specific_to_general():
+    assert lookup_keys("https://evil.com/giris?id=1") == ["evil.com/giris?id=1", "evil.com/giris", "evil.com"]
+    assert lookup_keys("https://evil.com/") == ["evil.com"]
+    assert lookup_keys("") == []
+
+
+def test_index_matches_most_specific_listed_key(tmp_path):
+    path = str(tmp_path / "feed.idx")
+    result = build_index([("a", ["https://evil.com/giris?id=1", "http://kargo.tk", "evil.com/giris?id=1", "::"]),
+                          ("b", ["http://phish.example/login"])], path)
+    assert result["entries"] == 3                # tekrar eden URL bir kez yazılır
+    assert result["sources"]["a"] == {"urls": 4, "skipped": 1}
+
+    index = ThreatFeedIndex(path)
+    assert len(index) == 3
+    assert index.match("https://www.evil.com/giris?id=1") == "evil.com/giris?id=1"
+    assert index.match("https://evil.com/giris?id=2") is None    # sadece o sorgu listede
+    assert index.match("https://kargo.tk/takip?no=5") == "kargo.tk"  # çıplak host her yolu kapsar
+    assert index.match("https://phish.example/login/") == "phish.example/login"
+    assert index.match("https://phish.example/") is None
+
+
+def test_empty_and_corrupt_index(tmp_path):
+    path = tmp_path / "feed.idx"
+    build_index([("a", [])], str(path))
+    assert ThreatFeedIndex(str(path)).match("http://evil.com") is None
+    path.write_bytes(path.read_bytes()[:-1] + b"x" * 3)
+    with pytest.raises(ValueError):
+        ThreatFeedIndex(str(path))
+
+
+def test_feed_reloads_when_file_changes(tmp_path):
+    path = str(tmp_path / "feed.idx")
+    feed = ThreatFeed(path)                      # dosya yok: boş liste
+    assert feed.match("http://evil.com") is None and feed.generation == 0
+
+    build_index([("a", ["http://evil.com"])], path)
+    assert feed.reload_if_changed() and feed.generation == 1
+    assert feed.match("http://evil.com/x") == "evil.com"
+    assert not feed.reload_if_changed()
+
+    with open(path, "ab") as f:                  # bozuk dosya: eski indeksle devam
+        f.write(b"x")
+    assert not feed.reload_if_changed()
+    assert feed.last_error and feed.match("http://evil.com") == "evil.com"
+
+    build_index([("a", ["http://other.com"])], path)
+    assert feed.reload_if_changed() and feed.generation == 2
+    assert feed.match("http://evil.com") is None
+
+
+def test_read_feed_file_formats(tmp_path):
+    txt = tmp_path / "openphish.txt"
+    txt.write_text("# yorum\nhttp://a.com/x\n\nhttp://b.com\n", encoding="utf-8")
+    assert list(read_feed_file(str(txt))) == ["http://a.com/x", "http://b.com"]
+
+    csv_path = tmp_path / "urlhaus.csv"
+    csv_path.write_text('# id,dateadded,url,url_status\n"1","2024","http://c.com/p","online"\n', encoding="utf-8")
+    assert list(read_feed_file(str(csv_path))) == ["http://c.com/p"]
@@ -0,0 +1,52 @@
+"""URL itibar motoru: host ayrıştırma ve domain/wildcard kuralları"""
+
+import pytest
+
+from url_reputation import DomainIndex, extract_host
+
+
+@pytest.mark.parametrize("url, host", [
+    ("https://Bit.ly/abc", "bit.ly"),
+    ("bit.ly/abc", "bit.ly"),                    # şemasız URL
+    ("http://user:pw@x.example.com:8080/p?q=1", "x.example.com"),
+    ("https://example.com./", "example.com"),    # sondaki nokta
+    ("https://[::1", None),                      # bozuk URL istisna fırlatmaz
+    ("", None),
+])
+def test_extract_host(url, host):
+    assert extract_host(url) == host
+
+
+def test_domain_rule_covers_subdomains():
+    index = DomainIndex(["bit.ly", "Example.COM."])
+    assert index.match("bit.ly") == "bit.ly"
+    assert index.match("a.b.bit.ly") == "bit.ly"
+    assert index.match("example.com") == "example.com"
+    assert index.match("notbit.ly") is None
+
+
+def test_wildcard_rule_covers_only_subdomains():
+    index = DomainIndex(["*.tk"])
+    assert index.match("tk") is None
+    assert index.match("kargo.tk") == "*.tk"
+
+
+def test_most_specific_rule_wins():
+    index = DomainIndex(["example.com", "login.example.com"])
+    assert index.match("a.login.example.com") == "login.example.com"
+
+
+def test_host_match_is_not_a_substring_scan():
+    index = DomainIndex(["t.co"])
+    assert index.match_url("https://microsoft.com/") is None
+    assert index.match_url("https://t.co/xyz") == "t.co"
+    assert index.match_url("https://example.com/?next=t.co") is None
+
+
+def test_dump_load_round_trip():
+    index = DomainIndex(["bit.ly", "*.tk", "", "  "])
+    assert len(index) == 2
+    loaded = DomainIndex.load(index.dump())
+    assert len(loaded) == 2
+    for host in ("bit.ly", "x.bit.ly", "tk", "a.tk", "example.com"):
+        assert loaded.match(host) == index.match(host)
@@ -0,0 +1,73 @@
+"""Karar önbelleği: LRU / TTL / sürüm geçersizleştirme ve önbellek anahtarı"""
+
+import time
+
+import pytest
+
+import scoring
+from verdict_cache import VerdictCache, message_hash
+
+
+def test_hit_and_miss_counters():
+    cache = VerdictCache()
+    assert cache.get("a", 1) is None
+    cache.put("a", "karar", 1)
+    assert cache.get("a", 1) == "karar"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_expires_entries():
+    cache = VerdictCache(ttl_seconds=0.01)
+    cache.put("a", "karar", 1)
+    time.sleep(0.02)
+    assert cache.get("a", 1) is None
+    assert cache.expirations == 1
+
+
+def test_newer_version_invalidates_and_older_version_is_ignored():
+    cache = VerdictCache()
+    cache.put("a", "eski", 1)
+    assert cache.get("a", 2) is None          # yeni sürüm: önbellek temizlenir
+    assert cache.invalidations == 1
+    cache.put("a", "yeni", 2)
+    cache.put("a", "geç kalan", 1)            # eski snapshot'la hesaplanan karar yazılmaz
+    assert cache.get("a", 1) is None          # eski sürümle sorgu ıska sayılır
+    assert cache.get("a", 2) == "yeni"
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = VerdictCache(max_bytes=2000)
+    for key in ("a", "b", "c"):
+        cache.put(key, key, 1, size=300)
+    assert cache.get("a", 1) is None
+    assert cache.get("c", 1) == "c"
+    assert cache.evictions >= 1
+
+
+def test_message_hash_separates_sender():
+    assert message_hash("mesaj", "05321234567") != message_hash("mesaj", None)
+    assert len(message_hash("mesaj")) == 64
+
+
+def test_verdict_key_normalizes_sender_but_not_message():
+    key = scoring.verdict_key("acil hesabınız bloke", "+90 532 123 45 67")
+    assert scoring.verdict_key("acil hesabınız bloke", "05321234567") == key
+    assert scoring.verdict_key("acil hesabınız bloke", "5321234567") == key
+    assert scoring.verdict_key("acil hesabınız bloke", "05321234568") != key
+    assert scoring.verdict_key("acil hesabınız bloke") != key
+    # Skorlayıcılar ham metni okur; yazım farkı ayrı anahtardır
+    assert scoring.verdict_key("ACİL hesabınız bloke", "05321234567") != key
+    assert scoring.verdict_key("acil\u200b hesabınız bloke", "05321234567") != key
+
+
+@pytest.mark.parametrize("planted, message", [
+    ("Bilgi HTTPS://example.com/a", "Bilgi https://example.com/a"),   # URL deseni küçük harfli
+    ("Ara 0532\u200b1234567", "Ara 05321234567"),                     # araya görünmez karakter
+])
+def test_harmless_spelling_does_not_plant_a_verdict(planted, message):
+    assert scoring.VERDICT_CACHE is not None
+    expected = scoring.calculate_risk_score(message)[0]
+    assert expected > scoring.calculate_risk_score(planted)[0]
+    scoring.score_message(scoring.MessageAnalysisRequest(message=planted))
+    response = scoring.score_message(scoring.MessageAnalysisRequest(message=message))
+    assert response.risk_score == expected
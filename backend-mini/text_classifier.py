@@ -0,0 +1,511 @@
+"""
+Patterna Shield Mini - Metin Sınıflandırıcı (Öğrenilmiş Skor)
+=============================================================
+
+Kural puanının yanında çalışan doğrusal bir sınıflandırıcı: mesajın
+katlanmış metni (text_normalizer) hashing vectorizer ile sabit boyutlu
+seyrek bir vektöre çevrilir, ağırlık dizisiyle çarpılır ve lojistik
+fonksiyonla dolandırıcılık olasılığına dönüşür.
+
+Özellikler (hepsi aynı 2^bits boyutlu ağırlık dizisine hash'lenir):
+- karakter 3/4/5-gram'ları (" hesab", "bit.l" ...; yazım varyasyonlarına dayanıklı)
+- kelimeler ve ardışık kelime çiftleri
+Rakamlar "0"a çevrilir (tutar / kod / numara değişimi özelliği değiştirmez).
+Bir mesajın özellik değerleri 1/sqrt(özellik sayısı)'dır (uzun mesaj baskın olmaz).
+
+Toplu yol: batch'teki tüm mesajlar tek bir kod noktası dizisine eklenir,
+n-gram / kelime hash'leri polinom önek hash'i ile NumPy'de bir kerede
+hesaplanır ve skorlar tek bir `bincount` (seyrek nokta çarpımı) ile toplanır.
+Mesaj başına Python döngüsü yoktur (normalizasyon hariç).
+
+Model dosyası: başlık + metadata (JSON) + float32 ağırlıklar (2^18 = 1 MB).
+Worker'lar dosyayı mmap ile eşler (sayfa önbelleğinden paylaşılır); dosya
+değişince izleyici yeni modeli eşler. Dosya yoksa aşama atlanır. NumPy
+opsiyoneldir: model yüklenmedikçe import edilmez.
+
+Eğitim (offline, etiketli JSONL veya sample_data.json biçimi):
+    python benchmarks/traffic.py --count 50000 > trafik.jsonl
+    python text_classifier.py train trafik.jsonl examples/sample_data.json
+    python text_classifier.py predict "Hesabınız bloke oldu, hemen tıklayın"
+    python text_classifier.py stats
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from phone_blacklist import DATA_DIR
+from phone_numbers import load_numpy
+from text_normalizer import normalize
+
+# Model dosyası (PATTERNA_TEXT_MODEL ile değiştirilebilir; yoksa aşama atlanır)
+DEFAULT_MODEL_PATH = os.environ.get("PATTERNA_TEXT_MODEL") or os.path.join(DATA_DIR, "text_classifier.model")
+
+# Başlık: magic, hash bit sayısı, özellik sürümü, bias, metadata (JSON) uzunluğu.
+# Ağırlıklar makinenin bayt sırasıyla (little-endian) float32 yazılır.
+MAGIC = b"PSTCLF01"
+HEADER = struct.Struct("<8sIIdQ")
+# Özellik çıkarımı değişince artırılmalı (eski modeller yüklenmez)
+FEATURE_VERSION = 1
+
+DEFAULT_BITS = 18
+CHAR_NGRAMS = (3, 4, 5)
+# Mesajın ilk MAX_CHARS karakteri kullanılır (çok uzun mesajlar maliyeti büyütmesin)
+MAX_CHARS = 1000
+# Bir seferde işlenen en fazla karakter (ara dizilerin belleği sınırlı kalır)
+CHUNK_CHARS = 1 << 18
+
+# Polinom hash tabanı (tek sayı: 2^64 modunda tersi vardır) ve özellik türü tuzları
+_BASE = 0x100000001B3
+_BASE_INV = pow(_BASE, -1, 1 << 64)
+_MIX = 0x9E3779B97F4A7C15
+_PAIR = 0xC2B2AE3D27D4EB4F
+_WORD_SALT = 0x5BD1E995
+_PAIR_SALT = 0x27D4EB2F165667C5
+
+_powers = None       # (BASE^i, BASE^-i) dizileri, i < CHUNK_CHARS + 1
+_word_chars = None   # kod noktası (BMP) -> kelime karakteri mi
+
+
+# ---------------------------------------------------------------------------
+# Özellik çıkarımı
+# ---------------------------------------------------------------------------
+
+def _tables():
+    global _powers, _word_chars
+    if _powers is None:
+        np = load_numpy()
+        size = CHUNK_CHARS + MAX_CHARS + 8
+        base = np.full(size, _BASE, dtype=np.uint64)
+        base[0] = 1
+        inverse = np.full(size, _BASE_INV, dtype=np.uint64)
+        inverse[0] = 1
+        with np.errstate(over="ignore"):
+            _powers = (np.cumprod(base), np.cumprod(inverse))
+        table = np.array([chr(i).isalnum() for i in range(0x10000)], dtype=bool)
+        table[0xFFFF] = False  # BMP dışı karakterler buraya kırpılır
+        _word_chars = table
+    return _powers, _word_chars
+
+
+def _prepare(folded: str) -> str:
+    folded = folded[:MAX_CHARS]
+    return folded.replace("\0", " ") if "\0" in folded else folded
+
+
+def hash_features(folded_texts: Sequence[str], bits: int):
+    """Katlanmış metinler -> (mesaj indeksleri, ağırlık indeksleri, mesaj başına ölçek)"""
+    np = load_numpy()
+    doc_parts, bucket_parts = [], []
+    start = 0
+    while start < len(folded_texts):
+        # Parça: toplam karakteri CHUNK_CHARS'ı geçmeyen ardışık mesajlar
+        end, chars = start, 0
+        while end < len(folded_texts):
+            chars += min(len(folded_texts[end]), MAX_CHARS) + 3
+            if chars > CHUNK_CHARS and end > start:
+                break
+            end += 1
+        docs, buckets = _chunk_features(folded_texts[start:end], bits)
+        doc_parts.append(docs + start)
+        bucket_parts.append(buckets)
+        start = end
+    if not doc_parts:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    docs = np.concatenate(doc_parts)
+    buckets = np.concatenate(bucket_parts)
+    counts = np.bincount(docs, minlength=len(folded_texts))
+    scales = (1.0 / np.sqrt(np.maximum(counts, 1))).astype(np.float32)
+    return docs, buckets, scales
+
+
+def _chunk_features(folded_texts: Sequence[str], bits: int):
+    np = load_numpy()
+    (powers, inverses), word_chars = _tables()
+    # Her mesaj boşlukla çevrilir, mesajlar NUL ile ayrılır: " a \0 b \0 c "
+    text = " " + " \0 ".join(_prepare(t) for t in folded_texts) + " "
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    codes = np.where((codes >= 48) & (codes <= 57), np.uint32(48), codes)
+    n = len(codes)
+    # seps[i]: i. karakterden önceki ayırıcı sayısı = karakterin mesaj indeksi
+    # (tek mesajda ayırıcı yoktur; tekil skorlama yolu maskeleri atlar)
+    single = len(folded_texts) == 1
+    if not single:
+        seps = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(codes == 0, out=seps[1:])
+    with np.errstate(over="ignore"):
+        prefix = np.zeros(n + 1, dtype=np.uint64)
+        np.cumsum(codes.astype(np.uint64) * powers[:n], out=prefix[1:])
+
+        def span_hash(begin, length):
+            # sum(codes[begin + k] * BASE^k): önek farkı, BASE^begin'e bölünmüş
+            return (prefix[begin + length] - prefix[begin]) * inverses[begin]
+
+        docs, hashes = [], []
+        for size in CHAR_NGRAMS:
+            if n < size:
+                continue
+            begin = np.arange(n - size + 1)
+            if not single:
+                begin = begin[seps[begin + size] == seps[begin]]
+            docs.append(np.zeros(len(begin), np.int64) if single else seps[begin])
+            hashes.append(span_hash(begin, size) ^ np.uint64(size))
+
+        # Metin boşlukla başlayıp bittiği için her kelimenin iki kenarı da içeridedir
+        is_word = word_chars[np.minimum(codes, 0xFFFF)]
+        word_start = np.flatnonzero(is_word[1:] > is_word[:-1]) + 1
+        word_end = np.flatnonzero(is_word[:-1] > is_word[1:]) + 1
+        if len(word_start):
+            words = span_hash(word_start, word_end - word_start) ^ np.uint64(_WORD_SALT)
+            pairs = (words[:-1] * np.uint64(_PAIR) + words[1:]) ^ np.uint64(_PAIR_SALT)
+            if single:
+                docs.append(np.zeros(len(words) + len(pairs), np.int64))
+            else:
+                word_docs = seps[word_start]
+                same_doc = word_docs[1:] == word_docs[:-1]
+                pairs = pairs[same_doc]
+                docs += [word_docs, word_docs[1:][same_doc]]
+            hashes += [words, pairs]
+
+        if not hashes:  # sadece boş / çok kısa mesajlar
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        hashes = np.concatenate(hashes) * np.uint64(_MIX)
+    buckets = (hashes >> np.uint64(64 - bits)).astype(np.int64)
+    return np.concatenate(docs), buckets
+
+
+def sigmoid(logits):
+    np = load_numpy()
+    return 1.0 / (1.0 + np.exp(-np.clip(logits, -30, 30)))
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+class TextClassifierModel:
+    """Eşlenmiş (mmap) model dosyası üzerinde toplu tahmin"""
+
+    def __init__(self, path: str):
+        np = load_numpy()
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"Geçersiz model dosyası: {path}")
+            magic, self.bits, feature_version, self.bias, meta_len = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"Geçersiz model dosyası: {path}")
+            if feature_version != FEATURE_VERSION:
+                raise ValueError(f"Model özellik sürümü {feature_version}, beklenen {FEATURE_VERSION}: {path}")
+            self.meta = json.loads(f.read(meta_len) or b"{}")
+            offset = HEADER.size + meta_len
+            if stat.st_size != offset + 4 * (1 << self.bits):
+                raise ValueError(f"Eksik model dosyası: {path}")
+            self.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.weights = np.frombuffer(self._mmap, dtype=np.float32, count=1 << self.bits, offset=offset)
+        _tables()  # ilk tahmin isteği tablo kurulumunu (~35ms) beklemesin
+
+    def predict_folded(self, folded_texts: Sequence[str]):
+        """Katlanmış metinler -> dolandırıcılık olasılıkları (NumPy dizisi)"""
+        np = load_numpy()
+        docs, buckets, scales = hash_features(folded_texts, self.bits)
+        sums = np.bincount(docs, weights=self.weights[buckets], minlength=len(folded_texts))
+        return sigmoid(self.bias + sums * scales)
+
+    def predict(self, messages: Sequence[str]):
+        return self.predict_folded([normalize(message)[1] for message in messages])
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "bits": self.bits,
+            "bytes": self.signature[2],
+            **self.meta,
+        }
+
+
+def save_model(path: str, weights, bias: float, meta: Dict[str, Any]) -> None:
+    """Modeli yeni bir dosyaya yazıp atomik olarak değiştir"""
+    np = load_numpy()
+    bits = int(len(weights)).bit_length() - 1
+    if len(weights) != 1 << bits:
+        raise ValueError("Ağırlık sayısı 2'nin kuvveti olmalı")
+    data = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    data += b" " * (-len(data) % 8)  # ağırlıklar 8 byte hizalı başlar
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".text_classifier-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, bits, FEATURE_VERSION, float(bias), len(data)))
+            f.write(data)
+            np.ascontiguousarray(weights, dtype="<f4").tofile(f)
+        os.chmod(tmp_path, 0o644)  # mkstemp 0600 açar; worker'lar başka kullanıcıyla okuyabilmeli
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class TextClassifier:
+    """Süreç genelindeki model: dosya yoksa boş, değişince yeniden eşlenir"""
+
+    def __init__(self, path: str = DEFAULT_MODEL_PATH):
+        self.path = path
+        self.model: Optional[TextClassifierModel] = None
+        # Model her değiştiğinde artar (karar önbelleği geçersiz kılınır)
+        self.generation = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.reload_if_changed()
+
+    def predict_folded(self, folded_texts: Sequence[str]) -> Optional[List[float]]:
+        """Katlanmış metinlerin olasılıkları; model yoksa None"""
+        model = self.model
+        if model is None:
+            return None
+        return model.predict_folded(folded_texts).tolist()
+
+    def predict(self, messages: Sequence[str]) -> Optional[List[float]]:
+        if self.model is None:
+            return None
+        return self.predict_folded([normalize(message)[1] for message in messages])
+
+    def reload_if_changed(self) -> bool:
+        """Dosya eklendi / değişti / silindiyse modeli değiştir"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+                signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+            current = self.model.signature if self.model is not None else None
+            if signature == current:
+                return False
+            try:
+                # Eski eşleme kapatılmaz: tahmindeki thread'ler bitince GC bırakır
+                self.model = TextClassifierModel(self.path) if signature is not None else None
+            except (OSError, ValueError, ImportError) as e:
+                # Yarım / bozuk dosya veya NumPy yok: eski modelle devam edilir
+                self.last_error = str(e)
+                return False
+            self.last_error = None
+            self.generation += 1
+            return True
+
+    def start_watcher(self, interval: float) -> None:
+        """Dosyayı `interval` saniyede bir kontrol eden arka plan thread'i"""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name="text-classifier-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        model = self.model
+        return {
+            "loaded": model is not None,
+            **(model.info() if model is not None else {"path": self.path}),
+            "generation": self.generation,
+            "last_error": self.last_error,
+        }
+
+
+_classifier: Optional[TextClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_text_classifier() -> TextClassifier:
+    """Süreç genelindeki sınıflandırıcı (ilk kullanımda eşlenir)"""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = TextClassifier()
+    return _classifier
+
+
+# ---------------------------------------------------------------------------
+# Eğitim
+# ---------------------------------------------------------------------------
+
+def read_labeled(path: str) -> Iterator[Tuple[str, bool]]:
+    """Etiketli mesajlar -> (mesaj, dolandırıcılık mı).
+
+    .jsonl: satır başına {"message": ..., "is_fraud": true/false} (traffic.py çıktısı)
+    .json : sample_data.json biçimi (test_messages[].data.message / expected_result.is_fraud)
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            data = json.load(f)
+            for item in data.get("test_messages", []):
+                message = item.get("data", {}).get("message")
+                label = item.get("expected_result", {}).get("is_fraud")
+                if isinstance(message, str) and isinstance(label, bool):
+                    yield message, label
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            message, label = record.get("message"), record.get("is_fraud")
+            if isinstance(message, str) and isinstance(label, bool):
+                yield message, label
+
+
+def train(samples: Sequence[Tuple[str, bool]], bits: int = DEFAULT_BITS, epochs: int = 5,
+          batch_size: int = 256, learning_rate: float = 0.5, l2: float = 1e-6, seed: int = 0):
+    """Lojistik regresyon (mini-batch AdaGrad) -> (ağırlıklar, bias)"""
+    np = load_numpy()
+    docs, buckets, scales = hash_features([normalize(text)[1] for text, _ in samples], bits)
+    labels = np.array([label for _, label in samples], dtype=np.float64)
+    # Özellikleri mesaja göre sırala: bir mini-batch'in özellikleri ardışık bir dilimdir
+    order = np.argsort(docs, kind="stable")
+    docs, buckets = docs[order], buckets[order]
+    values = scales[docs].astype(np.float64)
+    indptr = np.searchsorted(docs, np.arange(len(samples) + 1))
+
+    dim = 1 << bits
+    weights = np.zeros(dim)
+    squared = np.full(dim, 1e-8)
+    bias, bias_squared = 0.0, 1e-8
+    batches = list(range(0, len(samples), batch_size))
+    rng = random.Random(seed)
+    for _ in range(epochs):
+        rng.shuffle(batches)
+        for first in batches:
+            last = min(first + batch_size, len(samples))
+            lo, hi = indptr[first], indptr[last]
+            batch_docs = docs[lo:hi] - first
+            batch_buckets = buckets[lo:hi]
+            batch_values = values[lo:hi]
+            logits = bias + np.bincount(batch_docs, weights=weights[batch_buckets] * batch_values,
+                                        minlength=last - first)
+            errors = sigmoid(logits) - labels[first:last]
+            # Sadece batch'te geçen ağırlıklar güncellenir (L2 de onlara uygulanır)
+            touched, inverse = np.unique(batch_buckets, return_inverse=True)
+            grad = np.bincount(inverse, weights=errors[batch_docs] * batch_values, minlength=len(touched))
+            grad = grad / (last - first) + l2 * weights[touched]
+            squared[touched] += grad * grad
+            weights[touched] -= learning_rate * grad / np.sqrt(squared[touched])
+            bias_grad = float(errors.mean())
+            bias_squared += bias_grad * bias_grad
+            bias -= learning_rate * bias_grad / bias_squared ** 0.5
+    return weights.astype(np.float32), bias
+
+
+def evaluate(probabilities, labels: Sequence[bool]) -> Dict[str, float]:
+    np = load_numpy()
+    labels = np.asarray(labels, dtype=bool)
+    predicted = np.asarray(probabilities) >= 0.5
+    tp = int((predicted & labels).sum())
+    fp = int((predicted & ~labels).sum())
+    fn = int((~predicted & labels).sum())
+    p = np.clip(np.asarray(probabilities, dtype=np.float64), 1e-7, 1 - 1e-7)
+    return {
+        "samples": int(len(labels)),
+        "accuracy": round(float((predicted == labels).mean()), 4) if len(labels) else 0.0,
+        "precision": round(tp / (tp + fp), 4) if tp + fp else 0.0,
+        "recall": round(tp / (tp + fn), 4) if tp + fn else 0.0,
+        "log_loss": round(float(-(labels * np.log(p) + ~labels * np.log(1 - p)).mean()), 4) if len(labels) else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metin sınıflandırıcı (hashing + lojistik regresyon)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Model dosyası")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train_cmd = sub.add_parser("train", help="Etiketli verilerden modeli eğit")
+    train_cmd.add_argument("paths", nargs="+", help="Etiketli .jsonl veya sample_data biçiminde .json dosyaları")
+    train_cmd.add_argument("--bits", type=int, default=DEFAULT_BITS, help="Ağırlık dizisi boyutu (2^bits)")
+    train_cmd.add_argument("--epochs", type=int, default=5)
+    train_cmd.add_argument("--learning-rate", type=float, default=0.5)
+    train_cmd.add_argument("--l2", type=float, default=1e-6)
+    train_cmd.add_argument("--holdout", type=float, default=0.2, help="Değerlendirmeye ayrılan oran")
+    train_cmd.add_argument("--seed", type=int, default=0)
+
+    sub.add_parser("stats", help="Model bilgileri")
+
+    predict_cmd = sub.add_parser("predict", help="Mesajların dolandırıcılık olasılığı")
+    predict_cmd.add_argument("messages", nargs="+")
+
+    args = parser.parse_args()
+
+    if args.command == "train":
+        if not 10 <= args.bits <= 24:
+            parser.error("--bits 10-24 aralığında olmalı")
+        samples = []
+        sources = {}
+        for path in args.paths:
+            before = len(samples)
+            samples.extend(read_labeled(path))
+            sources[os.path.basename(path)] = len(samples) - before
+        if not samples:
+            print("Etiketli mesaj bulunamadı", file=sys.stderr)
+            sys.exit(1)
+        random.Random(args.seed).shuffle(samples)
+        held = int(len(samples) * args.holdout) if len(samples) > 1 else 0
+        train_samples, test_samples = samples[held:], samples[:held]
+
+        started = time.perf_counter()
+        weights, bias = train(train_samples, args.bits, args.epochs, learning_rate=args.learning_rate,
+                              l2=args.l2, seed=args.seed)
+        seconds = time.perf_counter() - started
+        meta = {
+            "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "sources": sources,
+            "train_samples": len(train_samples),
+            "fraud_ratio": round(sum(label for _, label in train_samples) / len(train_samples), 4),
+            "epochs": args.epochs,
+        }
+        if test_samples:
+            np = load_numpy()
+            docs, buckets, scales = hash_features([normalize(text)[1] for text, _ in test_samples], args.bits)
+            sums = np.bincount(docs, weights=weights[buckets], minlength=len(test_samples))
+            meta["holdout"] = evaluate(sigmoid(bias + sums * scales), [label for _, label in test_samples])
+        save_model(args.model, weights, bias, meta)
+        print(f"✅ {len(train_samples):,} mesajla eğitildi ({seconds:.1f}s), "
+              f"{os.path.getsize(args.model) / 2**20:.1f} MB -> {args.model}")
+        if "holdout" in meta:
+            print(f"   holdout: {json.dumps(meta['holdout'], ensure_ascii=False)}")
+
+    if not os.path.exists(args.model):
+        print(f"Model bulunamadı: {args.model}", file=sys.stderr)
+        sys.exit(1)
+    model = TextClassifierModel(args.model)
+
+    if args.command == "stats":
+        print(json.dumps(model.info(), ensure_ascii=False, indent=2))
+    if args.command == "predict":
+        for message, probability in zip(args.messages, model.predict(args.messages)):
+            print(f"{probability * 100:5.1f}%  {message}")
+
+
+if __name__ == "__main__":
+    main()
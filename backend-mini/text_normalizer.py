@@ -0,0 +1,148 @@
+"""
+Patterna Shield Mini - Türkçe Metin Normalizasyonu
+==================================================
+
+`str.lower()` Türkçe büyük/küçük harf kurallarını bilmez: "ACİL" ->
+"aci̇l" (i + birleşik nokta) olur ve "acil" keyword'ü kaçar. Dolandırıcılar
+ayrıca filtreleri atlatmak için benzer görünen harfler (Kiril "а", Yunan
+"ο"), tam genişlikli karakterler ("ＡＣİＬ"), sıfır genişlikli karakterler
+("a<U+200B>cil") ve ASCII'leştirilmiş yazım ("kazandiniz", "sifre") kullanır.
+
+Mesaj bir kez normalize edilir ve iki biçim üretilir:
+
+- canonical : NFC, görünmez karakterler silinmiş, benzer harfler Latin'e
+              çevrilmiş, Türkçe kurallarla küçük harf (I -> ı, İ -> i)
+- folded    : eşleştirme biçimi; aksanlar ASCII'ye katlanır (ş->s, ğ->g,
+              ü->u, ö->o, ç->c, â->a, é->e, ...), büyük I -> i olur.
+              Küçük "ı" korunur: "yapın" -> "yapin" olsaydı "pin"
+              keyword'ü her "yapın"da eşleşirdi. Büyük harfle yazılmış I'nın
+              ı mı i mi olduğu bilinemez, i kabul edilir.
+
+Keyword'ler de aynı biçime çevrilir ve "ı" içerenler ASCII yazımıyla da
+kaydedilir (`keyword_variants`): "KAZANDINIZ", "kazandiniz" ve
+"kazandınız" aynı keyword'e eşleşir.
+
+Dönüşüm tabloları modül yüklenirken bir kez kurulur. `str.translate`
+Türkçe metinde karakter başına sözlük araması yaptığından (~40ns/karakter)
+sadece tablodaki nadir karakterler (benzer harf, görünmez, tam genişlik)
+mesajda varsa çalışır; sık görülen Türkçe harfler C'de çalışan
+`str.replace` ile katlanır. Tamamen ASCII mesajlarda maliyet `lower()`
+ile aynıdır.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+# Silinen görünmez / biçimlendirme karakterleri
+INVISIBLE_CHARS = (
+    "\u00ad"                                # soft hyphen
+    "\u034f"                                # combining grapheme joiner
+    "\u061c"                                # arabic letter mark
+    "\u115f\u1160\u3164\uffa0"              # hangul dolgu karakterleri
+    "\u17b4\u17b5"                          # khmer ünlü doldurucuları
+    "\u180b\u180c\u180d\u180e"              # moğolca varyasyon seçicileri / ünlü ayırıcı
+    "\u200b\u200c\u200d\u200e\u200f"        # zero width space / (non-)joiner, LRM / RLM
+    "\u202a\u202b\u202c\u202d\u202e"        # yön gömme / geçersiz kılma
+    "\u2060\u2061\u2062\u2063\u2064"        # word joiner, görünmez operatörler
+    "\u2066\u2067\u2068\u2069"              # yön izolasyonu
+    + "".join(chr(cp) for cp in range(0xFE00, 0xFE10))  # varyasyon seçicileri
+    + "\ufeff"                              # BOM / zero width no-break space
+)
+
+# Latin harflere benzeyen Kiril / Yunan harfleri -> Latin küçük harf
+HOMOGLYPHS = {
+    # Kiril küçük
+    "а": "a", "в": "b", "е": "e", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p",
+    "с": "c", "т": "t", "у": "y", "х": "x", "ѕ": "s", "і": "i", "ј": "j", "һ": "h",
+    "ԁ": "d", "ԛ": "q", "ԝ": "w", "ӏ": "l",
+    # Kiril büyük
+    "А": "a", "В": "b", "Е": "e", "К": "k", "М": "m", "Н": "h", "О": "o", "Р": "p",
+    "С": "c", "Т": "t", "У": "y", "Х": "x", "Ѕ": "s", "І": "i", "Ј": "j", "Һ": "h",
+    "Ԁ": "d", "Ԛ": "q", "Ԝ": "w", "Ӏ": "l",
+    # Yunan küçük
+    "α": "a", "ε": "e", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p", "τ": "t",
+    "υ": "u", "χ": "x",
+    # Yunan büyük
+    "Α": "a", "Β": "b", "Ε": "e", "Ζ": "z", "Η": "h", "Ι": "i", "Κ": "k", "Μ": "m",
+    "Ν": "n", "Ο": "o", "Ρ": "p", "Τ": "t", "Υ": "y", "Χ": "x",
+}
+
+# Sık görülen Türkçe harfler (küçük harfe çevrildikten sonra) -> ASCII ("ı" hariç)
+TURKISH_FOLD = (("ş", "s"), ("ğ", "g"), ("ü", "u"), ("ö", "o"), ("ç", "c"))
+
+
+def _build_canonical_table() -> Dict[int, Optional[str]]:
+    table: Dict[int, Optional[str]] = {ord(ch): None for ch in INVISIBLE_CHARS}
+    table.update({ord(src): dst for src, dst in HOMOGLYPHS.items()})
+    # Tam genişlikli ASCII (！ ... ～) -> ASCII
+    table.update({cp: chr(cp - 0xFEE0) for cp in range(0xFF01, 0xFF5F)})
+    return table
+
+
+def _build_fold_table() -> Dict[int, str]:
+    # Latin-1 + Latin Extended-A/B aksanlı küçük harfler -> taban ASCII harfi
+    table = {}
+    for cp in range(0x00C0, 0x0250):
+        ch = chr(cp)
+        if ch.lower() != ch:
+            continue
+        base = unicodedata.normalize("NFD", ch)[0]
+        if base != ch and base.isascii() and base.isalpha():
+            table[cp] = base
+    table.update({ord(src): dst for src, dst in TURKISH_FOLD})
+    table[ord("ß")] = "ss"
+    table.pop(ord("ı"), None)
+    return table
+
+
+CANONICAL_TABLE = _build_canonical_table()
+FOLD_TABLE = _build_fold_table()
+
+
+def _special_chars() -> str:
+    # Tabloların gerektiği nadir karakterler (aksanlı harflerin büyükleri dahil);
+    # sık görülen Türkçe harfler str.replace ile katlandığından dahil değil
+    turkish = set("".join(src for src, _ in TURKISH_FOLD))
+    special = {chr(cp) for cp in CANONICAL_TABLE}
+    special.update(chr(cp) for cp in FOLD_TABLE if chr(cp) not in turkish)
+    special.update(chr(cp) for cp in range(0x00C0, 0x0250)
+                   if chr(cp).lower() in special and chr(cp).lower() not in turkish)
+    return "".join(sorted(special))
+
+
+# Mesajda tek bir nadir karakter varsa iki translate de çalışır (tek regex taraması)
+_SPECIAL_RE = re.compile("[" + re.escape(_special_chars()) + "]")
+
+
+def normalize(text: str) -> Tuple[str, str]:
+    """Metni bir kez normalize et -> (canonical, folded)"""
+    if text.isascii():
+        folded = text.lower()
+        return (text.replace("I", "ı").lower() if "I" in text else folded), folded
+
+    # Ayrışık yazılmış harfleri birleştir ("I" + U+0307 -> "İ", "s" + U+0327 -> "ş")
+    text = unicodedata.normalize("NFC", text)
+    special = _SPECIAL_RE.search(text) is not None
+    if special:
+        text = text.translate(CANONICAL_TABLE)
+    if "İ" in text:
+        text = text.replace("İ", "i")
+    # str.lower() "I"yı i yapar (katlanmış biçim); Türkçe küçük harf için önce ı'ya çevrilir
+    folded = text.lower()
+    canonical = text.replace("I", "ı").lower() if "I" in text else folded
+
+    for src, dst in TURKISH_FOLD:
+        if src in folded:
+            folded = folded.replace(src, dst)
+    if special:
+        folded = folded.translate(FOLD_TABLE)
+    return canonical, folded
+
+
+def keyword_variants(keyword: str) -> Tuple[str, ...]:
+    """Keyword'ün mesajın katlanmış biçiminde aranacak yazımları (ilki asıl biçim)"""
+    folded = normalize(keyword)[1]
+    if "ı" in folded:
+        return folded, folded.replace("ı", "i")
+    return (folded,)
@@ -0,0 +1,375 @@
+"""
+Patterna Shield Mini - Tehdit Listesi İndeksi
+=============================================
+
+OpenPhish / URLhaus tarzı feed dökümleri (satır başına bir URL veya CSV)
+offline olarak tek bir indeks dosyasına derlenir: her URL kanonik biçime
+çevrilir (şema, "www.", port, fragment ve sondaki "/" atılır, host küçük
+harfe çevrilir), 64-bit hash'lenir, hash'ler sıralanıp düz bir dizi olarak
+yazılır (10M URL = 80 MB).
+
+Worker süreçleri dosyayı mmap ile salt okunur açar: yükleme dosya boyutundan
+bağımsızdır (okuma yok, sadece eşleme) ve sayfalar işletim sisteminin sayfa
+önbelleğinden paylaşılır; N worker aynı 80 MB'ı bir kez kullanır. Sorgu
+`bisect` ile (C'de) ikili aramadır, 10M girdide ~24 adım.
+
+Bir URL için sırayla aranan anahtarlar:
+- kanonik URL               "evil.com/giris?id=1"
+- sorgu dizgisi atılmış     "evil.com/giris"
+- sadece host               "evil.com" (feed'de kök URL / çıplak host varsa)
+
+İndeks dosyası yeni bir dosyaya yazılıp atomik olarak değiştirilir; çalışan
+worker'lar dosya değişimini izleyiciyle görüp yeni dosyayı eşler, eski eşleme
+kullanımı bitince bırakılır.
+
+Kullanım:
+    python threat_feed.py build openphish.txt urlhaus.csv
+    python threat_feed.py stats
+    python threat_feed.py check http://evil.com/giris
+"""
+
+import argparse
+import bisect
+import csv
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from phone_blacklist import DATA_DIR
+
+# İndeks dosyası (PATTERNA_THREAT_FEED ile değiştirilebilir; yoksa kontrol atlanır)
+DEFAULT_INDEX_PATH = os.environ.get("PATTERNA_THREAT_FEED") or os.path.join(DATA_DIR, "threat_feed.idx")
+
+# Başlık: magic, girdi sayısı, derleme zamanı, metadata (JSON) uzunluğu.
+# Hash'ler makinenin bayt sırasıyla (little-endian) yazılır.
+MAGIC = b"PSTFEED1"
+HEADER = struct.Struct("<8sQdQ")
+
+# Derlemede hash'ler üst 8 bitlerine göre kovalara ayrılıp kova kova sıralanır;
+# 10M hash'in tamamı aynı anda Python listesine dönüşmez
+_BUCKET_SHIFT = 56
+
+
+# [şema:]//yetki[/yol][?sorgu][#fragment]; urlsplit'ten ~4 kat hızlı (önbelleği
+# tekrar eden URL'lerde işe yarar, feed ve mesaj URL'leri tekrar etmez)
+_URL_RE = re.compile(r"(?:[a-zA-Z][a-zA-Z0-9+.-]*:)?//([^/?#]*)([^?#]*)(?:\?([^#]*))?")
+
+
+def _url_parts(url: str) -> Optional[Tuple[str, str, str]]:
+    """URL -> (host, sondaki "/" atılmış yol, sorgu); host yoksa None"""
+    url = url.strip()
+    if "//" not in url[:12]:  # şemasız: "evil.com/giris"
+        url = "//" + url
+    m = _URL_RE.match(url)
+    if m is None:
+        return None
+    authority, path, query = m.groups()
+    host = authority.rpartition("@")[2]
+    if host.startswith("["):  # IPv6
+        host = host[1:host.find("]")]
+    else:
+        host = host.partition(":")[0]
+    host = host.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    return host, path.rstrip("/"), query or ""
+
+
+def canonical_url(url: str) -> Optional[str]:
+    """URL'yi indeks anahtarı biçimine çevir: host[/yol][?sorgu]"""
+    parts = _url_parts(url)
+    if parts is None:
+        return None
+    host, path, query = parts
+    return host + path + "?" + query if query else host + path
+
+
+def lookup_keys(url: str) -> List[str]:
+    """Sorguda aranacak anahtarlar (en spesifikten genele)"""
+    parts = _url_parts(url)
+    if parts is None:
+        return []
+    host, path, query = parts
+    keys = [host + path + "?" + query] if query else []
+    if path:
+        keys.append(host + path)
+    keys.append(host)
+    return keys
+
+
+def url_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# ---------------------------------------------------------------------------
+# Feed dosyaları
+# ---------------------------------------------------------------------------
+
+def read_feed_file(path: str) -> Iterator[str]:
+    """Feed dökümündeki URL'ler: .csv (URLhaus) veya satır başına bir URL (OpenPhish).
+
+    "#" ile başlayan satırlar yorumdur. CSV'de "url" başlıklı sütun (URLhaus
+    başlığı yorum satırındadır), başlık yoksa "://" içeren ilk hücre alınır.
+    """
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        if not path.lower().endswith(".csv"):
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+            return
+
+        column: Optional[int] = None
+        for line in f:
+            if line.startswith("#"):
+                header = next(csv.reader([line.lstrip("# ")]), [])
+                names = [name.strip().lower() for name in header]
+                if "url" in names:
+                    column = names.index("url")
+                continue
+            row = next(csv.reader([line]), None)
+            if not row:
+                continue
+            if column is None:
+                names = [cell.strip().lower() for cell in row]
+                if "url" in names:
+                    column = names.index("url")
+                    continue
+                cell = next((c for c in row if "://" in c), None)
+            else:
+                cell = row[column] if column < len(row) else None
+            if cell and cell.strip():
+                yield cell.strip()
+
+
+def build_index(sources: Iterable[Tuple[str, Iterable[str]]], path: str = DEFAULT_INDEX_PATH) -> Dict[str, Any]:
+    """(kaynak adı, URL'ler) çiftlerinden indeks dosyasını derle (atomik değiştirme)"""
+    started = time.perf_counter()
+    buckets = [array("Q") for _ in range(1 << (64 - _BUCKET_SHIFT))]
+    counts: Dict[str, Dict[str, int]] = {}
+    for name, urls in sources:
+        read = skipped = 0
+        for url in urls:
+            read += 1
+            key = canonical_url(url)
+            if key is None:
+                skipped += 1
+                continue
+            h = url_hash(key)
+            buckets[h >> _BUCKET_SHIFT].append(h)
+        counts[name] = {"urls": read, "skipped": skipped}
+
+    meta = json.dumps({"sources": counts}, ensure_ascii=False).encode("utf-8")
+    meta += b" " * (-len(meta) % 8)  # hash dizisi 8 byte hizalı başlar
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".threat_feed-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            f.write(meta)
+            entries = 0
+            for i, bucket in enumerate(buckets):
+                unique = array("Q", sorted(set(bucket)))
+                buckets[i] = None  # kova yazılınca bellek bırakılır
+                unique.tofile(f)
+                entries += len(unique)
+            built_at = time.time()
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, entries, built_at, len(meta)))
+        os.chmod(tmp_path, 0o644)  # mkstemp 0600 açar; worker'lar başka kullanıcıyla okuyabilmeli
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return {"path": path, "entries": entries, "sources": counts,
+            "seconds": round(time.perf_counter() - started, 2)}
+
+
+# ---------------------------------------------------------------------------
+# mmap'li indeks
+# ---------------------------------------------------------------------------
+
+class ThreatFeedIndex:
+    """Sıralı 64-bit hash dizisi üzerinde ikili arama (dosya mmap ile eşlenir)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"Geçersiz tehdit listesi indeksi: {path}")
+            magic, entries, self.built_at, meta_len = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"Geçersiz tehdit listesi indeksi: {path}")
+            self.meta = json.loads(f.read(meta_len) or b"{}")
+            offset = HEADER.size + meta_len
+            if stat.st_size != offset + 8 * entries:
+                raise ValueError(f"Eksik tehdit listesi indeksi: {path}")
+            self.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if entries else None
+        # bisect memoryview üzerinde C'de çalışır; dosya belleğe kopyalanmaz
+        self._hashes = memoryview(self._mmap)[offset:].cast("Q") if entries else ()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def contains_hash(self, h: int) -> bool:
+        hashes = self._hashes
+        i = bisect.bisect_left(hashes, h)
+        return i < len(hashes) and hashes[i] == h
+
+    def match(self, url: str) -> Optional[str]:
+        """URL listedeyse eşleşen anahtarı döndür (yoksa None)"""
+        for key in lookup_keys(url):
+            if self.contains_hash(url_hash(key)):
+                return key
+        return None
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "entries": len(self),
+            "bytes": self.signature[2],
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.built_at)),
+            "sources": self.meta.get("sources", {}),
+        }
+
+
+class ThreatFeed:
+    """Süreç genelindeki indeks: dosya yoksa boş, değişince yeniden eşlenir"""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self.index: Optional[ThreatFeedIndex] = None
+        # İçerik her değiştiğinde artar (karar önbelleği geçersiz kılınır)
+        self.generation = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.reload_if_changed()
+
+    def match(self, url: str) -> Optional[str]:
+        index = self.index
+        return index.match(url) if index is not None else None
+
+    def reload_if_changed(self) -> bool:
+        """Dosya eklendi / değişti / silindiyse indeksi değiştir"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+                signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+            current = self.index.signature if self.index is not None else None
+            if signature == current:
+                return False
+            try:
+                # Eski eşleme kapatılmaz: sorgudaki thread'ler bitince GC bırakır
+                self.index = ThreatFeedIndex(self.path) if signature is not None else None
+            except (OSError, ValueError) as e:
+                # Yarım / bozuk dosya: eski indeksle devam edilir
+                self.last_error = str(e)
+                return False
+            self.last_error = None
+            self.generation += 1
+            return True
+
+    def start_watcher(self, interval: float) -> None:
+        """Dosyayı `interval` saniyede bir kontrol eden arka plan thread'i"""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name="threat-feed-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        index = self.index
+        return {
+            "loaded": index is not None,
+            **(index.info() if index is not None else {"path": self.path, "entries": 0}),
+            "generation": self.generation,
+            "last_error": self.last_error,
+        }
+
+
+_feed: Optional[ThreatFeed] = None
+_feed_lock = threading.Lock()
+
+
+def get_threat_feed() -> ThreatFeed:
+    """Süreç genelindeki tehdit listesi (ilk kullanımda eşlenir)"""
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = ThreatFeed()
+    return _feed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tehdit listesi (threat feed) indeksi")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="İndeks dosyası")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = sub.add_parser("build", help="Feed dökümlerinden indeksi derle")
+    build_cmd.add_argument("paths", nargs="+", help="URL listesi (.txt) veya CSV (.csv) dosyaları")
+
+    sub.add_parser("stats", help="İndeks bilgileri")
+
+    check_cmd = sub.add_parser("check", help="URL'leri indekste ara")
+    check_cmd.add_argument("urls", nargs="+")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        sources = [(os.path.basename(path), read_feed_file(path)) for path in args.paths]
+        result = build_index(sources, args.index)
+        read = sum(s["urls"] for s in result["sources"].values())
+        print(f"✅ {read:,} URL okundu, {result['entries']:,} benzersiz girdi "
+              f"({result['seconds']:.1f}s, {os.path.getsize(args.index) / 2**20:,.1f} MB)")
+        for name, counts in result["sources"].items():
+            print(f"   {name}: {counts['urls']:,} URL ({counts['skipped']:,} geçersiz)")
+
+    if not os.path.exists(args.index):
+        print(f"İndeks bulunamadı: {args.index}", file=sys.stderr)
+        sys.exit(1)
+    started = time.perf_counter()
+    index = ThreatFeedIndex(args.index)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    if args.command == "stats":
+        print(json.dumps(index.info(), ensure_ascii=False, indent=2))
+    if args.command == "check":
+        for url in args.urls:
+            key = index.match(url)
+            print(f"{'🚨 LİSTEDE' if key else '✅ yok    '}  {url}" + (f"  ({key})" if key else ""))
+    print(f"🗂️  İndekste {len(index):,} girdi, {load_ms:.1f} ms'de eşlendi ({args.index})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Patterna Shield Mini - URL / Domain İtibar Motoru
+=================================================
+
+URL'nin host kısmı bir kez ayrıştırılır ve host'un kendisi ile üst
+domain'leri (label label kısaltarak) hash'li bir domain indeksinde aranır.
+Sorgu maliyeti listedeki domain sayısından bağımsızdır; sadece host'taki
+label sayısıyla orantılıdır (7 domain ile 5M domain aynı sürede sorgulanır).
+
+Kural biçimleri:
+- "bit.ly"     -> bit.ly ve tüm alt domain'leri (x.bit.ly)
+- "*.bit.ly"   -> sadece alt domain'ler (x.bit.ly eşleşir, bit.ly eşleşmez)
+
+Eski `domain in url` taramasının aksine "t.co" kuralı artık
+"microsoft.com/" içinde eşleşmez.
+
+`HashedDomainIndex` aynı indeksin sıralı 64-bit hash dizileri hâlidir;
+diziler worker'lar arasında paylaşılan bellekte tutulabilir
+(shared_tables.py). Sorgu label başına bir hash + ikili aramadır.
+"""
+
+import bisect
+import hashlib
+from array import array
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+def extract_host(url: str) -> Optional[str]:
+    """URL'den küçük harfli host'u çıkar (şemasız URL'ler de desteklenir)"""
+    url = url.strip()
+    if "://" not in url:
+        url = "//" + url
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    return host.rstrip(".")
+
+
+class DomainIndex:
+    """Domain ve wildcard kuralları için hash'li suffix indeksi"""
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self._domains = set()    # host + alt domain'ler
+        self._wildcards = set()  # sadece alt domain'ler
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: str) -> None:
+        rule = rule.strip().lower().rstrip(".")
+        if not rule:
+            return
+        if rule.startswith("*."):
+            self._wildcards.add(rule[2:])
+        else:
+            self._domains.add(rule)
+
+    def __len__(self) -> int:
+        return len(self._domains) + len(self._wildcards)
+
+    def dump(self) -> bytes:
+        """Normalize kurallar, satır başına bir (wildcard'lar "*." önekiyle); `load` ile okunur"""
+        return "\n".join([*self._domains, *("*." + rule for rule in self._wildcards)]).encode("utf-8")
+
+    @classmethod
+    def load(cls, data: bytes) -> "DomainIndex":
+        index = cls()
+        for rule in data.decode("utf-8").split("\n"):
+            if rule.startswith("*."):
+                index._wildcards.add(rule[2:])
+            elif rule:
+                index._domains.add(rule)
+        return index
+
+    def match(self, host: str) -> Optional[str]:
+        """Host'a uyan en spesifik kuralı döndür (yoksa None)"""
+        if host in self._domains:
+            return host
+        domains = self._domains
+        wildcards = self._wildcards
+        dot = host.find(".")
+        while dot >= 0:
+            suffix = host[dot + 1:]
+            if suffix in domains:
+                return suffix
+            if suffix in wildcards:
+                return "*." + suffix
+            dot = host.find(".", dot + 1)
+        return None
+
+    def match_url(self, url: str) -> Optional[str]:
+        host = extract_host(url)
+        return self.match(host) if host else None
+
+
+def domain_hash(domain: str) -> int:
+    return int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _contains(hashes, h: int) -> bool:
+    i = bisect.bisect_left(hashes, h)
+    return i < len(hashes) and hashes[i] == h
+
+
+class HashedDomainIndex:
+    """DomainIndex'in sıralı hash dizileri üzerindeki karşılığı (aynı eşleşme kuralları)"""
+
+    def __init__(self, domains, wildcards):
+        self._domains = domains      # sıralı uint64 (array('Q') veya memoryview)
+        self._wildcards = wildcards
+
+    @classmethod
+    def from_index(cls, index: DomainIndex) -> "HashedDomainIndex":
+        return cls(array("Q", sorted({domain_hash(d) for d in index._domains})),
+                   array("Q", sorted({domain_hash(d) for d in index._wildcards})))
+
+    def arrays(self) -> Tuple[array, array]:
+        return self._domains, self._wildcards
+
+    def __len__(self) -> int:
+        return len(self._domains) + len(self._wildcards)
+
+    def match(self, host: str) -> Optional[str]:
+        """Host'a uyan en spesifik kuralı döndür (yoksa None)"""
+        domains = self._domains
+        wildcards = self._wildcards
+        if _contains(domains, domain_hash(host)):
+            return host
+        dot = host.find(".")
+        while dot >= 0:
+            suffix = host[dot + 1:]
+            h = domain_hash(suffix)
+            if _contains(domains, h):
+                return suffix
+            if _contains(wildcards, h):
+                return "*." + suffix
+            dot = host.find(".", dot + 1)
+        return None
+
+    def match_url(self, url: str) -> Optional[str]:
+        host = extract_host(url)
+        return self.match(host) if host else None
@@ -0,0 +1,122 @@
+"""
+Patterna Shield Mini - Karar (Verdict) Önbelleği
+================================================
+
+Dolandırıcılık kampanyaları aynı metni binlerce alıcıya gönderir. Aynı
+mesaj + gönderen için kararı her seferinde yeniden hesaplamak yerine
+sonuç, `message_hash` (FULL_SYSTEM_OVERVIEW.py'deki fraud_reports kolonu)
+ile aynı biçimde SHA-256 anahtarıyla önbelleğe alınır.
+
+- LRU + TTL tahliyesi
+- Yaklaşık byte cinsinden bellek bütçesi
+- hit / miss / eviction sayaçları
+- Kural seti sürümü değişince tüm önbellek otomatik geçersiz kılınır
+
+Sürümler monoton artan, sıralanabilir değerlerdir (örn. (kural nesli,
+kara liste nesli)). Yeni kurallar devreye girdikten sonra eski snapshot ile
+başlamış bir isteğin get/put çağrıları önbelleği geri sarmaz; eski sürümle
+gelen sorgu ıska sayılır, eski sürümle hesaplanmış karar yazılmaz.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Kayıt başına sabit yük (anahtar, OrderedDict düğümü, yanıt nesnesi) - yaklaşık
+ENTRY_OVERHEAD_BYTES = 600
+
+
+def message_hash(message: str, sender: Optional[str] = None) -> str:
+    """Mesaj + gönderen için 64 karakterlik SHA-256 anahtarı"""
+    digest = hashlib.sha256(message.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update((sender or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class VerdictCache:
+    """Bellek bütçeli, TTL'li, thread-safe LRU önbellek"""
+
+    def __init__(self, max_bytes: int = 64 * 2**20, ttl_seconds: float = 600.0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._version: Optional[Any] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: Any) -> bool:
+        """Sürüm güncel mi? Daha yeni sürümde eski kararlar silinir (kilit altında çağrılır)"""
+        if version == self._version:
+            return True
+        if self._version is not None and version < self._version:
+            return False
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+        return True
+
+    def get(self, key: str, version: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key) if self._check_version(version) else None
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any, version: Any, size: int = 0) -> None:
+        size += ENTRY_OVERHEAD_BYTES + len(key)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if not self._check_version(version):
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }